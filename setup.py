@@ -26,6 +26,7 @@ setup(
     entry_points={
         "console_scripts": [
             "falcon9-predictor=src.falcon9_app:main",
+            "falcon9-score=src.batch_score:main",
         ],
     },
     python_requires=">=3.6",
@@ -3,9 +3,59 @@
 
 """
 نقطه ورودی اصلی برنامه پیش‌بینی فرود فالکون ۹
+
+بدون آرگومان رابط گرافیکی اجرا می‌شود. دستورات بدون رابط گرافیکی:
+    python -m src score in.csv -o out.csv
+    python -m src serve --port 8000
+    python -m src bench --save-baseline
+    python -m src generate --rows 1000000 -o data/synthetic.parquet
+    python -m src compact --tolerance 3
+    python -m src backtest --freq Y
+    python -m src features
+    python -m src slim
+    python -m src registry list
+    python -m src similar --k 5
+    python -m src history
 """
 
-from falcon9_app import main
+import sys
+import importlib
+
+# دستورات خط فرمان و ماژول اجراکننده هر کدام
+COMMANDS = {
+    'score': 'batch_score',
+    'serve': 'server',
+    'bench': 'benchmarks',
+    'generate': 'synthetic_data',
+    'compact': 'compact_model',
+    'backtest': 'backtest',
+    'features': 'features',
+    'slim': 'slim_bundle',
+    'registry': 'model_registry',
+    'similar': 'similar_launches',
+    'history': 'booster_history',
+}
+
+
+def _import(module_name):
+    """بارگذاری ماژول هم در حالت پکیج (python -m src) و هم در حالت اسکریپت (python src)"""
+    if __package__:
+        return importlib.import_module(f"{__package__}.{module_name}")
+    return importlib.import_module(module_name)
+
+
+def run():
+    """انتخاب دستور بر اساس آرگومان‌ها"""
+    # خروجی متریک‌ها و پروفایلر در صورت تنظیم متغیرهای محیطی FALCON9_*
+    _import('instrumentation').configure_from_env()
+    
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        module = _import(COMMANDS[sys.argv[1]])
+        sys.exit(module.main(sys.argv[2:]))
+
+    # رابط گرافیکی فقط در صورت نیاز بارگذاری می‌شود
+    _import('falcon9_app').main()
+
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    run()
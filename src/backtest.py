@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+آزمون گذشته‌نگر (walk-forward) مدل به ترتیب تاریخ پرتاب‌ها
+
+تقسیم تصادفی save_model.py پرتاب‌های آینده را وارد داده آموزش می‌کند. در این آزمون برای
+هر دوره (سال، فصل یا ماه) مدل فقط روی پرتاب‌های پیش از شروع دوره آموزش می‌بیند و پرتاب‌های
+همان دوره را پیش‌بینی می‌کند. دقت، امتیاز Brier و log-loss هر دوره و کل دوره‌ها گزارش می‌شود.
+
+ماتریس ویژگی‌ها فقط یک بار برای همه پرتاب‌ها ساخته می‌شود و هر دوره فقط برشی از ابتدای آن
+است؛ تنها مقادیر وابسته به داده آموزش (میانه ستون‌های عددی و پرتکرارترین دسته برای مقادیر
+گمشده) در هر دوره از روی سطرهای پیش از آن دوره محاسبه می‌شوند. مقیاس‌بندی StandardScaler
+روی تقسیم‌های درخت اثری ندارد و حذف شده است. دوره‌ها در فرآیندهای موازی اجرا می‌شوند و
+نتیجه هر دوره با اثر انگشت داده‌های خود ذخیره می‌شود، بنابراین با افزوده شدن پرتاب‌های تازه
+فقط دوره‌های تغییرکرده یا تازه دوباره اجرا می‌شوند.
+
+نمونه اجرا:
+    python -m src backtest                     # دوره‌های سالانه
+    python -m src backtest --freq Q --jobs -1  # دوره‌های فصلی روی همه هسته‌ها
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import numpy as np
+import pandas as pd
+
+try:
+    from .save_model import DEFAULT_FOREST
+    from .features import load_features, split, NUMERICAL_FEATURES, CATEGORICAL_FEATURES, BOOLEAN_FEATURES
+except ImportError:
+    from save_model import DEFAULT_FOREST
+    from features import load_features, split, NUMERICAL_FEATURES, CATEGORICAL_FEATURES, BOOLEAN_FEATURES
+
+
+CACHE_VERSION = 1
+CACHE_FILENAME = 'falcon9_backtest.json'
+DEFAULT_FREQ = 'Y'
+DEFAULT_MIN_TRAIN = 20
+# کران احتمال در log-loss تا پیش‌بینی قطعی اشتباه بی‌نهایت نشود
+PROBABILITY_EPSILON = 1e-15
+
+
+class FeatureMatrix:
+    """ماتریس ویژگی مشترک همه دوره‌ها (سطرها به ترتیب تاریخ)
+
+    ستون‌ها: ویژگی‌های عددی (با NaN برای مقادیر گمشده)، one-hot همه دسته‌های دیده‌شده و
+    ویژگی‌های بولین. کد دسته هر سطر (یا -1 برای مقدار گمشده) نگه داشته می‌شود تا هر دوره
+    مانند OneHotEncoder آموزش‌دیده فقط ستون دسته‌های موجود در داده آموزش خود را داشته باشد؛
+    در غیر این صورت انتخاب تصادفی ویژگی‌های جنگل (max_features) با پایپ‌لاین اصلی فرق می‌کند.
+    """
+
+    def __init__(self, X):
+        blocks = [X[NUMERICAL_FEATURES].to_numpy(dtype=np.float64)]
+        self.categorical = []
+        offset = len(NUMERICAL_FEATURES)
+        for col in CATEGORICAL_FEATURES:
+            codes, categories = pd.factorize(X[col], sort=True)
+            one_hot = np.zeros((len(X), len(categories)))
+            known = codes >= 0
+            one_hot[np.flatnonzero(known), codes[known]] = 1.0
+            blocks.append(one_hot)
+            self.categorical.append((offset, codes, len(categories)))
+            offset += len(categories)
+        blocks.append(X[BOOLEAN_FEATURES].to_numpy(dtype=np.float64))
+        self.values = np.hstack(blocks).astype(np.float32)
+
+    def fold(self, train_end, test_end):
+        """ماتریس آموزش (سطرهای [0، train_end)) و آزمون ([train_end، test_end)) یک دوره"""
+        X = self.values[:test_end].copy()
+        numeric = slice(0, len(NUMERICAL_FEATURES))
+        medians = np.nanmedian(X[:train_end, numeric], axis=0)
+        missing = np.isnan(X[:, numeric])
+        X[:, numeric][missing] = np.take(medians, np.nonzero(missing)[1])
+        keep = np.ones(X.shape[1], dtype=bool)
+        for offset, codes, n_categories in self.categorical:
+            codes = codes[:test_end]
+            observed = codes[:train_end][codes[:train_end] >= 0]
+            if (codes < 0).any():
+                X[np.flatnonzero(codes < 0), offset + np.bincount(observed).argmax()] = 1.0
+            keep[offset:offset + n_categories] = np.bincount(observed, minlength=n_categories) > 0
+        X = X[:, keep]
+        return X[:train_end], X[train_end:]
+
+
+def load_launches(data_path):
+    """خواندن پرتاب‌ها به ترتیب تاریخ؛ خروجی (X، y، تاریخ‌ها)"""
+    df = load_features(data_path)
+    # مقادیر گمشده وزن محموله در هر دوره فقط با داده‌های پیش از آن پر می‌شوند
+    X, y = split(df, payload_fill=np.nan)
+    order = np.argsort(df['Date'].to_numpy(), kind='stable')
+    return (X.iloc[order].reset_index(drop=True), y.iloc[order].reset_index(drop=True),
+            df['Date'].iloc[order].reset_index(drop=True))
+
+
+def periods(dates, freq=DEFAULT_FREQ, min_train=DEFAULT_MIN_TRAIN):
+    """مرزهای دوره‌ها: فهرست (نام دوره، انتهای داده آموزش، انتهای داده آزمون)"""
+    labels = dates.dt.to_period(freq).astype(str).to_numpy()
+    result = []
+    start = 0
+    for end in range(1, len(labels) + 1):
+        if end == len(labels) or labels[end] != labels[start]:
+            if start >= min_train:
+                result.append((labels[start], start, end))
+            start = end
+    return result
+
+
+def fold_key(X, y, train_end, test_end, forest):
+    """اثر انگشت داده‌ها و پارامترهای یک دوره؛ با افزودن پرتاب‌های بعدی تغییر نمی‌کند"""
+    digest = hashlib.sha256(json.dumps([CACHE_VERSION, forest, train_end, test_end],
+                                       sort_keys=True).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(X.iloc[:test_end], index=False).to_numpy().tobytes())
+    digest.update(y.iloc[:test_end].to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def score(y_true, probability):
+    """دقت، امتیاز Brier و log-loss برای احتمال موفقیت"""
+    y_true = np.asarray(y_true, dtype=np.float64)
+    clipped = np.clip(probability, PROBABILITY_EPSILON, 1 - PROBABILITY_EPSILON)
+    return {
+        'accuracy': float(((probability >= 0.5) == (y_true == 1)).mean()),
+        'brier': float(np.mean((probability - y_true) ** 2)),
+        'log_loss': float(-np.mean(y_true * np.log(clipped) + (1 - y_true) * np.log(1 - clipped))),
+    }
+
+
+def run_fold(features, y, train_end, test_end, forest):
+    """آموزش روی سطرهای پیش از دوره و پیش‌بینی سطرهای دوره؛ خروجی احتمال موفقیت"""
+    from sklearn.ensemble import RandomForestClassifier
+
+    X_train, X_test = features.fold(train_end, test_end)
+    y_train = y[:train_end]
+    if len(np.unique(y_train)) < 2:
+        # با یک کلاس در داده آموزش، مدل همان کلاس را با اطمینان کامل پیش‌بینی می‌کند
+        return np.full(test_end - train_end, float(y_train[0]))
+    classifier = RandomForestClassifier(random_state=42, n_jobs=1, **forest)
+    classifier.fit(X_train, y_train)
+    return classifier.predict_proba(X_test)[:, list(classifier.classes_).index(1)]
+
+
+def load_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get('folds', {}) if cache.get('version') == CACHE_VERSION else {}
+
+
+def save_cache(path, folds):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'folds': folds}, f)
+    os.replace(temp_path, path)
+
+
+def backtest(data_path, freq=DEFAULT_FREQ, min_train=DEFAULT_MIN_TRAIN, forest=None, n_jobs=-1,
+             cache_path=None):
+    """اجرای آزمون گذشته‌نگر؛ خروجی (نتایج هر دوره، نتیجه کل، تعداد دوره‌های اجراشده)
+
+    نتایج دوره‌هایی که اثر انگشت آن‌ها در cache_path موجود باشد دوباره محاسبه نمی‌شوند.
+    """
+    from joblib import Parallel, delayed
+
+    forest = {**DEFAULT_FOREST, **(forest or {})}
+    X, y, dates = load_launches(data_path)
+    windows = periods(dates, freq, min_train)
+    cache = load_cache(cache_path) if cache_path else {}
+    keys = [fold_key(X, y, train_end, test_end, forest) for _, train_end, test_end in windows]
+    pending = [i for i, key in enumerate(keys) if key not in cache]
+
+    if pending:
+        features = FeatureMatrix(X)
+        labels = y.to_numpy()
+        outputs = Parallel(n_jobs=n_jobs)(
+            delayed(run_fold)(features, labels, windows[i][1], windows[i][2], forest)
+            for i in pending)
+        for i, probability in zip(pending, outputs):
+            cache[keys[i]] = [float(p) for p in probability]
+        if cache_path:
+            # فقط دوره‌های فعلی نگه داشته می‌شوند تا فایل با تغییر داده‌ها بزرگ نشود
+            save_cache(cache_path, {key: cache[key] for key in keys})
+
+    results = []
+    for (name, train_end, test_end), key in zip(windows, keys):
+        y_test = y.iloc[train_end:test_end].to_numpy()
+        results.append({'period': name, 'train_rows': train_end, 'test_rows': test_end - train_end,
+                        'success_rate': float(y_test.mean()),
+                        **score(y_test, np.asarray(cache[key]))})
+
+    overall = None
+    if windows:
+        y_all = y.iloc[windows[0][1]:windows[-1][2]].to_numpy()
+        probability_all = np.concatenate([cache[key] for key in keys])
+        overall = {'period': 'کل', 'train_rows': windows[0][1], 'test_rows': len(y_all),
+                   'success_rate': float(y_all.mean()), **score(y_all, probability_all)}
+    return results, overall, len(pending)
+
+
+def print_report(results, overall):
+    print(f"{'دوره':<10} {'آموزش':>6} {'آزمون':>6} {'نرخ موفقیت':>10} {'دقت':>7} {'Brier':>7} {'log-loss':>9}")
+    for row in results + ([overall] if overall else []):
+        print(f"{row['period']:<10} {row['train_rows']:>6} {row['test_rows']:>6} "
+              f"{row['success_rate']:>10.2f} {row['accuracy']:>7.3f} {row['brier']:>7.3f} "
+              f"{row['log_loss']:>9.3f}")
+
+
+def main(argv=None):
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(prog='falcon9-predictor backtest',
+                                     description="آزمون گذشته‌نگر مدل به ترتیب تاریخ پرتاب‌ها")
+    parser.add_argument('--data', default=os.path.join(base_dir, 'data', 'data_falcon9.csv'))
+    parser.add_argument('--freq', default=DEFAULT_FREQ,
+                        help="طول هر دوره به صورت فرکانس pandas (Y سالانه، Q فصلی، M ماهانه)")
+    parser.add_argument('--min-train', type=int, default=DEFAULT_MIN_TRAIN,
+                        help="کمترین تعداد پرتاب آموزش پیش از اولین دوره آزمون")
+    parser.add_argument('--trees', type=int, default=DEFAULT_FOREST['n_estimators'],
+                        help="تعداد درخت‌های جنگل در هر دوره")
+    parser.add_argument('--jobs', type=int, default=-1, help="تعداد فرآیندهای موازی (-1 یعنی همه هسته‌ها)")
+    parser.add_argument('--cache', default=os.path.join(base_dir, 'models', CACHE_FILENAME),
+                        help="فایل نتایج دوره‌ها برای اجرای افزایشی")
+    parser.add_argument('--no-cache', action='store_true', help="اجرای همه دوره‌ها از ابتدا")
+    parser.add_argument('-o', '--output', default=None, help="ذخیره نتایج به صورت JSON")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    cache_path = None if args.no_cache else args.cache
+    if cache_path:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    try:
+        results, overall, computed = backtest(args.data, args.freq, args.min_train,
+                                              {'n_estimators': args.trees}, args.jobs, cache_path)
+    except (OSError, ValueError) as e:
+        print(f"خطا در آزمون گذشته‌نگر: {e}", file=sys.stderr)
+        return 1
+    if not results:
+        print("هیچ دوره‌ای با داده آموزش کافی پیدا نشد (--min-train را کم کنید).", file=sys.stderr)
+        return 1
+
+    print_report(results, overall)
+    print(f"{computed} از {len(results)} دوره اجرا شد ({len(results) - computed} از نتایج قبلی) "
+          f"در {time.perf_counter() - start:.2f} ثانیه.")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'periods': results, 'overall': overall}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
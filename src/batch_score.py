@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+امتیازدهی دسته‌ای و جریانی فایل‌های CSV بدون نیاز به رابط گرافیکی
+
+نمونه اجرا:
+    python -m src score in.csv -o out.csv
+    python src score in.csv -o out.parquet --chunk-size 100000
+"""
+
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+
+try:
+    from .predictor import FEATURE_COLUMNS
+    from .model_registry import open_model
+except ImportError:
+    from predictor import FEATURE_COLUMNS
+    from model_registry import open_model
+
+
+DEFAULT_CHUNK_SIZE = 50000
+BOOLEAN_COLUMNS = ['GridFins', 'Reused', 'Legs']
+
+# نوع ثابت ستون‌ها تا نوع داده بین بخش‌های مختلف فایل تغییر نکند
+INPUT_DTYPES = {
+    'PayloadMass': 'float64',
+    'Orbit': str,
+    'LaunchSite': str,
+    'GridFins': str,
+    'Reused': str,
+    'Legs': str,
+    'Block': 'float64',
+    'ReusedCount': 'Int64',
+    'Year': 'Int64',
+    'Month': 'Int64',
+}
+BOOLEAN_VALUES = {'True': 1, 'False': 0, 'true': 1, 'false': 0, '1': 1, '0': 0}
+
+
+class CsvResultWriter:
+    """نوشتن تدریجی نتایج در فایل CSV"""
+
+    def __init__(self, path):
+        self.path = path
+        self._header_written = False
+
+    def write(self, frame):
+        frame.to_csv(self.path, mode='a' if self._header_written else 'w',
+                     header=not self._header_written, index=False)
+        self._header_written = True
+
+    def close(self):
+        pass
+
+
+class ParquetResultWriter:
+    """نوشتن تدریجی نتایج در فایل Parquet (نیازمند pyarrow)"""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("برای خروجی Parquet باید pyarrow نصب باشد: pip install pyarrow")
+        self._pa = pa
+        self._pq = pq
+        self.path = path
+        self._writer = None
+
+    def write(self, frame):
+        table = self._pa.Table.from_pandas(frame, preserve_index=False)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = table.cast(self._writer.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def create_writer(output_path):
+    """انتخاب نویسنده خروجی بر اساس پسوند فایل"""
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension in ('.parquet', '.pq'):
+        return ParquetResultWriter(output_path)
+    return CsvResultWriter(output_path)
+
+
+def prepare_chunk(chunk):
+    """آماده‌سازی یک بخش از ورودی با همان قالب InputForm.get_input_data"""
+    missing = [col for col in FEATURE_COLUMNS if col not in chunk.columns]
+    if missing:
+        raise ValueError(f"ستون‌های ورودی ناقص هستند: {', '.join(missing)}")
+
+    frame = chunk[FEATURE_COLUMNS].copy()
+    for col in BOOLEAN_COLUMNS:
+        values = frame[col].map(BOOLEAN_VALUES)
+        invalid = frame[col][values.isna() & frame[col].notna()].unique()
+        if len(invalid):
+            raise ValueError(f"مقادیر نامعتبر ستون {col}: {', '.join(map(str, invalid))}")
+        frame[col] = values
+    for col in ('ReusedCount', 'Year', 'Month'):
+        frame[col] = frame[col].astype('float64')
+    # Serial و Date اختیاری‌اند و فقط در مدل‌های دارای ویژگی‌های سابقه بوستر استفاده می‌شوند
+    if 'Serial' in chunk.columns:
+        frame['Serial'] = chunk['Serial']
+    if 'Date' in chunk.columns:
+        frame['Date'] = pd.to_datetime(chunk['Date'], errors='coerce', format='ISO8601')
+    return frame
+
+
+def read_chunks(input_path, chunk_size):
+    """خواندن فایل ورودی به صورت بخش‌های با اندازه ثابت
+
+    ستون‌های اضافی به صورت متن خوانده می‌شوند تا بدون تغییر به خروجی منتقل شوند.
+    """
+    columns = pd.read_csv(input_path, nrows=0).columns
+    dtypes = {col: INPUT_DTYPES.get(col, str) for col in columns}
+    return pd.read_csv(input_path, chunksize=chunk_size, dtype=dtypes)
+
+
+def score_file(input_path, output_path, model=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """امتیازدهی فایل ورودی به صورت بخش‌به‌بخش و نوشتن تدریجی نتایج
+
+    در هر لحظه فقط یک بخش از داده در حافظه نگه داشته می‌شود.
+    """
+    if model is None:
+        # نسخه فعال فهرست مدل‌ها (در صورت وجود) برای کل فایل ثابت می‌ماند
+        model = open_model(watch=False)
+    if not model.is_loaded:
+        raise ValueError("مدل بارگذاری نشده است")
+
+    writer = create_writer(output_path)
+    total_rows = 0
+    start_time = time.perf_counter()
+
+    try:
+        for chunk in read_chunks(input_path, chunk_size):
+            result = model.predict_batch(prepare_chunk(chunk))
+            chunk['Prediction'] = result['prediction']
+            chunk['Probability'] = result['probability']
+            writer.write(chunk)
+            total_rows += len(chunk)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start_time
+    return {
+        'rows': total_rows,
+        'seconds': elapsed,
+        'rows_per_second': total_rows / elapsed if elapsed > 0 else float('inf')
+    }
+
+
+def main(argv=None):
+    """اجرای امتیازدهی دسته‌ای از خط فرمان"""
+    parser = argparse.ArgumentParser(prog='falcon9-predictor score',
+                                     description="امتیازدهی دسته‌ای پرتاب‌ها از فایل CSV")
+    parser.add_argument('input', help="فایل CSV ورودی با ستون‌های فرم ورودی")
+    parser.add_argument('-o', '--output', required=True, help="فایل خروجی (.csv یا .parquet)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="تعداد سطرهای هر بخش")
+    args = parser.parse_args(argv)
+
+    try:
+        stats = score_file(args.input, args.output, chunk_size=args.chunk_size)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"خطا در امتیازدهی: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{stats['rows']} سطر در {stats['seconds']:.2f} ثانیه امتیازدهی شد "
+          f"({stats['rows_per_second']:.0f} سطر در ثانیه).")
+    print(f"نتایج در '{args.output}' ذخیره شد.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
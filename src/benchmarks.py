@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+مجموعه بنچمارک تکرارپذیر برای مسیرهای اصلی برنامه
+
+هر مورد در یک فرآیند تازه اجرا می‌شود تا زمان، بیشینه حافظه (RSS) و توان عملیاتی آن
+مستقل از موارد دیگر اندازه‌گیری شود. داده‌های ورودی با بذر ثابت ساخته می‌شوند و همه چیز
+بدون شبکه و فقط روی CPU اجرا می‌شود. نتایج در یک فایل JSON ذخیره و با خط مبنا مقایسه
+می‌شوند؛ اگر پسرفتی بیش از آستانه دیده شود کد خروج 1 برگردانده می‌شود.
+
+نمونه اجرا:
+    python -m src bench --save-baseline          # ثبت خط مبنا روی این ماشین
+    python -m src bench --threshold 0.25         # مقایسه با خط مبنا
+    python -m src bench --only batch_1k,predict_single
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import platform
+import argparse
+import resource
+import tempfile
+import subprocess
+import contextlib
+
+try:
+    from .predictor import PredictionModel, ResourceManager, random_launches
+except ImportError:
+    from predictor import PredictionModel, ResourceManager, random_launches
+
+
+DEFAULT_SEED = 42
+DEFAULT_THRESHOLD = 0.25
+# اختلاف زمانی کمتر از این مقدار (ثانیه) نوسان اندازه‌گیری به حساب می‌آید نه پسرفت
+MIN_TIME_DELTA = 0.002
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, 'benchmarks', 'results.json')
+DEFAULT_BASELINE = os.path.join(BASE_DIR, 'benchmarks', 'baseline.json')
+MODEL_RELATIVE_PATH = os.path.join('models', 'falcon9_landing_model.pkl')
+
+
+def _case_resource_path(seed):
+    def run():
+        for _ in range(1000):
+            ResourceManager.get_resource_path(MODEL_RELATIVE_PATH)
+    return run, 1000, 'calls'
+
+
+def _case_load_model(seed):
+    return PredictionModel, 1, 'loads'
+
+
+def _case_predict_single(seed):
+    import pandas as pd
+    model = PredictionModel(compiled=True)
+    frame = pd.DataFrame(random_launches(1, seed))
+
+    def run():
+        for _ in range(100):
+            model.predict(frame)
+    return run, 100, 'calls'
+
+
+def _batch_case(n_rows):
+    def setup(seed):
+        model = PredictionModel(compiled=True)
+        data = random_launches(n_rows, seed)
+        return (lambda: model.predict_batch(data)), n_rows, 'rows'
+    return setup
+
+
+def _case_training(seed):
+    try:
+        from . import save_model
+    except ImportError:
+        import save_model
+    data_path = os.path.join(BASE_DIR, 'data', 'data_falcon9.csv')
+    model_dir = tempfile.mkdtemp(prefix='falcon9-bench-')
+    atexit.register(shutil.rmtree, model_dir, ignore_errors=True)
+    # مدل در پوشه موقت ساخته می‌شود تا مدل اصلی پروژه بازنویسی نشود
+    return (lambda: save_model.main(['--data', data_path, '--model-dir', model_dir])), 1, 'fits'
+
+
+# نام مورد: (تابع آماده‌سازی، تعداد تکرار اندازه‌گیری)
+CASES = {
+    'resource_path': (_case_resource_path, 5),
+    'load_model': (_case_load_model, 5),
+    'predict_single': (_case_predict_single, 5),
+    'batch_1k': (_batch_case(1000), 5),
+    'batch_100k': (_batch_case(100000), 3),
+    'batch_1m': (_batch_case(1000000), 1),
+    'training': (_case_training, 3),
+}
+
+
+def run_case(name, seed=DEFAULT_SEED):
+    """اجرای یک مورد در فرآیند جاری؛ خروجی دیکشنری نتایج"""
+    setup, repeats = CASES[name]
+    # پیام‌های چاپی مسیرهای برنامه در نتایج اندازه‌گیری دخالت داده نمی‌شوند
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        run, items, unit = setup(seed)
+        run()
+        first = time.perf_counter() - start
+
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+
+    seconds = min(timings)
+    return {
+        'seconds': seconds,
+        'first_seconds': first,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'items': items,
+        'unit': unit,
+        'throughput': items / seconds if seconds else None,
+        'repeats': repeats,
+    }
+
+
+def run_suite(names=None, seed=DEFAULT_SEED):
+    """اجرای موارد انتخاب‌شده، هر کدام در یک فرآیند جداگانه"""
+    names = names or list(CASES)
+    env = dict(os.environ, PYTHONHASHSEED=str(seed))
+    results = {}
+    for name in names:
+        print(f"اجرای {name}...", flush=True)
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', name, '--seed', str(seed)],
+            capture_output=True, text=True, env=env)
+        if completed.returncode != 0:
+            raise RuntimeError(f"اجرای بنچمارک {name} ناموفق بود:\n{completed.stderr}")
+        results[name] = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """مقایسه نتایج با خط مبنا؛ خروجی فهرست پسرفت‌ها به صورت (مورد، معیار، مبنا، فعلی)"""
+    regressions = []
+    for name, result in current['results'].items():
+        reference = baseline.get('results', {}).get(name)
+        if reference is None:
+            continue
+        for metric in ('seconds', 'peak_rss_kb'):
+            before, after = reference[metric], result[metric]
+            if after <= before * (1 + threshold):
+                continue
+            if metric == 'seconds' and after - before < MIN_TIME_DELTA:
+                continue
+            regressions.append((name, metric, before, after))
+    return regressions
+
+
+def print_results(current, baseline=None):
+    baseline_results = (baseline or {}).get('results', {})
+    print(f"{'مورد':<16} {'زمان (ms)':>12} {'اولین (ms)':>12} {'RSS (MB)':>10} {'توان در ثانیه':>16} {'تغییر':>8}")
+    for name, result in current['results'].items():
+        reference = baseline_results.get(name)
+        change = f"{(result['seconds'] / reference['seconds'] - 1) * 100:+.0f}%" if reference else '-'
+        print(f"{name:<16} {result['seconds'] * 1000:>12.2f} {result['first_seconds'] * 1000:>12.2f} "
+              f"{result['peak_rss_kb'] / 1024:>10.1f} "
+              f"{result['throughput']:>10.0f} {result['unit']:<5} {change:>8}")
+
+
+def _write_json(path, document):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='falcon9-predictor bench',
+                                     description="بنچمارک بارگذاری، پیش‌بینی و آموزش مدل")
+    parser.add_argument('--only', default=None,
+                        help=f"فهرست موارد جداشده با ویرگول ({', '.join(CASES)})")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="بذر داده‌های تصادفی")
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT, help="مسیر فایل JSON نتایج")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="مسیر فایل خط مبنا")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="بیشینه افزایش مجاز نسبت به خط مبنا (0.25 یعنی ۲۵٪)")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="ذخیره نتایج این اجرا به عنوان خط مبنا")
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_case(args.child, args.seed)))
+        return 0
+
+    names = args.only.split(',') if args.only else None
+    unknown = [name for name in names or [] if name not in CASES]
+    if unknown:
+        print(f"مورد ناشناخته: {', '.join(unknown)}", file=sys.stderr)
+        return 1
+
+    try:
+        current = run_suite(names, args.seed)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    _write_json(args.output, current)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_results(current, baseline)
+    print(f"نتایج در '{args.output}' ذخیره شد.")
+
+    if args.save_baseline:
+        _write_json(args.baseline, current)
+        print(f"خط مبنا در '{args.baseline}' ذخیره شد.")
+        return 0
+    if baseline is None:
+        print("خط مبنایی برای مقایسه یافت نشد (با --save-baseline ثبت کنید).")
+        return 0
+
+    regressions = compare(current, baseline, args.threshold)
+    for name, metric, before, after in regressions:
+        print(f"پسرفت در {name}/{metric}: {before:.4g} ← {after:.4g} "
+              f"({(after / before - 1) * 100:+.0f}%)", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+فهرست سابقه بوسترها (بر اساس Serial) و سکوهای پرتاب با به‌روزرسانی O(1) برای هر پرتاب تازه
+
+ویژگی‌های مشتق (HISTORY_FEATURES):
+    DaysSinceLastFlight  روزهای گذشته از پرواز قبلی همان بوستر (پرواز اول: NaN)
+    SerialSuccessRate    نرخ فرود موفق پروازهای قبلی همان بوستر
+    SiteSuccessRate      نرخ فرود موفق پرتاب‌های قبلی از همان سکو
+
+نرخ‌ها با یک موفقیت و یک شکست فرضی هموار می‌شوند ((موفق + ۱) / (تعداد + ۲))، بنابراین بوستر
+یا سکوی بدون سابقه ۰٫۵ می‌گیرد. اگر Serial ورودی معلوم نباشد، ویژگی‌های بوستر NaN هستند و
+ایمپیوتر پایپ‌لاین آن‌ها را پر می‌کند.
+
+برای آموزش، هر سطر مقادیر پیش از همان پرتاب را می‌گیرد (extend داده را یک بار به ترتیب
+تاریخ پیمایش می‌کند و نتیجه‌ای از آینده به سطرها نشت نمی‌کند). برای پیش‌بینی، وضعیت پس از همه
+پرتاب‌های شناخته‌شده استفاده می‌شود. save_model.py فهرست را به صورت آرایه‌های فشرده NumPy
+کنار مدل ذخیره و در به‌روزرسانی افزایشی فقط سطرهای تازه را به آن اضافه می‌کند.
+
+نمونه اجرا:
+    python -m src history                  # ساخت فهرست و گزارش حجم و زمان‌ها
+    python -m src history --serial B1049   # سابقه یک بوستر
+"""
+
+import os
+import sys
+import time
+import pickle
+import argparse
+import datetime
+import tempfile
+import numpy as np
+
+try:
+    from .predictor import FEATURE_COLUMNS, HISTORY_FEATURES, SITE_ALIASES
+except ImportError:
+    from predictor import FEATURE_COLUMNS, HISTORY_FEATURES, SITE_ALIASES
+
+
+HISTORY_FILENAME = 'falcon9_booster_history.pkl'
+# با هر تغییر در تعریف ویژگی‌ها این عدد افزایش می‌یابد تا فایل قبلی کنار گذاشته شود
+HISTORY_VERSION = 1
+# روز وسط ماه برای ورودی‌هایی که فقط سال و ماه دارند
+MID_MONTH_DAY = 14
+EPOCH = datetime.date(1970, 1, 1)
+
+
+def _site_name(site):
+    site = str(site).strip()
+    return SITE_ALIASES.get(site, site)
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and value != value) or value == ''
+
+
+def launch_days(columns):
+    """روز پرتاب هر سطر (تعداد روز از ۱۹۷۰)؛ از ستون Date یا وسط ماه Year/Month"""
+    if 'Date' in columns:
+        return np.asarray(columns['Date'], dtype='datetime64[D]').astype(np.int64)
+    months = ((np.asarray(columns['Year'], dtype=np.int64) - 1970) * 12
+              + np.asarray(columns['Month'], dtype=np.int64) - 1)
+    return months.astype('datetime64[M]').astype('datetime64[D]').astype(np.int64) + MID_MONTH_DAY
+
+
+def _row_day(year, month):
+    # معادل launch_days برای یک سطر، بدون ساخت آرایه
+    return (datetime.date(int(year), int(month), 1) - EPOCH).days + MID_MONTH_DAY
+
+
+class BoosterHistory:
+    """سابقه پروازهای هر بوستر و پرتاب‌های هر سکو در دیکشنری‌های با دسترسی O(1)"""
+
+    def __init__(self):
+        # Serial ← [روز آخرین پرواز، تعداد پرواز، تعداد فرود موفق]
+        self.serials = {}
+        # LaunchSite ← [تعداد پرتاب، تعداد فرود موفق]
+        self.sites = {}
+        self.launches = 0
+        self.last_day = None
+
+    def __len__(self):
+        return self.launches
+
+    def update(self, serial, site, day, success):
+        """ثبت یک پرتاب تازه در O(1)"""
+        success = int(bool(success))
+        if not _is_missing(serial):
+            record = self.serials.get(serial)
+            if record is None:
+                self.serials[serial] = [day, 1, success]
+            else:
+                record[0] = max(record[0], day)
+                record[1] += 1
+                record[2] += success
+        record = self.sites.setdefault(_site_name(site), [0, 0])
+        record[0] += 1
+        record[1] += success
+        self.launches += 1
+        self.last_day = day if self.last_day is None else max(self.last_day, day)
+
+    def features(self, serial, site, day):
+        """ویژگی‌های سابقه یک پرتاب به ترتیب HISTORY_FEATURES در O(1)"""
+        if _is_missing(serial):
+            days = serial_rate = float('nan')
+        else:
+            last_day, flights, successes = self.serials.get(serial, (None, 0, 0))
+            days = float('nan') if last_day is None or day < last_day else float(day - last_day)
+            serial_rate = (successes + 1) / (flights + 2)
+        launches, successes = self.sites.get(_site_name(site), (0, 0))
+        return days, serial_rate, (successes + 1) / (launches + 2)
+
+    def row_features(self, values, serial=None):
+        """ویژگی‌های سابقه برای یک سطر به ترتیب FEATURE_COLUMNS (بدون Date)"""
+        row = dict(zip(FEATURE_COLUMNS, values))
+        return self.features(serial, row['LaunchSite'], _row_day(row['Year'], row['Month']))
+
+    def features_batch(self, columns):
+        """ویژگی‌های سابقه همه سطرهای یک ورودی ستونی؛ آرایه با ابعاد (سطر، HISTORY_FEATURES)
+
+        جستجو برای هر مقدار یکتای Serial و سکو فقط یک بار انجام می‌شود.
+        """
+        days = launch_days(columns)
+        output = np.full((len(days), len(HISTORY_FEATURES)), np.nan)
+
+        if 'Serial' in columns:
+            names, inverse = np.unique(np.asarray(columns['Serial'], dtype=object).astype(str),
+                                       return_inverse=True)
+            table = np.array([(np.nan, np.nan, np.nan) if name in ('None', 'nan', '')
+                              else tuple(self.serials.get(name, (np.nan, 0, 0))) for name in names],
+                             dtype=np.float64).reshape(-1, 3)[inverse]
+            since = days - table[:, 0]
+            output[:, 0] = np.where(since >= 0, since, np.nan)
+            output[:, 1] = (table[:, 2] + 1) / (table[:, 1] + 2)
+
+        names, inverse = np.unique(np.asarray(columns['LaunchSite'], dtype=object).astype(str),
+                                   return_inverse=True)
+        table = np.array([self.sites.get(_site_name(name), (0, 0)) for name in names],
+                         dtype=np.float64).reshape(-1, 2)[inverse]
+        output[:, 2] = (table[:, 1] + 1) / (table[:, 0] + 2)
+        return output
+
+    def extend(self, frame):
+        """افزودن پرتاب‌های یک دیتافریم (با Serial، LaunchSite، Date و Success) به ترتیب تاریخ
+
+        خروجی ویژگی‌های هر سطر پیش از ثبت همان پرتاب، به ترتیب سطرهای ورودی.
+        """
+        days = launch_days({'Date': frame['Date']})
+        order = np.lexsort((frame['FlightNumber'].to_numpy(), days)) if 'FlightNumber' in frame else \
+            np.argsort(days, kind='stable')
+        serials = frame['Serial'].astype(object).to_numpy()
+        sites = frame['LaunchSite'].astype(object).to_numpy()
+        successes = frame['Success'].to_numpy()
+
+        output = np.empty((len(frame), len(HISTORY_FEATURES)))
+        for i in order.tolist():
+            serial = serials[i]
+            serial = None if _is_missing(serial) else str(serial)
+            output[i] = self.features(serial, sites[i], int(days[i]))
+            self.update(serial, sites[i], int(days[i]), successes[i])
+        return output
+
+    def with_history(self, input_data):
+        """ورودی ستونی به همراه ستون‌های HISTORY_FEATURES (اگر از پیش وجود نداشته باشند)"""
+        record_names = getattr(getattr(input_data, 'dtype', None), 'names', None)
+        columns = input_data.columns if hasattr(input_data, 'columns') else record_names or input_data.keys()
+        if all(col in columns for col in HISTORY_FEATURES):
+            return input_data
+        if record_names:
+            input_data = {name: input_data[name] for name in record_names}
+        values = self.features_batch(input_data)
+        added = {col: values[:, i] for i, col in enumerate(HISTORY_FEATURES)}
+        if hasattr(input_data, 'assign'):
+            return input_data.assign(**added)
+        return {**input_data, **added}
+
+    def save(self, path):
+        """ذخیره اتمی به صورت آرایه‌های فشرده NumPy"""
+        serials = list(self.serials)
+        serial_records = np.array([self.serials[name] for name in serials], dtype=np.int64).reshape(-1, 3)
+        sites = list(self.sites)
+        state = {
+            'version': HISTORY_VERSION,
+            'serials': np.array(serials, dtype=str),
+            'last_day': serial_records[:, 0].astype(np.int32),
+            'flights': serial_records[:, 1].astype(np.int32),
+            'serial_successes': serial_records[:, 2].astype(np.int32),
+            'sites': np.array(sites, dtype=str),
+            'site_counts': np.array([self.sites[name] for name in sites], dtype=np.int32).reshape(-1, 2),
+            'launches': self.launches,
+            'last_day_all': self.last_day,
+        }
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if state.get('version') != HISTORY_VERSION:
+            raise ValueError(f"نسخه فایل سابقه بوسترها {path} پشتیبانی نمی‌شود")
+        history = cls()
+        history.serials = {name: [int(day), int(flights), int(successes)] for name, day, flights, successes
+                           in zip(state['serials'].tolist(), state['last_day'], state['flights'],
+                                  state['serial_successes'])}
+        history.sites = {name: [int(n), int(s)] for name, (n, s) in zip(state['sites'].tolist(), state['site_counts'])}
+        history.launches = state['launches']
+        history.last_day = state['last_day_all']
+        return history
+
+
+def build_history(data_path):
+    """ساخت فهرست سابقه از همه پرتاب‌های فایل داده"""
+    try:
+        from .features import load_features
+    except ImportError:
+        from features import load_features
+    history = BoosterHistory()
+    history.extend(load_features(data_path))
+    return history
+
+
+def save_history(model_dir, data_path=None, history=None):
+    """ذخیره فهرست سابقه کنار فایل مدل (از history داده‌شده یا ساخت از فایل داده)؛ خروجی مسیر"""
+    history = history if history is not None else build_history(data_path)
+    path = history.save(os.path.join(model_dir, HISTORY_FILENAME))
+    print(f"سابقه {len(history.serials)} بوستر و {len(history.sites)} سکو در مسیر '{path}' ذخیره شد.")
+    return path
+
+
+def main(argv=None):
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="فهرست سابقه بوسترها و سکوهای پرتاب")
+    parser.add_argument('--data', default=os.path.join(base_dir, 'data', 'data_falcon9.csv'),
+                        help="مسیر فایل داده")
+    parser.add_argument('--serial', default=None, help="نمایش سابقه یک بوستر")
+    args = parser.parse_args(argv)
+
+    try:
+        from .features import load_features
+    except ImportError:
+        from features import load_features
+    frame = load_features(args.data)
+
+    start = time.perf_counter()
+    history = BoosterHistory()
+    history.extend(frame)
+    build_seconds = time.perf_counter() - start
+
+    # برای مقایسه: فقط نرخ موفقیت قبلی هر بوستر با groupby روی کل داده
+    start = time.perf_counter()
+    frame.sort_values('Date').groupby('Serial', observed=True)['Success'].transform(
+        lambda success: success.shift().expanding().mean())
+    groupby_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = history.save(os.path.join(directory, HISTORY_FILENAME))
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        BoosterHistory.load(path)
+        load_seconds = time.perf_counter() - start
+
+    print(f"{len(frame)} پرتاب، {len(history.serials)} بوستر، {len(history.sites)} سکو؛ "
+          f"فایل: {size / 1024:.1f} KB، بارگذاری: {load_seconds * 1000:.2f} میلی‌ثانیه")
+    print(f"ساخت با extend: {build_seconds * 1000:.2f} میلی‌ثانیه "
+          f"({build_seconds / len(frame) * 1e6:.1f} میکروثانیه برای هر پرتاب)؛ "
+          f"groupby pandas فقط برای نرخ بوسترها: {groupby_seconds * 1000:.2f} میلی‌ثانیه")
+
+    if args.serial:
+        record = history.serials.get(args.serial)
+        if record is None:
+            print(f"بوستر {args.serial} در داده نیست.")
+            return 1
+        last_day, flights, successes = record
+        print(f"{args.serial}: {flights} پرواز، {successes} فرود موفق، آخرین پرواز "
+              f"{np.datetime64(last_day, 'D')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
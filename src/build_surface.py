@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+این اسکریپت سطح احتمال موفقیت فرود را روی کل دامنه فرم ورودی پیش‌محاسبه می‌کند.
+
+شبکه شامل همه ترکیب‌های مدار × محل پرتاب × GridFins × استفاده مجدد × پایه‌ها ×
+بلوک × تعداد استفاده قبلی × سال × ماه و وزن محموله با گام قابل تنظیم است. نتیجه به صورت
+یک تانسور .npy (قابل نگاشت در حافظه) به همراه فایل سرآیند JSON ذخیره می‌شود و
+پاسخ هر حالت فرم با یک جستجوی O(1) و درون‌یابی روی وزن محموله به دست می‌آید.
+
+نمونه اجرا:
+    python src/build_surface.py --payload-step 1000 --workers 4
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+
+try:
+    from .predictor import (PredictionModel, FEATURE_COLUMNS, ORBIT_OPTIONS, LAUNCH_SITE_OPTIONS,
+                            BLOCK_OPTIONS, PAYLOAD_RANGE, REUSED_COUNT_RANGE, YEAR_RANGE,
+                            MONTH_RANGE)
+except ImportError:
+    from predictor import (PredictionModel, FEATURE_COLUMNS, ORBIT_OPTIONS, LAUNCH_SITE_OPTIONS,
+                           BLOCK_OPTIONS, PAYLOAD_RANGE, REUSED_COUNT_RANGE, YEAR_RANGE,
+                           MONTH_RANGE)
+
+
+SURFACE_VERSION = 1
+SURFACE_FILENAME = 'falcon9_probability_surface.npy'
+DEFAULT_PAYLOAD_STEP = 1000
+
+# ترتیب محورهای تانسور؛ محور آخر همیشه وزن محموله است
+AXIS_NAMES = ['Orbit', 'LaunchSite', 'GridFins', 'Reused', 'Legs', 'Block',
+              'ReusedCount', 'Year', 'Month', 'PayloadMass']
+
+
+def header_path(surface_path):
+    """مسیر فایل سرآیند کنار تانسور"""
+    return os.path.splitext(surface_path)[0] + '.json'
+
+
+def build_axes(payload_step=DEFAULT_PAYLOAD_STEP):
+    """مقادیر هر محور شبکه بر اساس دامنه فرم ورودی"""
+    payload = list(range(PAYLOAD_RANGE[0], PAYLOAD_RANGE[1], payload_step)) + [PAYLOAD_RANGE[1]]
+    return {
+        'Orbit': list(ORBIT_OPTIONS),
+        'LaunchSite': list(LAUNCH_SITE_OPTIONS),
+        'GridFins': [0, 1],
+        'Reused': [0, 1],
+        'Legs': [0, 1],
+        'Block': list(BLOCK_OPTIONS),
+        'ReusedCount': list(range(REUSED_COUNT_RANGE[0], REUSED_COUNT_RANGE[1] + 1)),
+        'Year': list(range(YEAR_RANGE[0], YEAR_RANGE[1] + 1)),
+        'Month': list(range(MONTH_RANGE[0], MONTH_RANGE[1] + 1)),
+        'PayloadMass': [float(p) for p in payload],
+    }
+
+
+# مدل در هر فرآیند کارگر فقط یک بار بارگذاری می‌شود
+_worker_model = None
+
+
+def _init_worker():
+    global _worker_model
+    _worker_model = PredictionModel()
+
+
+def _sweep_block(task):
+    """محاسبه احتمال برای یک بلوک (مدار، محل پرتاب) و نوشتن آن در تانسور"""
+    surface_path, axes, orbit_index, site_index = task
+    model = _worker_model
+    surface = np.load(surface_path, mmap_mode='r+')
+
+    # محورهای داخلی: بلوک × تعداد استفاده × سال × ماه × وزن محموله
+    inner = np.meshgrid(axes['Block'], axes['ReusedCount'], axes['Year'], axes['Month'],
+                        axes['PayloadMass'], indexing='ij')
+    inner_shape = inner[0].shape
+    block, reused_count, year, month, payload = (grid.ravel() for grid in inner)
+    n_rows = block.size
+
+    for grid_fins in axes['GridFins']:
+        for reused in axes['Reused']:
+            for legs in axes['Legs']:
+                columns = {
+                    'PayloadMass': payload,
+                    'Orbit': np.full(n_rows, axes['Orbit'][orbit_index], dtype=object),
+                    'LaunchSite': np.full(n_rows, axes['LaunchSite'][site_index], dtype=object),
+                    'GridFins': np.full(n_rows, grid_fins),
+                    'Reused': np.full(n_rows, reused),
+                    'Legs': np.full(n_rows, legs),
+                    'Block': block,
+                    'ReusedCount': reused_count,
+                    'Year': year,
+                    'Month': month,
+                }
+                probability = model.predict_batch(columns)['probability'] / 100
+                surface[orbit_index, site_index, grid_fins, reused, legs] = \
+                    probability.reshape(inner_shape)
+
+    surface.flush()
+    del surface
+    return orbit_index, site_index, 2 * 2 * 2 * n_rows
+
+
+def build_surface(surface_path, payload_step=DEFAULT_PAYLOAD_STEP, workers=1, dtype='float32'):
+    """ساخت تانسور احتمال روی کل دامنه ورودی و ذخیره آن به همراه سرآیند"""
+    model = PredictionModel()
+    if not model.is_loaded:
+        raise ValueError("مدل بارگذاری نشده است")
+
+    axes = build_axes(payload_step)
+    shape = tuple(len(axes[name]) for name in AXIS_NAMES)
+    n_cells = int(np.prod(shape))
+    print(f"ابعاد تانسور: {shape} ({n_cells} خانه، "
+          f"{n_cells * np.dtype(dtype).itemsize / 1024 ** 2:.0f} مگابایت)")
+
+    surface = np.lib.format.open_memmap(surface_path, mode='w+', dtype=dtype, shape=shape)
+    del surface
+
+    tasks = [(surface_path, axes, o, s)
+             for o in range(len(axes['Orbit'])) for s in range(len(axes['LaunchSite']))]
+    start_time = time.perf_counter()
+    total_rows = 0
+
+    if workers > 1:
+        import multiprocessing
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            for orbit_index, site_index, rows in pool.imap_unordered(_sweep_block, tasks):
+                total_rows += rows
+                print(f"  {axes['Orbit'][orbit_index]} / {axes['LaunchSite'][site_index]} انجام شد")
+    else:
+        global _worker_model
+        _worker_model = model
+        for task in tasks:
+            orbit_index, site_index, rows = _sweep_block(task)
+            total_rows += rows
+            print(f"  {axes['Orbit'][orbit_index]} / {axes['LaunchSite'][site_index]} انجام شد")
+
+    elapsed = time.perf_counter() - start_time
+    header = {
+        'version': SURFACE_VERSION,
+        'axis_names': AXIS_NAMES,
+        'axes': axes,
+        'shape': list(shape),
+        'dtype': dtype,
+        'payload_step': payload_step,
+        'feature_columns': FEATURE_COLUMNS,
+        'model_hash': model.model_hash,
+    }
+    with open(header_path(surface_path), 'w', encoding='utf-8') as f:
+        json.dump(header, f, ensure_ascii=False, indent=2)
+
+    print(f"{total_rows} ترکیب در {elapsed:.1f} ثانیه محاسبه شد "
+          f"({total_rows / elapsed:.0f} سطر در ثانیه).")
+    return surface_path
+
+
+class ProbabilitySurface:
+    """پاسخ‌گویی به حالت‌های فرم ورودی از روی تانسور پیش‌محاسبه‌شده (بدون sklearn)"""
+
+    def __init__(self, surface_path):
+        with open(header_path(surface_path), 'r', encoding='utf-8') as f:
+            self.header = json.load(f)
+        if self.header.get('version') != SURFACE_VERSION:
+            raise ValueError(f"نسخه سطح احتمال پشتیبانی نمی‌شود: {self.header.get('version')}")
+
+        self.surface = np.load(surface_path, mmap_mode='r')
+        self.model_hash = self.header.get('model_hash')
+        axes = self.header['axes']
+        self.payload = np.asarray(axes['PayloadMass'], dtype=np.float64)
+        # نگاشت مقدار هر محور گسسته به اندیس آن
+        self._index = [{self._axis_key(value): i for i, value in enumerate(axes[name])}
+                       for name in AXIS_NAMES[:-1]]
+        # موقعیت هر محور در تاپل ورودی با ترتیب FEATURE_COLUMNS
+        self._source = [FEATURE_COLUMNS.index(name) for name in AXIS_NAMES[:-1]]
+        self._payload_source = FEATURE_COLUMNS.index('PayloadMass')
+
+    @staticmethod
+    def _axis_key(value):
+        return value if isinstance(value, str) else float(value)
+
+    @classmethod
+    def load(cls, surface_path, model_hash=None):
+        """بارگذاری سطح احتمال در صورت وجود و سازگاری با مدل فعلی؛ در غیر این صورت None"""
+        if not os.path.exists(surface_path) or not os.path.exists(header_path(surface_path)):
+            return None
+        surface = cls(surface_path)
+        if model_hash is not None and surface.model_hash != model_hash:
+            print("سطح احتمال با مدل فعلی ساخته نشده است و استفاده نمی‌شود.")
+            return None
+        return surface
+
+    def lookup(self, values):
+        """احتمال موفقیت (درصد) برای یک سطر؛ اگر خارج از دامنه باشد None"""
+        try:
+            index = tuple(axis[self._axis_key(values[source])]
+                          for axis, source in zip(self._index, self._source))
+            payload = float(values[self._payload_source])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not self.payload[0] <= payload <= self.payload[-1]:
+            return None
+        return float(np.interp(payload, self.payload, self.surface[index])) * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description="پیش‌محاسبه سطح احتمال روی دامنه فرم ورودی")
+    parser.add_argument('--payload-step', type=int, default=DEFAULT_PAYLOAD_STEP,
+                        help="گام وزن محموله (کیلوگرم)")
+    parser.add_argument('--workers', type=int, default=1, help="تعداد فرآیندهای کارگر")
+    parser.add_argument('--dtype', choices=['float32', 'float16'], default='float32',
+                        help="نوع داده تانسور خروجی")
+    parser.add_argument('-o', '--output', default=None, help="مسیر فایل .npy خروجی")
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = args.output or os.path.join(base_dir, 'models', SURFACE_FILENAME)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    try:
+        build_surface(output, args.payload_step, args.workers, args.dtype)
+    except ValueError as e:
+        print(f"خطا در ساخت سطح احتمال: {e}")
+        return 1
+
+    print(f"سطح احتمال در مسیر '{output}' ذخیره شد.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+فشرده‌سازی مدل کامپایل‌شده: حذف درخت‌های زائد، ادغام زیردرخت‌های تکراری و ذخیره float32
+
+جنگل ۱۰۰ درختی روی حدود ۷۰ سطر آموزش دیده و بسیاری از درخت‌ها و زیردرخت‌های آن تکراری یا
+کم‌اثر هستند. فشرده‌سازی در سه مرحله انجام می‌شود:
+
+1. آستانه‌ها به float32 (با گرد کردن رو به پایین، بنابراین مسیر هیچ ورودی تغییر نمی‌کند) و
+   احتمال گره‌ها به float32 یا سطوح کوانتیزه تبدیل می‌شوند.
+2. درخت‌ها به صورت حریصانه انتخاب می‌شوند تا بیشینه اختلاف احتمال موفقیت با جنگل کامل روی
+   سطرهای مرجع (داده آموزش و آزمون به علاوه ورودی‌های تصادفی در دامنه فرم) از tolerance
+   (واحد درصد) بیشتر نشود.
+3. گره‌های یکسان همه درخت‌ها یک بار ذخیره می‌شوند (جدول گره‌ها به گراف بدون دور تبدیل
+   می‌شود) و تقسیم‌هایی که هر دو شاخه آن‌ها یکسان است حذف می‌شوند.
+
+خروجی همان قالب .f9m است و بدون تغییر با PredictionModel بارگذاری می‌شود.
+
+نمونه اجرا:
+    python src/compact_model.py --tolerance 1.0                # ساخت و گزارش مقایسه
+    python src/compact_model.py --tolerance 1.0 --quantize 255 --install
+"""
+
+import os
+import sys
+import time
+import pickle
+import argparse
+import numpy as np
+
+try:
+    from .compiled_model import CompiledPipeline
+    from .model_artifact import save_artifact, load_artifact, ARTIFACT_FILENAME
+    from .predictor import FEATURE_COLUMNS, random_launches
+except ImportError:
+    from compiled_model import CompiledPipeline
+    from model_artifact import save_artifact, load_artifact, ARTIFACT_FILENAME
+    from predictor import FEATURE_COLUMNS, random_launches
+
+
+DEFAULT_TOLERANCE = 1.0
+DEFAULT_REFERENCE_ROWS = 5000
+COMPACT_FILENAME = 'falcon9_landing_model.compact.f9m'
+
+
+def float32_thresholds(threshold):
+    """تبدیل آستانه‌ها به float32 بدون تغییر نتیجه مقایسه برای ورودی‌های float32
+
+    ورودی جنگل float32 است؛ برای هر x از نوع float32 شرط x <= t معادل x <= t32 است اگر
+    t32 بزرگ‌ترین مقدار float32 کوچک‌تر یا مساوی t باشد.
+    """
+    threshold32 = threshold.astype(np.float32)
+    rounded_up = threshold32.astype(np.float64) > threshold
+    threshold32[rounded_up] = np.nextafter(threshold32[rounded_up], np.float32(-np.inf))
+    return threshold32
+
+
+def quantize_values(value, levels=0):
+    """احتمال گره‌ها به float32؛ با levels مثبت به نزدیک‌ترین مضرب 1/levels گرد می‌شوند"""
+    value = value.astype(np.float32)
+    if levels:
+        value = (np.round(value * levels) / levels).astype(np.float32)
+    return value
+
+
+def tree_probabilities(compiled, X, value, class_index):
+    """احتمال کلاس در برگ هر سطر برای هر درخت؛ ابعاد (سطر، درخت)"""
+    return value[compiled._leaves(X), class_index].astype(np.float64)
+
+
+def select_trees(probabilities, target, tolerance):
+    """انتخاب حریصانه کمترین تعداد درخت با بیشینه اختلاف میانگین از target کمتر از tolerance
+
+    در هر گام درختی افزوده می‌شود که بیشینه اختلاف (و در تساوی، میانگین اختلاف) را کمینه کند.
+    خروجی فهرست اندیس درخت‌ها به ترتیب انتخاب است.
+    """
+    n_rows, n_trees = probabilities.shape
+    selected = []
+    remaining = np.ones(n_trees, dtype=bool)
+    total = np.zeros(n_rows)
+    while remaining.any():
+        candidates = np.flatnonzero(remaining)
+        error = np.abs((total[:, None] + probabilities[:, candidates]) / (len(selected) + 1)
+                       - target[:, None])
+        score = error.max(axis=0) + error.mean(axis=0) * 1e-6
+        best = candidates[score.argmin()]
+        selected.append(int(best))
+        remaining[best] = False
+        total += probabilities[:, best]
+        if error.max(axis=0)[score.argmin()] <= tolerance:
+            break
+    return selected
+
+
+def _node_tables(compiled, threshold, value):
+    return (compiled.left.tolist(), compiled.right.tolist(), compiled.feature.tolist(),
+            threshold.tolist(), [row.tobytes() for row in value])
+
+
+def rebuild(compiled, trees, threshold, value):
+    """ساخت جدول گره‌های تازه برای درخت‌های انتخاب‌شده با اشتراک گره‌های یکسان
+
+    هر گره با (ویژگی، آستانه، فرزندان، احتمال) شناسایی می‌شود و فقط یک بار ذخیره می‌شود؛
+    تقسیمی که هر دو فرزند آن یک گره باشند با همان فرزند جایگزین می‌شود.
+    """
+    left, right, feature, threshold_list, value_bytes = _node_tables(compiled, threshold, value)
+    roots = compiled.roots.tolist()
+    new_index = {}
+    new_left, new_right, new_feature, new_threshold, new_value = [], [], [], [], []
+    depth = []
+
+    def add(key, l, r, f, t, v, d):
+        index = new_index.get(key)
+        if index is None:
+            index = len(new_left)
+            new_index[key] = index
+            new_left.append(index if l is None else l)
+            new_right.append(index if r is None else r)
+            new_feature.append(f)
+            new_threshold.append(t)
+            new_value.append(v)
+            depth.append(d)
+        return index
+
+    def visit(node):
+        # پیمایش پس‌ترتیب بدون بازگشت تا عمق درخت محدودیتی نداشته باشد
+        stack = [(node, False)]
+        result = {}
+        while stack:
+            current, expanded = stack.pop()
+            if left[current] == current:
+                result[current] = add(('leaf', value_bytes[current]), None, None, 0, np.inf,
+                                      current, 0)
+                continue
+            if not expanded:
+                stack += [(current, True), (left[current], False), (right[current], False)]
+                continue
+            l, r = result[left[current]], result[right[current]]
+            if l == r:
+                result[current] = l
+                continue
+            key = ('split', feature[current], threshold_list[current], l, r, value_bytes[current])
+            result[current] = add(key, l, r, feature[current], threshold_list[current], current,
+                                  max(depth[l], depth[r]) + 1)
+        return result[node]
+
+    new_roots = [visit(roots[tree]) for tree in trees]
+    source = np.asarray(new_value, dtype=np.intp)
+    n_nodes = len(new_left)
+    index_type = np.uint16 if n_nodes <= np.iinfo(np.uint16).max else np.int32
+    feature_type = np.uint8 if compiled.n_outputs <= np.iinfo(np.uint8).max else np.int32
+    return {
+        'left': np.asarray(new_left, dtype=index_type),
+        'right': np.asarray(new_right, dtype=index_type),
+        'feature': np.asarray(new_feature, dtype=feature_type),
+        'threshold': np.asarray(new_threshold, dtype=np.float32),
+        'value': np.ascontiguousarray(value[source]),
+        'roots': np.asarray(new_roots, dtype=index_type),
+        'max_depth': max(depth[root] for root in new_roots),
+    }
+
+
+def reference_rows(X, n_random=DEFAULT_REFERENCE_ROWS, seed=42, columns=FEATURE_COLUMNS):
+    """سطرهای مرجع برای سنجش وفاداری: داده واقعی به علاوه ورودی‌های تصادفی در دامنه فرم
+
+    ستون‌هایی از columns که ورودی تصادفی ندارند (مانند ویژگی‌های سابقه بوستر) برای سطرهای
+    تصادفی گمشده (NaN) هستند.
+    """
+    random_rows = random_launches(n_random, seed)
+    return {col: np.concatenate([np.asarray(X[col]), random_rows.get(col, np.full(n_random, np.nan))])
+            for col in columns}
+
+
+def compact(compiled, reference, tolerance=DEFAULT_TOLERANCE, quantize=0):
+    """ساخت نسخه فشرده مدل کامپایل‌شده؛ خروجی (CompiledPipeline تازه، بیشینه اختلاف به درصد)"""
+    class_index = list(compiled.classes).index(1)
+    features = compiled.transform(reference)
+    target = compiled.predict_proba_matrix(features)[:, class_index]
+
+    threshold = float32_thresholds(compiled.threshold)
+    value = quantize_values(compiled.value, quantize)
+    probabilities = tree_probabilities(compiled, features, value, class_index)
+    trees = select_trees(probabilities, target, tolerance / 100)
+
+    arrays = rebuild(compiled, trees, threshold, value)
+    max_depth = arrays.pop('max_depth')
+    arrays.update({name: compiled.arrays()[name] for name in CompiledPipeline.ARRAY_NAMES
+                   if name not in arrays})
+    metadata = dict(compiled.metadata, max_depth=int(max_depth), compaction={
+        'tolerance': tolerance,
+        'quantize': quantize,
+        'trees_before': compiled.n_trees,
+        'trees_after': len(trees),
+        'nodes_before': compiled.n_nodes,
+        'nodes_after': len(arrays['left']),
+    })
+    result = CompiledPipeline(metadata, arrays)
+    deviation = np.abs(result.predict_proba_matrix(features)[:, class_index] - target).max()
+    return result, deviation * 100
+
+
+# ----------------------------------------------------------------------
+# گزارش مقایسه
+# ----------------------------------------------------------------------
+
+def _best_time(function, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _auc(y, score):
+    """سطح زیر منحنی ROC بر اساس رتبه‌ها (معادل آماره Mann-Whitney)"""
+    y = np.asarray(y).astype(bool)
+    n_positive, n_negative = y.sum(), (~y).sum()
+    if not n_positive or not n_negative:
+        return float('nan')
+    order = np.argsort(score, kind='mergesort')
+    ranks = np.empty(len(score))
+    sorted_score = np.asarray(score)[order]
+    # رتبه میانگین برای مقادیر برابر
+    _, first, counts = np.unique(sorted_score, return_index=True, return_counts=True)
+    ranks[order] = np.repeat(first + (counts + 1) / 2, counts)
+    return (ranks[y].sum() - n_positive * (n_positive + 1) / 2) / (n_positive * n_negative)
+
+
+def describe(name, path, load, predict_matrix, evaluation, reference, repeats=5):
+    """اندازه فایل، زمان بارگذاری، تأخیر پیش‌بینی و دقت/AUC یک مدل"""
+    load_seconds = _best_time(load, repeats)
+    model = load()
+    single_row = {col: values[:1] for col, values in reference.items()}
+    batch = {col: values[:1000] for col, values in reference.items()}
+    row = {
+        'name': name,
+        'file_bytes': os.path.getsize(path),
+        'load_ms': load_seconds * 1000,
+        'single_ms': _best_time(lambda: predict_matrix(model, single_row), repeats * 20) * 1000,
+        'batch_1k_ms': _best_time(lambda: predict_matrix(model, batch), repeats) * 1000,
+        'reference': predict_matrix(model, reference),
+    }
+    for split, (X, y) in evaluation.items():
+        probability = predict_matrix(model, X)
+        row[f'{split}_accuracy'] = float(((probability >= 0.5) == np.asarray(y).astype(bool)).mean())
+        row[f'{split}_auc'] = _auc(y, probability)
+    return row
+
+
+def compare_models(pickle_path, artifact_path, compact_path, evaluation, reference):
+    """مقایسه مدل pickle، فایل قابل نگاشت و نسخه فشرده"""
+    import pandas as pd
+
+    def pipeline_success(pipeline, data):
+        frame = pd.DataFrame({col: data[col] for col in pipeline.feature_names_in_})
+        return pipeline.predict_proba(frame)[:, list(pipeline.classes_).index(1)]
+
+    def compiled_success(compiled, data):
+        return compiled.predict_proba(data)[:, list(compiled.classes).index(1)]
+
+    def read_pickle():
+        with open(pickle_path, 'rb') as f:
+            return pickle.load(f)
+
+    rows = []
+    if pickle_path and os.path.exists(pickle_path):
+        rows.append(describe('pickle', pickle_path, read_pickle, pipeline_success,
+                             evaluation, reference))
+    rows.append(describe('f9m', artifact_path, lambda: load_artifact(artifact_path)[0],
+                         compiled_success, evaluation, reference))
+    rows.append(describe('compact', compact_path, lambda: load_artifact(compact_path)[0],
+                         compiled_success, evaluation, reference))
+
+    original = rows[0]['reference']
+    for row in rows:
+        row['max_deviation'] = float(np.abs(row.pop('reference') - original).max() * 100)
+    return rows
+
+
+def print_report(rows, metadata):
+    info = metadata.get('compaction', {})
+    print(f"درخت‌ها: {info.get('trees_before')} ← {info.get('trees_after')}، "
+          f"گره‌ها: {info.get('nodes_before')} ← {info.get('nodes_after')}، "
+          f"tolerance: {info.get('tolerance')} درصد، quantize: {info.get('quantize') or 'float32'}")
+    splits = [key[:-len('_accuracy')] for key in rows[0] if key.endswith('_accuracy')]
+    header = (f"{'مدل':<8} {'اندازه (KB)':>11} {'بارگذاری (ms)':>13} {'تک‌سطری (ms)':>13} "
+              f"{'1k سطر (ms)':>12} {'اختلاف (%)':>10}")
+    for split in splits:
+        header += f" {split + ' acc':>10} {split + ' AUC':>10}"
+    print(header)
+    for row in rows:
+        line = (f"{row['name']:<8} {row['file_bytes'] / 1024:>11.1f} {row['load_ms']:>13.2f} "
+                f"{row['single_ms']:>13.3f} {row['batch_1k_ms']:>12.2f} {row['max_deviation']:>10.2f}")
+        for split in splits:
+            line += f" {row[split + '_accuracy']:>10.3f} {row[split + '_auc']:>10.3f}"
+        print(line)
+
+
+def compact_saved_model(model_dir, tolerance=DEFAULT_TOLERANCE, quantize=0, output=None,
+                        install=False, n_reference=DEFAULT_REFERENCE_ROWS):
+    """فشرده‌سازی مدل ذخیره‌شده در model_dir و چاپ گزارش مقایسه؛ خروجی مسیر فایل فشرده
+
+    با install فایل .f9m اصلی با نسخه فشرده جایگزین می‌شود (فایل pickle دست نمی‌خورد).
+    """
+    import pandas as pd
+    try:
+        from .save_model import MODEL_FILENAME, ROWS_FILENAME
+        from .resources import write_manifest, MANIFEST_FILENAME as RESOURCE_MANIFEST_FILENAME
+    except ImportError:
+        from save_model import MODEL_FILENAME, ROWS_FILENAME
+        from resources import write_manifest, MANIFEST_FILENAME as RESOURCE_MANIFEST_FILENAME
+
+    pickle_path = os.path.join(model_dir, MODEL_FILENAME)
+    artifact_path = os.path.join(model_dir, ARTIFACT_FILENAME)
+    output = output or os.path.join(model_dir, COMPACT_FILENAME)
+    with open(os.path.join(model_dir, ROWS_FILENAME), 'rb') as f:
+        rows = pickle.load(f)
+
+    original, header = load_artifact(artifact_path)
+    if 'compaction' in original.metadata:
+        raise ValueError(f"مدل '{artifact_path}' قبلاً فشرده شده است؛ ابتدا مدل را دوباره بسازید")
+    evaluation = {'train': (rows['X_train'], rows['y_train']), 'test': (rows['X_test'], rows['y_test'])}
+    reference = reference_rows(pd.concat([rows['X_train'], rows['X_test']]), n_reference,
+                               columns=original.feature_columns)
+
+    compacted, deviation = compact(original, reference, tolerance, quantize)
+    save_artifact(compacted, output, sklearn_version=header.get('sklearn_version'))
+    print(f"مدل فشرده در '{output}' ذخیره شد (بیشینه اختلاف روی {len(reference['Year'])} "
+          f"سطر مرجع: {deviation:.2f} درصد).")
+    print_report(compare_models(pickle_path, artifact_path, output, evaluation, reference),
+                 compacted.metadata)
+
+    if install:
+        os.replace(output, artifact_path)
+        print(f"فایل '{artifact_path}' با نسخه فشرده جایگزین شد.")
+        resource_root = os.path.dirname(os.path.abspath(model_dir))
+        if os.path.exists(os.path.join(resource_root, RESOURCE_MANIFEST_FILENAME)):
+            write_manifest(resource_root)
+        return artifact_path
+    return output
+
+
+def main(argv=None):
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(prog='falcon9-predictor compact',
+                                     description="فشرده‌سازی مدل و گزارش اندازه، سرعت و دقت")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="بیشینه اختلاف مجاز احتمال موفقیت با مدل اصلی (واحد درصد)")
+    parser.add_argument('--quantize', type=int, default=0,
+                        help="تعداد سطوح کوانتیزه کردن احتمال گره‌ها (0 یعنی float32)")
+    parser.add_argument('--reference-rows', type=int, default=DEFAULT_REFERENCE_ROWS,
+                        help="تعداد ورودی‌های تصادفی افزوده به سطرهای مرجع")
+    parser.add_argument('--model-dir', default=os.path.join(base_dir, 'models'))
+    parser.add_argument('-o', '--output', default=None, help="مسیر فایل فشرده")
+    parser.add_argument('--install', action='store_true',
+                        help="جایگزینی فایل .f9m اصلی با نسخه فشرده")
+    args = parser.parse_args(argv)
+
+    try:
+        compact_saved_model(args.model_dir, args.tolerance, args.quantize, args.output,
+                            args.install, args.reference_rows)
+    except (OSError, ValueError) as e:
+        print(f"فشرده‌سازی ممکن نشد: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+نسخه کامپایل‌شده پایپ‌لاین آموزش‌دیده برای پیش‌بینی سریع
+
+پایپ‌لاین sklearn (ایمپیوترها، StandardScaler، OneHotEncoder و RandomForest) یک بار
+به آرایه‌های تخت NumPy تبدیل می‌شود و پس از آن پیش‌بینی بدون pandas و sklearn انجام می‌شود.
+این ماژول در زمان اجرا فقط به NumPy وابسته است.
+
+بررسی برابری با مدل pickle شده:
+    python src/compiled_model.py
+"""
+
+import os
+import sys
+import time
+from array import array
+import numpy as np
+
+
+# حداکثر تعداد سطر در هر مرحله پیمایش دسته‌ای (برای محدود ماندن حافظه)
+TRAVERSAL_CHUNK_ROWS = 4096
+
+
+def _is_missing(value):
+    """تشخیص مقدار گمشده (None یا NaN)"""
+    return value is None or (isinstance(value, float) and value != value)
+
+
+class CompiledPipeline:
+    """پایپ‌لاین فشرده‌شده به آرایه‌های پیوسته NumPy
+
+    پارامترهای پیش‌پردازش و گره‌های تمام درخت‌ها در آرایه‌های تخت نگه داشته می‌شوند.
+    گره‌های برگ به خودشان اشاره می‌کنند تا پیمایش همه درخت‌ها به صورت برداری
+    و با تعداد گام ثابت (عمق بیشینه) انجام شود.
+    """
+
+    # نام آرایه‌هایی که وضعیت کامل مدل را تشکیل می‌دهند
+    ARRAY_NAMES = ('num_source', 'num_target', 'num_fill', 'num_mean', 'num_scale',
+                   'cat_source', 'cat_offset', 'left', 'right', 'feature',
+                   'threshold', 'value', 'roots')
+
+    def __init__(self, metadata, arrays):
+        self.metadata = metadata
+        self.feature_columns = list(metadata['feature_columns'])
+        self.classes = np.asarray(metadata['classes'])
+        self.n_outputs = int(metadata['n_outputs'])
+        self.max_depth = int(metadata['max_depth'])
+        self.cat_fill = list(metadata['cat_fill'])
+        self.categories = [list(cats) for cats in metadata['categories']]
+
+        for name in self.ARRAY_NAMES:
+            setattr(self, name, arrays[name])
+
+        # جدول جستجوی دسته‌ها: مقدار ← ستون خروجی
+        self.category_index = [
+            {category: offset + i for i, category in enumerate(cats)}
+            for offset, cats in zip(self.cat_offset.tolist(), self.categories)
+        ]
+        self._num_pairs = list(zip(self.num_source.tolist(), self.num_target.tolist(),
+                                   self.num_fill.tolist(), self.num_mean.tolist(),
+                                   self.num_scale.tolist()))
+        self._cat_pairs = list(zip(self.cat_source.tolist(), self.cat_fill, self.category_index))
+        self._row_tables = None
+        self._batch_tables = None
+        self._source_columns = None
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.left)
+
+    def _get_row_tables(self):
+        """نسخه لیستی آرایه‌ها برای پیمایش تک‌سطری بدون سربار فراخوانی NumPy
+
+        فقط در اولین پیش‌بینی تک‌سطری ساخته می‌شود تا مسیر دسته‌ای حافظه اضافه مصرف نکند.
+        """
+        if self._row_tables is None:
+            self._row_tables = (self.left.tolist(), self.right.tolist(),
+                                self.feature.tolist(), self.threshold.tolist(),
+                                self.roots.tolist(), [tuple(v) for v in self.value.tolist()])
+        return self._row_tables
+
+    def _get_batch_tables(self):
+        """جدول فرزندان به صورت [چپ، راست] پشت سر هم برای پیمایش دسته‌ای با take"""
+        if self._batch_tables is None:
+            children = np.empty(2 * self.n_nodes, dtype=np.intp)
+            children[0::2] = self.left
+            children[1::2] = self.right
+            self._batch_tables = (children, self.feature.astype(np.intp), self.threshold)
+        return self._batch_tables
+
+    def _get_source_columns(self):
+        """ستون ورودی اصلی هر ستون خروجی پیش‌پردازش (همه ستون‌های one-hot یک ویژگی به آن نگاشت می‌شوند)"""
+        if self._source_columns is None:
+            source = np.empty(self.n_outputs, dtype=np.intp)
+            source[self.num_target] = self.num_source
+            for column, offset, cats in zip(self.cat_source.tolist(), self.cat_offset.tolist(),
+                                            self.categories):
+                source[offset:offset + len(cats)] = column
+            self._source_columns = source
+        return self._source_columns
+    
+    def arrays(self):
+        """آرایه‌های تشکیل‌دهنده مدل (برای ذخیره‌سازی)"""
+        return {name: getattr(self, name) for name in self.ARRAY_NAMES}
+
+    # ------------------------------------------------------------------
+    # ساخت از روی پایپ‌لاین sklearn
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_pipeline(cls, pipeline, feature_columns=None):
+        """تبدیل پایپ‌لاین آموزش‌دیده (ColumnTransformer + RandomForest) به آرایه‌های تخت"""
+        preprocessor = pipeline.steps[0][1]
+        forest = pipeline.steps[-1][1]
+
+        if feature_columns is None:
+            feature_columns = list(getattr(preprocessor, 'feature_names_in_', []))
+        if not feature_columns:
+            raise ValueError("نام ستون‌های ورودی پایپ‌لاین مشخص نیست")
+        position = {name: i for i, name in enumerate(feature_columns)}
+
+        num = {'source': [], 'target': [], 'fill': [], 'mean': [], 'scale': []}
+        cat = {'source': [], 'offset': [], 'fill': [], 'categories': []}
+        output_column = 0
+
+        for name, transformer, columns in preprocessor.transformers_:
+            if transformer == 'drop' or len(columns) == 0:
+                continue
+            steps = transformer.steps if hasattr(transformer, 'steps') else [(name, transformer)]
+            if transformer == 'passthrough':
+                steps = []
+
+            fill = [np.nan] * len(columns)
+            mean = [0.0] * len(columns)
+            scale = [1.0] * len(columns)
+            categories = None
+
+            for _, step in steps:
+                kind = type(step).__name__
+                if kind == 'SimpleImputer':
+                    fill = list(step.statistics_)
+                elif kind == 'StandardScaler':
+                    if step.mean_ is not None:
+                        mean = list(step.mean_)
+                    if step.scale_ is not None:
+                        scale = list(step.scale_)
+                elif kind == 'OneHotEncoder':
+                    if step.drop is not None:
+                        raise ValueError("OneHotEncoder با drop پشتیبانی نمی‌شود")
+                    categories = [list(c) for c in step.categories_]
+                else:
+                    raise ValueError(f"مرحله پیش‌پردازش پشتیبانی نمی‌شود: {kind}")
+
+            if categories is None:
+                for i, column in enumerate(columns):
+                    num['source'].append(position[column])
+                    num['target'].append(output_column)
+                    num['fill'].append(float(fill[i]))
+                    num['mean'].append(float(mean[i]))
+                    num['scale'].append(float(scale[i]))
+                    output_column += 1
+            else:
+                for i, column in enumerate(columns):
+                    cat['source'].append(position[column])
+                    cat['offset'].append(output_column)
+                    cat['fill'].append(None if _is_missing(fill[i]) else fill[i])
+                    cat['categories'].append([c.item() if hasattr(c, 'item') else c
+                                              for c in categories[i]])
+                    output_column += len(categories[i])
+
+        if output_column != forest.n_features_in_:
+            raise ValueError("تعداد ستون‌های پیش‌پردازش با مدل سازگار نیست")
+
+        arrays = cls._pack_trees([tree.tree_ for tree in forest.estimators_])
+        arrays.update({
+            'num_source': np.asarray(num['source'], dtype=np.int64),
+            'num_target': np.asarray(num['target'], dtype=np.int64),
+            'num_fill': np.asarray(num['fill'], dtype=np.float64),
+            'num_mean': np.asarray(num['mean'], dtype=np.float64),
+            'num_scale': np.asarray(num['scale'], dtype=np.float64),
+            'cat_source': np.asarray(cat['source'], dtype=np.int64),
+            'cat_offset': np.asarray(cat['offset'], dtype=np.int64),
+        })
+        metadata = {
+            'feature_columns': list(feature_columns),
+            'classes': [c.item() if hasattr(c, 'item') else c for c in forest.classes_],
+            'n_outputs': output_column,
+            'max_depth': int(arrays.pop('max_depth')),
+            'cat_fill': cat['fill'],
+            'categories': cat['categories'],
+        }
+        return cls(metadata, arrays)
+
+    @staticmethod
+    def _pack_trees(trees):
+        """قرار دادن گره‌های همه درخت‌ها در آرایه‌های پیوسته با اندیس سراسری"""
+        left, right, feature, threshold, value, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for tree in trees:
+            n = tree.node_count
+            ids = np.arange(n) + offset
+            is_leaf = tree.children_left == -1
+
+            left.append(np.where(is_leaf, ids, tree.children_left + offset))
+            right.append(np.where(is_leaf, ids, tree.children_right + offset))
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+
+            # همانند predict_proba درخت، مقادیر هر برگ نرمال می‌شوند
+            node_value = tree.value[:, 0, :].astype(np.float64)
+            normalizer = node_value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            value.append(node_value / normalizer)
+
+            roots.append(offset)
+            max_depth = max(max_depth, tree.max_depth)
+            offset += n
+
+        return {
+            'left': np.ascontiguousarray(np.concatenate(left), dtype=np.int32),
+            'right': np.ascontiguousarray(np.concatenate(right), dtype=np.int32),
+            'feature': np.ascontiguousarray(np.concatenate(feature), dtype=np.int32),
+            'threshold': np.ascontiguousarray(np.concatenate(threshold), dtype=np.float64),
+            'value': np.ascontiguousarray(np.concatenate(value), dtype=np.float64),
+            'roots': np.asarray(roots, dtype=np.int32),
+            'max_depth': max_depth,
+        }
+
+    # ------------------------------------------------------------------
+    # پیش‌پردازش
+    # ------------------------------------------------------------------
+
+    def _row_vector(self, values):
+        """بردار ویژگی یک سطر به صورت لیست پایتون با دقت float32"""
+        x = [0.0] * self.n_outputs
+        for source, target, fill, mean, scale in self._num_pairs:
+            value = values[source]
+            if _is_missing(value):
+                value = fill
+            x[target] = (float(value) - mean) / scale
+        for source, fill, index in self._cat_pairs:
+            value = values[source]
+            if _is_missing(value):
+                value = fill
+            column = index.get(value)
+            if column is not None:
+                x[column] = 1.0
+        # جنگل تصادفی ورودی را به float32 تبدیل می‌کند
+        return array('f', x).tolist()
+
+    def transform_row(self, values):
+        """تبدیل یک سطر (تاپل به ترتیب feature_columns) به بردار ویژگی مدل"""
+        return np.asarray(self._row_vector(values), dtype=np.float32)
+
+    def transform(self, columns):
+        """تبدیل داده ستونی (DataFrame، دیکشنری یا آرایه رکوردی) به ماتریس ویژگی"""
+        n_rows = len(np.asarray(columns[self.feature_columns[0]]))
+        X = np.zeros((n_rows, self.n_outputs), dtype=np.float64)
+
+        for source, target, fill, mean, scale in self._num_pairs:
+            column = np.asarray(columns[self.feature_columns[source]], dtype=np.float64)
+            column = np.where(np.isnan(column), fill, column)
+            X[:, target] = (column - mean) / scale
+
+        rows = np.arange(n_rows)
+        for source, fill, index in self._cat_pairs:
+            column = np.asarray(columns[self.feature_columns[source]], dtype=object)
+            target = np.fromiter(
+                (index.get(fill if _is_missing(v) else v, -1) for v in column),
+                dtype=np.int64, count=n_rows)
+            known = target >= 0
+            X[rows[known], target[known]] = 1.0
+
+        return X.astype(np.float32)
+
+    # ------------------------------------------------------------------
+    # پیمایش درخت‌ها
+    # ------------------------------------------------------------------
+
+    def _leaves(self, X):
+        """یافتن برگ نهایی هر سطر در هر درخت؛ خروجی با ابعاد (سطر، درخت)"""
+        n_rows, n_columns = X.shape
+        children, feature, threshold = self._get_batch_tables()
+        node = np.broadcast_to(self.roots.astype(np.intp), (n_rows, self.n_trees)).copy()
+        row_offset = (np.arange(n_rows, dtype=np.intp) * n_columns)[:, None]
+        flat_X = np.ascontiguousarray(X).ravel()
+        for _ in range(self.max_depth):
+            go_right = flat_X.take(feature.take(node) + row_offset) > threshold.take(node)
+            node = children.take(2 * node + go_right)
+        return node
+
+    def predict_proba_matrix(self, X):
+        """احتمال کلاس‌ها برای ماتریس ویژگی پیش‌پردازش‌شده"""
+        proba = np.empty((X.shape[0], len(self.classes)), dtype=np.float64)
+        for start in range(0, X.shape[0], TRAVERSAL_CHUNK_ROWS):
+            stop = start + TRAVERSAL_CHUNK_ROWS
+            proba[start:stop] = self.value[self._leaves(X[start:stop])].mean(axis=1)
+        return proba
+
+    def contributions_matrix(self, X, class_index):
+        """سهم هر ویژگی ورودی در احتمال یک کلاس بر اساس مسیر تصمیم درخت‌ها
+
+        در هر گره، تغییر احتمال کلاس از گره به فرزند انتخاب‌شده به ویژگی همان تقسیم نسبت
+        داده می‌شود و نتیجه روی همه درخت‌ها میانگین گرفته می‌شود. پیمایش برای همه سطرها و
+        درخت‌ها هم‌زمان انجام می‌شود. خروجی (مقدار پایه، سهم‌ها با ابعاد (سطر، ویژگی ورودی))
+        است و مقدار پایه به علاوه مجموع سهم‌های هر سطر دقیقاً برابر احتمال پیش‌بینی‌شده است.
+        """
+        n_rows, n_columns = X.shape
+        n_features = len(self.feature_columns)
+        children, feature, threshold = self._get_batch_tables()
+        source = self._get_source_columns().take(feature)
+        value = np.ascontiguousarray(self.value[:, class_index])
+        contributions = np.zeros((n_rows, n_features), dtype=np.float64)
+
+        for start in range(0, n_rows, TRAVERSAL_CHUNK_ROWS):
+            chunk = np.ascontiguousarray(X[start:start + TRAVERSAL_CHUNK_ROWS])
+            rows = chunk.shape[0]
+            node = np.broadcast_to(self.roots.astype(np.intp), (rows, self.n_trees)).copy()
+            row_offset = (np.arange(rows, dtype=np.intp) * n_columns)[:, None]
+            target_offset = (np.arange(rows, dtype=np.intp) * n_features)[:, None]
+            flat_X = chunk.ravel()
+            totals = np.zeros(rows * n_features, dtype=np.float64)
+            for _ in range(self.max_depth):
+                go_right = flat_X.take(feature.take(node) + row_offset) > threshold.take(node)
+                child = children.take(2 * node + go_right)
+                # برای برگ‌ها child همان node است و تغییری ثبت نمی‌شود
+                totals += np.bincount((source.take(node) + target_offset).ravel(),
+                                      weights=(value.take(child) - value.take(node)).ravel(),
+                                      minlength=rows * n_features)
+                node = child
+            contributions[start:start + rows] = totals.reshape(rows, n_features)
+
+        bias = value.take(self.roots).mean()
+        return bias, contributions / self.n_trees
+
+    def predict_proba(self, columns):
+        """احتمال کلاس‌ها برای داده ستونی"""
+        return self.predict_proba_matrix(self.transform(columns))
+
+    def predict_proba_row(self, values):
+        """احتمال کلاس‌ها برای یک سطر به صورت تاپل (مسیر کم‌تأخیر)"""
+        x = self._row_vector(values)
+        left, right, feature, threshold, roots, leaf_value = self._get_row_tables()
+        total = [0.0] * len(self.classes)
+
+        for node in roots:
+            while left[node] != node:
+                node = left[node] if x[feature[node]] <= threshold[node] else right[node]
+            for i, v in enumerate(leaf_value[node]):
+                total[i] += v
+
+        return np.asarray(total) / len(roots)
+
+
+def check_parity(pipeline, frame, feature_columns=None, tolerance=1e-9):
+    """مقایسه خروجی نسخه کامپایل‌شده با پایپ‌لاین sklearn
+
+    بیشینه اختلاف مطلق احتمالات را برمی‌گرداند و در صورت عبور از آستانه خطا می‌دهد.
+    """
+    compiled = CompiledPipeline.from_pipeline(pipeline, feature_columns)
+    columns = compiled.feature_columns
+    expected = pipeline.predict_proba(frame[columns])
+
+    batch = compiled.predict_proba(frame)
+    rows = np.vstack([compiled.predict_proba_row(tuple(row))
+                      for row in frame[columns].itertuples(index=False)])
+    difference = max(np.abs(batch - expected).max(), np.abs(rows - expected).max())
+
+    if difference > tolerance:
+        raise AssertionError(f"اختلاف خروجی مدل کامپایل‌شده بیش از حد مجاز است: {difference:.3g}")
+    return difference
+
+
+def main():
+    """بررسی برابری و سرعت نسخه کامپایل‌شده با مدل pickle شده"""
+    import pickle
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    model_path = os.path.join(base_dir, 'models', 'falcon9_landing_model.pkl')
+    data_path = os.path.join(base_dir, 'data', 'data_falcon9.csv')
+
+    with open(model_path, 'rb') as f:
+        pipeline = pickle.load(f)
+
+    try:
+        from .features import load_features, split
+    except ImportError:
+        from features import load_features, split
+    # ستون‌های سابقه بوستر هم انتخاب می‌شوند تا مدل‌های آموزش‌دیده با --booster-history هم بررسی شوند
+    df, _ = split(load_features(data_path), payload_fill=np.nan, history=True)
+
+    difference = check_parity(pipeline, df)
+    print(f"بیشینه اختلاف با مدل pickle شده: {difference:.3g}")
+
+    compiled = CompiledPipeline.from_pipeline(pipeline)
+    frame = df[compiled.feature_columns]
+    row = tuple(frame.iloc[0])
+    repeats = 200
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        pipeline.predict_proba(frame.iloc[:1])
+    sklearn_time = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        compiled.predict_proba_row(row)
+    compiled_time = (time.perf_counter() - start) / repeats
+
+    print(f"پیش‌بینی تک‌سطری sklearn: {sklearn_time * 1e6:.0f} میکروثانیه")
+    print(f"پیش‌بینی تک‌سطری کامپایل‌شده: {compiled_time * 1e6:.0f} میکروثانیه")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,122 +3,102 @@
 
 import sys
 import os
-import pickle
-import pandas as pd
+import time
+import argparse
+import threading
+from collections import deque
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                             QLabel, QComboBox, QDoubleSpinBox, QSpinBox, QCheckBox,
-                            QPushButton, QGroupBox, QFormLayout, QProgressBar, QMessageBox)
-from PySide6.QtCore import Qt, QTimer, QObject, Signal
-from PySide6.QtGui import QFont, QIcon, QPixmap
+                            QPushButton, QGroupBox, QFormLayout, QProgressBar, QMessageBox,
+                            QScrollArea, QTableWidget, QTableWidgetItem, QHeaderView,
+                            QAbstractItemView)
+from PySide6.QtCore import Qt, QTimer, QEasingCurve, QObject, Signal, QPointF, QRectF, QTimeLine, QEventLoop
+from PySide6.QtGui import QFont, QIcon, QPixmap, QPainter, QPen, QColor, QPolygonF
 
+try:
+    from .predictor import (ResourceManager, FEATURE_COLUMNS, ORBIT_OPTIONS,
+                            LAUNCH_SITE_OPTIONS, BLOCK_OPTIONS, PAYLOAD_RANGE,
+                            REUSED_COUNT_RANGE, YEAR_RANGE, MONTH_RANGE)
+    from .model_registry import open_model
+    from . import instrumentation
+except ImportError:
+    from predictor import (ResourceManager, FEATURE_COLUMNS, ORBIT_OPTIONS,
+                           LAUNCH_SITE_OPTIONS, BLOCK_OPTIONS, PAYLOAD_RANGE,
+                           REUSED_COUNT_RANGE, YEAR_RANGE, MONTH_RANGE)
+    from model_registry import open_model
+    import instrumentation
 
-class ResourceManager:
-    """مدیریت منابع و یافتن مسیر فایل‌ها"""
-    
-    @staticmethod
-    def get_resource_path(relative_path):
-        """تعیین مسیر صحیح فایل‌های منابع در حالت اجرایی و توسعه"""
-        try:
-            # مسیرهای ممکن برای منابع
-            base_paths = [
-                # PyInstaller ایجاد یک _MEIPASS مسیر موقت می‌کند
-                getattr(sys, '_MEIPASS', None),
-                # مسیر کنار فایل اجرایی
-                os.path.dirname(sys.executable),
-                # مسیر فعلی
-                os.getcwd(),
-                # مسیر پوشه اصلی پروژه
-                os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            ]
-            
-            # حذف مسیرهای خالی یا None
-            base_paths = [p for p in base_paths if p]
-            
-            # بررسی تمام مسیرهای ممکن
-            for base_path in base_paths:
-                full_path = os.path.join(base_path, relative_path)
-                if os.path.exists(full_path):
-                    print(f"فایل پیدا شد: {full_path}")
-                    return full_path
-                    
-            # اگر با مسیر نسبی پیدا نشد، یک بار دیگر با مسیر مطلق بررسی کنیم
-            if os.path.exists(relative_path):
-                print(f"فایل با مسیر مطلق پیدا شد: {relative_path}")
-                return relative_path
-                
-            # اگر هیچ فایلی پیدا نشد، مسیر پیش‌فرض را برگردانیم
-            default_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), relative_path)
-            print(f"فایل پیدا نشد، مسیر پیش‌فرض: {default_path}")
-            return default_path
-            
-        except Exception as e:
-            print(f"خطا در تعیین مسیر منابع: {e}")
-            return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), relative_path)
 
+# تعداد پیش‌بینی‌های اخیر برای محاسبه میانه تأخیر در نوار وضعیت
+LATENCY_WINDOW = 100
+
+# فاصله انتظار پس از آخرین تغییر فرم پیش از محاسبه دوباره (میلی‌ثانیه)
+WHAT_IF_DEBOUNCE_MS = 80
 
-class PredictionModel:
-    """کلاس مدیریت مدل پیش‌بینی"""
+# مدت انیمیشن پر شدن نوار احتمال به ازای هر درصد (میلی‌ثانیه)
+BAR_ANIMATION_MS_PER_PERCENT = 10
+BAR_ANIMATION_FRAME_MS = 16
+
+# بیشینه انتظار برای پایان محاسبه در حال اجرای رشته پیش‌بینی هنگام بستن پنجره (ثانیه)
+WORKER_STOP_TIMEOUT = 5
+
+
+class StartupTimeline:
+    """ثبت زمان مراحل راه‌اندازی (اولین نمایش پنجره و آماده شدن مدل)"""
     
     def __init__(self):
-        self.model = None
-        self.is_loaded = False
-        self._load_model()
+        self.start = time.perf_counter()
+        self.marks = []
     
-    def _load_model(self):
-        """بارگذاری مدل از فایل"""
-        model_path = ResourceManager.get_resource_path(os.path.join('models', 'falcon9_landing_model.pkl'))
-        print(f"تلاش برای بارگذاری مدل از مسیر: {model_path}")
-        
+    def mark(self, name):
+        """ثبت یک مرحله با زمان سپری‌شده از شروع برنامه"""
+        elapsed = (time.perf_counter() - self.start) * 1000
+        self.marks.append((name, elapsed))
+        print(f"[راه‌اندازی] {name}: {elapsed:.0f} میلی‌ثانیه")
+    
+    def summary(self):
+        """خلاصه زمان‌بندی راه‌اندازی"""
+        return ", ".join(f"{name}={elapsed:.0f}ms" for name, elapsed in self.marks)
+
+
+class ModelLoader(QObject):
+    """بارگذاری مدل در یک رشته پس‌زمینه تا پنجره بدون تأخیر نمایش داده شود
+    
+    اگر فهرست نسخه‌های مدل (model_registry) نسخه فعال داشته باشد، مدل با تغییر نسخه فعال
+    بدون راه‌اندازی مجدد جایگزین و سیگنال swapped منتشر می‌شود. هر خطای بارگذاری با
+    سیگنال failed گزارش می‌شود تا پنجره منتظر مدلی نماند که هرگز نمی‌رسد.
+    """
+    
+    loaded = Signal(object)
+    failed = Signal(str)
+    swapped = Signal(str)
+    
+    def start(self, **model_options):
+        """شروع بارگذاری؛ سیگنال loaded در رشته اصلی Qt دریافت می‌شود"""
+        thread = threading.Thread(target=self._run, kwargs=model_options,
+                                  name="model-loader", daemon=True)
+        thread.start()
+    
+    def _run(self, **model_options):
+        # وارد کردن pandas، NumPy و sklearn در همین رشته انجام می‌شود
         try:
-            if os.path.exists(model_path):
-                with open(model_path, 'rb') as f:
-                    self.model = pickle.load(f)
-                self.is_loaded = True
-                print(f"مدل با موفقیت از {model_path} بارگذاری شد.")
-            else:
-                # تلاش برای یافتن فایل مدل در مسیرهای دیگر
-                alternative_paths = [
-                    os.path.join(os.getcwd(), 'models', 'falcon9_landing_model.pkl'),
-                    os.path.join(os.path.dirname(sys.executable), 'models', 'falcon9_landing_model.pkl'),
-                    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models', 'falcon9_landing_model.pkl')
-                ]
-                
-                for alt_path in alternative_paths:
-                    print(f"جستجوی مدل در: {alt_path}")
-                    if os.path.exists(alt_path):
-                        with open(alt_path, 'rb') as f:
-                            self.model = pickle.load(f)
-                        self.is_loaded = True
-                        print(f"مدل با موفقیت از {alt_path} بارگذاری شد.")
-                        break
-                
-                if not self.is_loaded:
-                    print(f"فایل مدل در هیچ مسیری یافت نشد.")
+            model = open_model(on_swap=self.swapped.emit, **model_options)
         except Exception as e:
-            self.is_loaded = False
-            print(f"خطا در بارگذاری مدل: {e}")
-    
-    def predict(self, input_data):
-        """پیش‌بینی با استفاده از مدل"""
-        if not self.is_loaded:
-            raise ValueError("مدل بارگذاری نشده است")
-        
-        prediction = self.model.predict(input_data)
-        probability = self.model.predict_proba(input_data)
-        
-        return {
-            'prediction': prediction[0],
-            'success': prediction[0] == 1,
-            'probability': probability[0][1] * 100  # احتمال موفقیت به درصد
-        }
+            self.failed.emit(f"{type(e).__name__}: {e}")
+            return
+        self.loaded.emit(model)
 
 
 class InputForm(QGroupBox):
     """فرم ورودی پارامترها"""
     
+    # با تغییر هر یک از ورودی‌ها منتشر می‌شود
+    changed = Signal()
+    
     def __init__(self, parent=None):
         super().__init__("مشخصات پرتاب", parent)
         self._init_ui()
+        self._connect_changes()
     
     def _init_ui(self):
         """تنظیم اجزای فرم ورودی"""
@@ -127,7 +107,7 @@ class InputForm(QGroupBox):
         
         # وزن محموله
         self.payload_input = QDoubleSpinBox()
-        self.payload_input.setRange(300, 16000)
+        self.payload_input.setRange(*PAYLOAD_RANGE)
         self.payload_input.setValue(5000)
         self.payload_input.setSuffix(" کیلوگرم")
         self.payload_input.setDecimals(0)
@@ -135,12 +115,12 @@ class InputForm(QGroupBox):
         
         # نوع مدار
         self.orbit_input = QComboBox()
-        self.orbit_input.addItems(["LEO", "GTO", "ISS", "VLEO", "SSO", "MEO", "HEO", "PO"])
+        self.orbit_input.addItems(ORBIT_OPTIONS)
         form_layout.addRow("نوع مدار:", self.orbit_input)
         
         # محل پرتاب
         self.launch_site_input = QComboBox()
-        self.launch_site_input.addItems(["CCAFS SLC 40", "VAFB SLC 4E", "KSC LC 39A", "CCAFS LC 40"])
+        self.launch_site_input.addItems(LAUNCH_SITE_OPTIONS)
         form_layout.addRow("محل پرتاب:", self.launch_site_input)
         
         # GridFins
@@ -160,42 +140,118 @@ class InputForm(QGroupBox):
         
         # نسخه بلوک
         self.block_input = QComboBox()
-        self.block_input.addItems(["1.0", "2.0", "3.0", "4.0", "5.0"])
+        self.block_input.addItems([str(block) for block in BLOCK_OPTIONS])
         self.block_input.setCurrentIndex(4)  # Block 5.0
         form_layout.addRow("نسخه بلوک:", self.block_input)
         
         # تعداد استفاده‌های قبلی
         self.reused_count_input = QSpinBox()
-        self.reused_count_input.setRange(0, 15)
+        self.reused_count_input.setRange(*REUSED_COUNT_RANGE)
         self.reused_count_input.setValue(2)
         form_layout.addRow("تعداد استفاده‌های قبلی:", self.reused_count_input)
         
         # سال پرتاب
         self.year_input = QSpinBox()
-        self.year_input.setRange(2010, 2030)
+        self.year_input.setRange(*YEAR_RANGE)
         self.year_input.setValue(2023)
         form_layout.addRow("سال پرتاب:", self.year_input)
         
         # ماه پرتاب
         self.month_input = QSpinBox()
-        self.month_input.setRange(1, 12)
+        self.month_input.setRange(*MONTH_RANGE)
         self.month_input.setValue(6)
         form_layout.addRow("ماه پرتاب:", self.month_input)
     
+    def _connect_changes(self):
+        """اتصال سیگنال تغییر همه ویجت‌ها به سیگنال changed فرم"""
+        for spin_box in (self.payload_input, self.reused_count_input, self.year_input, self.month_input):
+            spin_box.valueChanged.connect(self.changed)
+        for combo_box in (self.orbit_input, self.launch_site_input, self.block_input):
+            combo_box.currentIndexChanged.connect(self.changed)
+        for check_box in (self.grid_fins_input, self.reused_input, self.legs_input):
+            check_box.toggled.connect(self.changed)
+    
+    def get_input_values(self):
+        """مقادیر ورودی کاربر به صورت تاپل به ترتیب FEATURE_COLUMNS"""
+        return (
+            self.payload_input.value(),
+            self.orbit_input.currentText(),
+            self.launch_site_input.currentText(),
+            1 if self.grid_fins_input.isChecked() else 0,
+            1 if self.reused_input.isChecked() else 0,
+            1 if self.legs_input.isChecked() else 0,
+            float(self.block_input.currentText()),
+            self.reused_count_input.value(),
+            self.year_input.value(),
+            self.month_input.value()
+        )
+    
     def get_input_data(self):
-        """تهیه دیتافریم از ورودی‌های کاربر"""
-        return pd.DataFrame({
-            'PayloadMass': [self.payload_input.value()],
-            'Orbit': [self.orbit_input.currentText()],
-            'LaunchSite': [self.launch_site_input.currentText()],
-            'GridFins': [1 if self.grid_fins_input.isChecked() else 0],
-            'Reused': [1 if self.reused_input.isChecked() else 0],
-            'Legs': [1 if self.legs_input.isChecked() else 0],
-            'Block': [float(self.block_input.currentText())],
-            'ReusedCount': [self.reused_count_input.value()],
-            'Year': [self.year_input.value()],
-            'Month': [self.month_input.value()]
-        })
+        """تهیه دیتافریم از ورودی‌های کاربر با همان انواع داده آموزش"""
+        try:
+            from .features import input_frame
+        except ImportError:
+            from features import input_frame
+        return input_frame([self.get_input_values()])
+
+
+class ContributionChart(QWidget):
+    """نمودار میله‌ای افقی سهم هر ویژگی در احتمال موفقیت (سبز مثبت، قرمز منفی)"""
+    
+    ROW_HEIGHT = 16
+    LABEL_WIDTH = 100
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.baseline = None
+        self.items = []
+        self.setMinimumHeight(self.ROW_HEIGHT * (len(FEATURE_COLUMNS) + 1) + 8)
+    
+    def set_explanation(self, explanation):
+        """نمایش سهم ویژگی‌ها به ترتیب اندازه"""
+        self.baseline = explanation['baseline']
+        self.items = sorted(explanation['contributions'].items(), key=lambda item: -abs(item[1]))
+        # مدل‌های دارای ویژگی‌های سابقه بوستر سطرهای بیشتری دارند
+        self.setMinimumHeight(self.ROW_HEIGHT * (max(len(self.items), len(FEATURE_COLUMNS)) + 1) + 8)
+        self.update()
+    
+    def clear(self):
+        self.baseline = None
+        self.items = []
+        self.update()
+    
+    def paintEvent(self, event):
+        if not self.items:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setLayoutDirection(Qt.LeftToRight)
+        # نام‌های بلندتر (مانند ویژگی‌های سابقه بوستر) ستون برچسب را پهن‌تر می‌کنند
+        label_width = max([self.LABEL_WIDTH] + [painter.fontMetrics().horizontalAdvance(name) + 6
+                                                for name, _ in self.items])
+        width = self.width() - label_width - 60
+        center = label_width + width / 2
+        scale = (width / 2) / max(max(abs(v) for _, v in self.items), 1e-9)
+        
+        painter.setPen(QPen(QColor('#555555')))
+        painter.drawText(QRectF(0, 0, self.width(), self.ROW_HEIGHT), Qt.AlignCenter,
+                         f"سهم ویژگی‌ها (درصد) نسبت به میانگین {self.baseline:.1f} درصد")
+        
+        for i, (name, value) in enumerate(self.items):
+            top = (i + 1) * self.ROW_HEIGHT + 2
+            painter.setPen(QPen(QColor('#555555')))
+            painter.drawText(QRectF(0, top, label_width - 6, self.ROW_HEIGHT),
+                             Qt.AlignRight | Qt.AlignVCenter, name)
+            bar = QRectF(center, top + 2, value * scale, self.ROW_HEIGHT - 4).normalized()
+            painter.fillRect(bar, QColor('#4CAF50') if value >= 0 else QColor('#F44336'))
+            text_x = bar.right() + 4 if value >= 0 else bar.left() - 54
+            painter.drawText(QRectF(text_x, top, 50, self.ROW_HEIGHT),
+                             (Qt.AlignLeft if value >= 0 else Qt.AlignRight) | Qt.AlignVCenter,
+                             f"{value:+.1f}")
+        
+        painter.setPen(QPen(QColor('#999999')))
+        painter.drawLine(QPointF(center, self.ROW_HEIGHT), QPointF(center, self.height()))
+        painter.end()
 
 
 class ResultsDisplay(QGroupBox):
@@ -227,58 +283,308 @@ class ResultsDisplay(QGroupBox):
         probability_layout.addWidget(self.probability_bar)
         
         results_layout.addLayout(probability_layout)
+        
+        # سهم هر ویژگی در این پیش‌بینی
+        self.contribution_chart = ContributionChart()
+        results_layout.addWidget(self.contribution_chart)
+        
+        # یک شیء انیمیشن برای همه نتایج؛ هر نتیجه تازه انیمیشن قبلی را از ابتدا شروع می‌کند
+        self.bar_animation = QTimeLine(1000, self)
+        self.bar_animation.setEasingCurve(QEasingCurve.Linear)
+        self.bar_animation.setUpdateInterval(BAR_ANIMATION_FRAME_MS)
+        self.bar_animation.frameChanged.connect(self.probability_bar.setValue)
     
-    def display_result(self, result):
-        """نمایش نتیجه پیش‌بینی"""
+    def display_result(self, result, animate=True):
+        """نمایش نتیجه پیش‌بینی؛ در به‌روزرسانی زنده بدون انیمیشن"""
         success_text = "موفقیت‌آمیز" if result['success'] else "ناموفق"
         probability = result['probability']
         
-        self._animate_result(probability, success_text)
-    
-    def _animate_result(self, probability, result_text):
-        """نمایش انیمیشن برای نتیجه پیش‌بینی"""
-        self.probability_bar.setValue(0)
+        if 'explanation' in result:
+            self.contribution_chart.set_explanation(result['explanation'])
+        else:
+            self.contribution_chart.clear()
         
-        # تنظیم رنگ نوار بر اساس احتمال
+        if animate:
+            self._animate_result(probability, success_text)
+            return
+        
+        self.bar_animation.stop()
+        self._set_bar_color(probability)
+        self.probability_bar.setValue(int(probability))
+        self.result_label.setText(f"نتیجه پیش‌بینی: فرود <b>{success_text}</b> با احتمال {probability:.1f}%")
+    
+    def _set_bar_color(self, probability):
+        """تنظیم رنگ نوار بر اساس احتمال"""
         if probability > 80:
             self.probability_bar.setStyleSheet("QProgressBar::chunk { background-color: #4CAF50; }")  # سبز
         elif probability > 50:
             self.probability_bar.setStyleSheet("QProgressBar::chunk { background-color: #FFC107; }")  # زرد
         else:
             self.probability_bar.setStyleSheet("QProgressBar::chunk { background-color: #F44336; }")  # قرمز
+    
+    def _animate_result(self, probability, result_text):
+        """نمایش انیمیشن برای نتیجه پیش‌بینی"""
+        self.probability_bar.setValue(0)
+        
+        # تنظیم رنگ نوار بر اساس احتمال
+        self._set_bar_color(probability)
         
         # انیمیشن پر شدن نوار پیشرفت
         self.result_label.setText(f"نتیجه پیش‌بینی: فرود <b>{result_text}</b> با احتمال {probability:.1f}%")
         
         # افزایش تدریجی درصد احتمال در نوار پیشرفت
-        def update_bar(value):
-            if value <= probability:
-                self.probability_bar.setValue(value)
-                QTimer.singleShot(10, lambda: update_bar(value + 1))
+        self.bar_animation.stop()
+        self.bar_animation.setFrameRange(0, int(probability))
+        self.bar_animation.setDuration(max(1, int(probability) * BAR_ANIMATION_MS_PER_PERCENT))
+        self.bar_animation.start()
+
+
+class SensitivityChart(QWidget):
+    """نمودار احتمال موفقیت بر حسب یک ورودی، رسم‌شده مستقیم با QPainter"""
+    
+    MARGIN = 28
+    
+    def __init__(self, title, parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.xs = []
+        self.ys = []
+        self.current_x = None
+        self.setMinimumSize(220, 150)
+    
+    def set_curve(self, xs, ys, current_x):
+        """تنظیم داده منحنی و مقدار فعلی ورودی؛ رسم در چرخه بعدی رویدادها انجام می‌شود"""
+        self.xs = [float(x) for x in xs]
+        self.ys = [float(y) for y in ys]
+        self.current_x = float(current_x)
+        self.update()
+    
+    def _to_point(self, plot, x, y):
+        x_span = (self.xs[-1] - self.xs[0]) or 1.0
+        return QPointF(plot.left() + (x - self.xs[0]) / x_span * plot.width(),
+                       plot.bottom() - y / 100 * plot.height())
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        plot = QRectF(self.rect()).adjusted(self.MARGIN, 20, -10, -self.MARGIN)
+        
+        painter.setPen(QPen(QColor('#555555')))
+        painter.drawText(QRectF(0, 0, self.width(), 18), Qt.AlignCenter, self.title)
+        
+        # خطوط راهنما در ۰، ۵۰ و ۱۰۰ درصد
+        painter.setPen(QPen(QColor('#DDDDDD'), 1, Qt.DashLine))
+        for level in (0, 50, 100):
+            y = plot.bottom() - level / 100 * plot.height()
+            painter.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+            painter.drawText(QRectF(0, y - 8, self.MARGIN - 4, 16), Qt.AlignRight | Qt.AlignVCenter,
+                             f"{level}")
+        
+        if len(self.xs) < 2:
+            painter.end()
+            return
         
-        update_bar(0)
+        painter.setPen(QPen(QColor('#555555')))
+        for x, alignment in ((self.xs[0], Qt.AlignLeft), (self.xs[-1], Qt.AlignRight)):
+            painter.drawText(QRectF(plot.left(), plot.bottom() + 4, plot.width(), 16),
+                             alignment, f"{x:g}")
+        
+        painter.setPen(QPen(QColor('#2196F3'), 2))
+        painter.drawPolyline(QPolygonF([self._to_point(plot, x, y) for x, y in zip(self.xs, self.ys)]))
+        
+        # نشانگر مقدار فعلی ورودی روی منحنی
+        if self.current_x is not None and self.xs[0] <= self.current_x <= self.xs[-1]:
+            i = min(range(len(self.xs)), key=lambda k: abs(self.xs[k] - self.current_x))
+            marker = self._to_point(plot, self.xs[i], self.ys[i])
+            painter.setPen(QPen(QColor('#F44336'), 1, Qt.DashLine))
+            painter.drawLine(QPointF(marker.x(), plot.top()), QPointF(marker.x(), plot.bottom()))
+            painter.setBrush(QColor('#F44336'))
+            painter.drawEllipse(marker, 4, 4)
+        painter.end()
+
+
+class SimilarLaunchesTable(QGroupBox):
+    """جدول نزدیک‌ترین پرتاب‌های تاریخی به ورودی فعلی با نتیجه فرود هر کدام"""
+    
+    HEADERS = ["پرواز", "تاریخ", "بوستر", "مدار", "سکوی پرتاب", "وزن محموله (kg)", "نتیجه فرود", "فاصله"]
+    
+    def __init__(self, parent=None):
+        super().__init__("پرتاب‌های تاریخی مشابه", parent)
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table.setMinimumHeight(180)
+        layout.addWidget(self.table)
+        self.summary_label = QLabel("")
+        self.summary_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.summary_label)
+    
+    def set_launches(self, launches):
+        """نمایش فهرست پرتاب‌ها (خروجی PredictionModel.find_similar)"""
+        self.table.setRowCount(len(launches))
+        for row, launch in enumerate(launches):
+            payload = launch['PayloadMass']
+            cells = (str(launch['FlightNumber']), launch['Date'], launch['Serial'], launch['Orbit'],
+                     launch['LaunchSite'], "-" if payload != payload else f"{payload:,.0f}",
+                     launch['Outcome'], f"{launch['distance']:.2f}")
+            color = QColor('#4CAF50') if launch['Success'] else QColor('#F44336')
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignCenter)
+                if column == self.HEADERS.index("نتیجه فرود"):
+                    item.setForeground(color)
+                self.table.setItem(row, column, item)
+        successes = sum(1 for launch in launches if launch['Success'])
+        self.summary_label.setText(f"{successes} از {len(launches)} پرتاب مشابه فرود موفق داشته‌اند" if launches else "")
+    
+    def clear(self):
+        self.table.setRowCount(0)
+        self.summary_label.setText("")
+
+
+# علامت توقف رشته پیش‌بینی که به جای درخواست در انتظار قرار می‌گیرد
+_STOP = object()
+
+
+class PredictionWorker(QObject):
+    """اجرای پیش‌بینی‌ها در یک رشته پس‌زمینه با شمارنده نسل
+    
+    هر درخواست یا لغو، نسل را یک واحد افزایش می‌دهد. فقط آخرین درخواست نگه داشته
+    می‌شود؛ درخواستی که پیش از شروع محاسبه کهنه شود هرگز اجرا نمی‌شود و نتیجه‌ای که
+    پس از پایان محاسبه کهنه باشد با is_current کنار گذاشته می‌شود.
+    """
+    
+    # نسل، برچسب درخواست، ورودی‌ها، نتیجه، زمان محاسبه (ثانیه)
+    finished = Signal(int, str, object, object, float)
+    failed = Signal(int, str, str)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.generation = 0
+        self._pending = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="prediction-worker", daemon=True)
+        self._thread.start()
+    
+    def request(self, tag, job, values):
+        """ثبت درخواست تازه (job(values)) به جای درخواست در انتظار؛ خروجی نسل درخواست"""
+        with self._condition:
+            self.generation += 1
+            if self._pending is not _STOP:
+                self._pending = (self.generation, tag, job, values)
+                self._condition.notify()
+            return self.generation
+    
+    def cancel(self):
+        """کهنه کردن درخواست در انتظار و نتیجه در حال محاسبه"""
+        with self._condition:
+            self.generation += 1
+            if self._pending is not _STOP:
+                self._pending = None
+    
+    def is_current(self, generation):
+        return generation == self.generation
+    
+    def stop(self, timeout=WORKER_STOP_TIMEOUT):
+        """کنار گذاشتن درخواست در انتظار، ارسال علامت توقف و انتظار برای پایان رشته"""
+        with self._condition:
+            self.generation += 1
+            self._pending = _STOP
+            self._condition.notify()
+        self._thread.join(timeout)
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None:
+                    self._condition.wait()
+                if self._pending is _STOP:
+                    return
+                generation, tag, job, values = self._pending
+                self._pending = None
+            try:
+                start = time.perf_counter()
+                with instrumentation.timer(f'worker_{tag}'):
+                    result = job(values)
+                self.finished.emit(generation, tag, values, result, time.perf_counter() - start)
+            except Exception as e:
+                self.failed.emit(generation, tag, str(e))
 
 
 class Falcon9PredictorApp(QMainWindow):
     """اپلیکیشن اصلی پیش‌بینی فرود فالکون ۹"""
     
-    def __init__(self):
+    PREDICT_TEXT = "پیش‌بینی موفقیت فرود"
+    LOADING_TEXT = "در حال بارگذاری مدل..."
+    
+    def __init__(self, timeline=None):
         super().__init__()
+        self.timeline = timeline or StartupTimeline()
         
-        # اجزای اصلی برنامه
-        self.model = PredictionModel()
+        # اجزای اصلی برنامه؛ مدل در پس‌زمینه بارگذاری می‌شود
+        self.model = None
+        self.model_error = None
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
         self._init_ui()
+        self.timeline.mark("ساخت پنجره")
+        
+        # محاسبه زنده «چه می‌شود اگر» پس از مکث کوتاه در تغییر ورودی‌ها
+        self.what_if_timer = QTimer(self)
+        self.what_if_timer.setSingleShot(True)
+        self.what_if_timer.setInterval(WHAT_IF_DEBOUNCE_MS)
+        self.what_if_timer.timeout.connect(self._request_what_if)
+        self.prediction_worker = PredictionWorker(self)
+        self.prediction_worker.finished.connect(self._on_prediction_finished)
+        self.prediction_worker.failed.connect(self._on_prediction_failed)
+        self.input_form.changed.connect(self._on_input_changed)
+        
+        self.model_loader = ModelLoader(self)
+        self.model_loader.loaded.connect(self._on_model_loaded)
+        self.model_loader.failed.connect(self._on_model_failed)
+        self.model_loader.swapped.connect(self._on_model_swapped)
+        self.model_loader.start(compiled=True, cache_size=1024, prefer_artifact=True, explain=True,
+                                similar=True)
+    
+    def _on_model_loaded(self, model):
+        """دریافت مدل بارگذاری‌شده از رشته پس‌زمینه"""
+        self.model = model
+        self.timeline.mark("آماده شدن مدل")
+        print(f"زمان‌بندی راه‌اندازی: {self.timeline.summary()}")
         
         # بررسی وضعیت بارگذاری مدل
         if not self.model.is_loaded:
+            self.predict_button.setText(self.PREDICT_TEXT)
             QMessageBox.warning(self, "خطا در بارگذاری مدل", 
                              "مدل با موفقیت بارگذاری نشد. لطفاً مطمئن شوید که فایل مدل در مسیر صحیح وجود دارد.")
+            return
+        
+        self.predict_button.setText(self.PREDICT_TEXT)
+        self.predict_button.setEnabled(True)
+        self._request_what_if()
+    
+    def _on_model_failed(self, message):
+        """بارگذاری مدل در رشته پس‌زمینه با خطا متوقف شد"""
+        self.model_error = message
+        self.timeline.mark("خطا در بارگذاری مدل")
+        self.predict_button.setText(self.PREDICT_TEXT)
+        self.statusBar().showMessage(f"خطا در بارگذاری مدل: {message}")
+        QMessageBox.critical(self, "خطا در بارگذاری مدل", f"بارگذاری مدل ممکن نشد:\n{message}")
+    
+    def _on_model_swapped(self, version):
+        """نسخه تازه مدل فعال شد؛ نتیجه فعلی با مدل تازه دوباره محاسبه می‌شود"""
+        self.statusBar().showMessage(f"نسخه مدل {version} فعال شد", 5000)
+        self._request_what_if()
     
     def _init_ui(self):
         """راه‌اندازی و پیکربندی رابط کاربری"""
         # تنظیمات پنجره اصلی
         self.setWindowTitle("پیش‌بینی فرود فالکون ۹")
         self.setMinimumSize(800, 600)
+        self.resize(900, 960)
         
         # تنظیم آیکون برنامه (اگر فایل موجود باشد)
         icon_path = ResourceManager.get_resource_path(os.path.join('assets', 'icon.png'))
@@ -289,7 +595,11 @@ class Falcon9PredictorApp(QMainWindow):
         central_widget = QWidget()
         main_layout = QVBoxLayout(central_widget)
         main_layout.setAlignment(Qt.AlignTop)
-        self.setCentralWidget(central_widget)
+        # در پنجره‌های کوچک محتوا به جای فشرده شدن قابل پیمایش است
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(central_widget)
+        self.setCentralWidget(scroll_area)
         
         # عنوان برنامه
         title_label = QLabel("سیستم پیش‌بینی موفقیت فرود فالکون ۹")
@@ -308,40 +618,202 @@ class Falcon9PredictorApp(QMainWindow):
         main_layout.addWidget(self.input_form)
         
         # دکمه پیش‌بینی
-        self.predict_button = QPushButton("پیش‌بینی موفقیت فرود")
+        self.predict_button = QPushButton(self.LOADING_TEXT)
+        self.predict_button.setEnabled(False)
         self.predict_button.setMinimumHeight(40)
         self.predict_button.clicked.connect(self.predict_landing)
         main_layout.addWidget(self.predict_button)
         
+        # به‌روزرسانی خودکار با تغییر ورودی‌ها
+        self.live_update_input = QCheckBox("به‌روزرسانی خودکار با تغییر ورودی‌ها")
+        self.live_update_input.setChecked(True)
+        self.live_update_input.toggled.connect(self._on_input_changed)
+        main_layout.addWidget(self.live_update_input)
+        
         # نمایش نتایج
         self.results_display = ResultsDisplay()
         main_layout.addWidget(self.results_display)
+        
+        # منحنی‌های حساسیت
+        sensitivity_group = QGroupBox("تحلیل حساسیت")
+        sensitivity_layout = QHBoxLayout(sensitivity_group)
+        self.payload_chart = SensitivityChart("احتمال موفقیت (%) بر حسب وزن محموله (کیلوگرم)")
+        self.reused_count_chart = SensitivityChart("احتمال موفقیت (%) بر حسب تعداد استفاده‌های قبلی")
+        sensitivity_layout.addWidget(self.payload_chart)
+        sensitivity_layout.addWidget(self.reused_count_chart)
+        main_layout.addWidget(sensitivity_group)
+        
+        # پرتاب‌های تاریخی مشابه
+        self.similar_launches = SimilarLaunchesTable()
+        main_layout.addWidget(self.similar_launches)
+        
+        # نمایش زنده تأخیر پیش‌بینی در نوار وضعیت
+        self.latency_label = QLabel("")
+        self.statusBar().addPermanentWidget(self.latency_label)
+    
+    def _show_latency(self, predict_seconds, total_seconds):
+        """به‌روزرسانی نوار وضعیت با تأخیر آخرین پیش‌بینی و میانه پیش‌بینی‌های اخیر"""
+        self.latencies.append(total_seconds)
+        ordered = sorted(self.latencies)
+        median = ordered[len(ordered) // 2]
+        self.latency_label.setText(
+            f"پیش‌بینی: {predict_seconds * 1000:.2f} ms | با نمایش: {total_seconds * 1000:.2f} ms | "
+            f"میانه {len(ordered)} مورد اخیر: {median * 1000:.2f} ms")
+    
+    def _on_input_changed(self):
+        """نتیجه ورودی‌های قبلی کهنه می‌شود؛ محاسبه دوباره فقط پس از توقف تغییرات انجام می‌شود"""
+        self.prediction_worker.cancel()
+        if self.live_update_input.isChecked():
+            self.what_if_timer.start()
+    
+    def _request_what_if(self):
+        if self.model is None or not self.model.is_loaded or not self.live_update_input.isChecked():
+            return
+        self.prediction_worker.request('what_if', self.model.predict_sensitivity,
+                                       self.input_form.get_input_values())
+    
+    def _on_prediction_finished(self, generation, tag, values, result, seconds):
+        """نمایش نتیجه رشته پس‌زمینه؛ نتایج نسل‌های قدیمی کنار گذاشته می‌شوند"""
+        if not self.prediction_worker.is_current(generation):
+            instrumentation.count('stale_predictions')
+            return
+        start = time.perf_counter()
+        with instrumentation.timer('ui_render'):
+            if tag == 'what_if':
+                self.results_display.display_result(result, animate=False)
+                self.payload_chart.set_curve(*result['payload'],
+                                             values[FEATURE_COLUMNS.index('PayloadMass')])
+                self.reused_count_chart.set_curve(*result['reused_count'],
+                                                  values[FEATURE_COLUMNS.index('ReusedCount')])
+            else:
+                self.results_display.display_result(result)
+            if 'similar' in result:
+                self.similar_launches.set_launches(result['similar'])
+            else:
+                self.similar_launches.clear()
+        total_seconds = seconds + time.perf_counter() - start
+        instrumentation.observe('ui_predict', total_seconds)
+        self._show_latency(seconds, total_seconds)
+    
+    def _on_prediction_failed(self, generation, tag, message):
+        if not self.prediction_worker.is_current(generation):
+            return
+        if tag == 'what_if':
+            self.statusBar().showMessage(f"خطا در محاسبه حساسیت: {message}", 5000)
+        else:
+            QMessageBox.critical(self, "خطا در پیش‌بینی", f"خطایی رخ داد: {message}")
     
     def predict_landing(self):
-        """پیش‌بینی موفقیت فرود بر اساس ورودی‌های کاربر"""
-        if not self.model.is_loaded:
+        """ارسال درخواست پیش‌بینی به رشته پس‌زمینه؛ کلیک‌های پشت سر هم فقط آخرین نتیجه را نمایش می‌دهند"""
+        if self.model is None or not self.model.is_loaded:
             QMessageBox.warning(self, "خطا", "مدل بارگذاری نشده است")
             return
         
-        try:
-            # دریافت داده‌های ورودی
-            input_data = self.input_form.get_input_data()
-            
-            # پیش‌بینی با استفاده از مدل
-            result = self.model.predict(input_data)
-            
-            # نمایش نتایج
-            self.results_display.display_result(result)
-            
-        except Exception as e:
-            QMessageBox.critical(self, "خطا در پیش‌بینی", f"خطایی رخ داد: {str(e)}")
+        # پیش‌بینی با استفاده از مدل (مسیر کامپایل‌شده تک‌سطری)
+        self.prediction_worker.request('predict', self.model.predict_row,
+                                       self.input_form.get_input_values())
+    
+    def closeEvent(self, event):
+        # رشته پیش‌بینی پیش از خروج مفسر متوقف می‌شود تا وسط predict_row رها نشود
+        self.what_if_timer.stop()
+        self.prediction_worker.stop()
+        super().closeEvent(event)
+
+
+def run_stress_test(window, clicks=1000, settle_ms=2000):
+    """کلیک پیاپی روی دکمه پیش‌بینی و بررسی محدود ماندن تایمرها، اشیای Qt و حافظه
+    
+    کلیک‌ها از داخل حلقه رویداد Qt (مانند کلیک واقعی کاربر) فرستاده می‌شوند. خروجی
+    دیکشنری شاخص‌ها است؛ کلید passed نشان می‌دهد که همه شرط‌ها برقرار بوده‌اند.
+    """
+    import gc
+    import tracemalloc
+    
+    def run_loop(ms, until=None):
+        loop = QEventLoop()
+        QTimer.singleShot(ms, loop.quit)
+        if until is not None:
+            poll = QTimer()
+            poll.timeout.connect(lambda: until() and loop.quit())
+            poll.start(10)
+        loop.exec()
+    
+    run_loop(60000, until=lambda: window.model is not None or window.model_error is not None)
+    if window.model is None or not window.model.is_loaded:
+        return {'passed': False, 'error': window.model_error or "مدل بارگذاری نشد"}
+    
+    # یک دور گرم‌کردن تا حافظه‌های یک‌باره (cache و ...) در اندازه‌گیری حساب نشوند
+    window.predict_button.click()
+    run_loop(settle_ms)
+    gc.collect()
+    objects_before = len(window.findChildren(QObject))
+    timers_before = len(window.findChildren(QTimer))
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    
+    remaining = [clicks]
+    gaps = [0.0, time.perf_counter()]
+    
+    def click():
+        now = time.perf_counter()
+        gaps[0] = max(gaps[0], now - gaps[1])
+        gaps[1] = now
+        window.predict_button.click()
+        remaining[0] -= 1
+        if remaining[0] <= 0:
+            clicker.stop()
+    
+    clicker = QTimer()
+    clicker.timeout.connect(click)
+    start = time.perf_counter()
+    clicker.start(0)
+    run_loop(600000, until=lambda: remaining[0] <= 0)
+    click_seconds = time.perf_counter() - start
+    run_loop(settle_ms)
+    gc.collect()
+    
+    memory_after, memory_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    objects_after = len(window.findChildren(QObject))
+    report = {
+        'clicks': clicks,
+        'click_seconds': click_seconds,
+        'max_event_gap_ms': gaps[0] * 1000,
+        'qobjects_before': objects_before,
+        'qobjects_after': objects_after,
+        'timers_before': timers_before,
+        'timers': len(window.findChildren(QTimer)),
+        'animations': len(window.findChildren(QTimeLine)),
+        'memory_growth_kb': (memory_after - memory_before) / 1024,
+        'memory_peak_kb': (memory_peak - memory_before) / 1024,
+        'bar_value': window.results_display.probability_bar.value(),
+        'worker_generation': window.prediction_worker.generation,
+    }
+    report['passed'] = (objects_after == objects_before and report['timers'] <= timers_before
+                        and report['animations'] == 1 and report['memory_growth_kb'] < 1024)
+    return report
 
 
 def main():
     """تابع اصلی برنامه"""
-    app = QApplication(sys.argv)
-    window = Falcon9PredictorApp()
+    parser = argparse.ArgumentParser(description="پیش‌بینی فرود فالکون ۹")
+    parser.add_argument('--stress', type=int, metavar='CLICKS', default=None,
+                        help="اجرای آزمون فشار با تعداد کلیک داده‌شده و خروج")
+    args, qt_args = parser.parse_known_args()
+    
+    timeline = StartupTimeline()
+    instrumentation.configure_from_env()
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = Falcon9PredictorApp(timeline)
     window.show()
+    
+    if args.stress is not None:
+        report = run_stress_test(window, args.stress)
+        for key, value in report.items():
+            print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+        sys.exit(0 if report['passed'] else 1)
+    # اجرا پس از پردازش رویدادهای نمایش، یعنی پس از اولین رسم پنجره
+    QTimer.singleShot(0, lambda: timeline.mark("اولین نمایش پنجره"))
     sys.exit(app.exec())
 
 
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ساخت ویژگی‌های مدل از فایل داده با تبدیل‌های برداری، انواع داده فشرده و cache روی دیسک
+
+همه مسیرهای آموزش (save_model، backtest، نوتبوک تحلیل) و فرم برنامه ویژگی‌ها را از این
+ماژول می‌گیرند تا تعریف آن‌ها فقط یک جا باشد. ستون‌های متنی به صورت category، شمارنده‌ها
+int8/int16 و مقادیر اعشاری float32 نگه داشته می‌شوند.
+
+نتیجه آماده‌سازی هر فایل داده در پوشه cache کاربر ذخیره می‌شود؛ کلید آن هش محتوای فایل
+CSV، نسخه تبدیل‌ها (TRANSFORM_VERSION) و نسخه pandas است، بنابراین در اجراهای بعدی
+ویژگی‌ها بدون خواندن دوباره CSV در چند میلی‌ثانیه بارگذاری می‌شوند و با هر تغییر داده
+یا تبدیل‌ها خودبه‌خود دوباره ساخته می‌شوند.
+
+ستون‌های سابقه بوستر (HISTORY_FEATURES) هم در همین مرحله با booster_history.py و بدون نشت
+اطلاعات از پرتاب‌های بعدی ساخته می‌شوند؛ split فقط با history=True آن‌ها را به ویژگی‌ها می‌افزاید.
+
+نمونه اجرا:
+    python -m src features                # ساخت یا بارگذاری ویژگی‌ها و گزارش زمان
+    python -m src features --clear        # حذف cache ویژگی‌ها
+"""
+
+import os
+import sys
+import glob
+import time
+import pickle
+import hashlib
+import argparse
+import pandas as pd
+
+try:
+    from .predictor import FEATURE_COLUMNS, HISTORY_FEATURES
+    from .resources import default_cache_dir, file_sha256
+    from .booster_history import BoosterHistory
+except ImportError:
+    from predictor import FEATURE_COLUMNS, HISTORY_FEATURES
+    from resources import default_cache_dir, file_sha256
+    from booster_history import BoosterHistory
+
+
+# با هر تغییر در derive این عدد افزایش می‌یابد تا cache قبلی نامعتبر شود
+TRANSFORM_VERSION = 2
+CACHE_SUBDIR = 'features'
+MAX_CACHE_ENTRIES = 8
+
+FEATURES = FEATURE_COLUMNS
+NUMERICAL_FEATURES = ['PayloadMass', 'Block', 'ReusedCount', 'Year', 'Month']
+CATEGORICAL_FEATURES = ['Orbit', 'LaunchSite']
+BOOLEAN_FEATURES = ['GridFins', 'Reused', 'Legs']
+TARGET = 'Success'
+
+# انواع داده فشرده ستون‌های شناخته‌شده؛ سایر ستون‌ها همان‌طور که خوانده شده‌اند می‌مانند
+COLUMN_DTYPES = {
+    'FlightNumber': 'int16',
+    'PayloadMass': 'float32',
+    'Orbit': 'category',
+    'LaunchSite': 'category',
+    'BoosterVersion': 'category',
+    'Outcome': 'category',
+    'LandingPad': 'category',
+    'Serial': 'category',
+    'Flights': 'int16',
+    'GridFins': 'int8',
+    'Reused': 'int8',
+    'Legs': 'int8',
+    'Block': 'float32',
+    'ReusedCount': 'int16',
+    'Year': 'int16',
+    'Month': 'int8',
+    TARGET: 'int8',
+    **{col: 'float32' for col in HISTORY_FEATURES},
+}
+# ستون‌های عددی ورودی مدل float64 هستند تا مقیاس‌بندی پایپ‌لاین sklearn با همان دقت مسیر
+# پیش‌بینی (CompiledPipeline) انجام شود؛ با float32 نتیجه در مرز آستانه‌های درخت‌ها فرق می‌کند
+MODEL_DTYPES = {col: 'float64' if col in NUMERICAL_FEATURES else COLUMN_DTYPES[col] for col in FEATURES}
+MODEL_DTYPES.update({col: 'float64' for col in HISTORY_FEATURES})
+
+
+def derive(df):
+    """افزودن ستون هدف و ویژگی‌های تاریخ و فشرده‌سازی انواع داده؛ ورودی تغییر نمی‌کند
+
+    وزن محموله گمشده در این مرحله پر نمی‌شود (split را ببینید).
+    """
+    outcome = df['Outcome'].astype('string')
+    date = pd.to_datetime(df['Date'], format='ISO8601')
+    frame = df.assign(**{
+        TARGET: outcome.str.startswith('True', na=False),
+        'Date': date,
+        'Year': date.dt.year,
+        'Month': date.dt.month,
+    })
+    return frame.astype({col: dtype for col, dtype in COLUMN_DTYPES.items() if col in frame.columns})
+
+
+def add_history(frame, history=None):
+    """افزودن ستون‌های HISTORY_FEATURES (مقادیر پیش از هر پرتاب) به دیتافریم آماده‌شده
+
+    با history موجود، سطرها به همان فهرست اضافه می‌شوند (به‌روزرسانی افزایشی)؛ خروجی
+    (دیتافریم، فهرست سابقه).
+    """
+    history = history if history is not None else BoosterHistory()
+    values = history.extend(frame).astype('float32')
+    return frame.assign(**{col: values[:, i] for i, col in enumerate(HISTORY_FEATURES)}), history
+
+
+def split(frame, payload_fill=None, history=False):
+    """ویژگی‌ها (با انواع داده MODEL_DTYPES) و ستون هدف؛ خروجی (X، y)
+
+    payload_fill مقدار جایگزین وزن محموله گمشده است؛ اگر داده نشود میانه همین سطرها است
+    و با np.nan مقادیر گمشده دست‌نخورده می‌مانند. با history ستون‌های سابقه بوستر هم
+    جزو ویژگی‌ها هستند.
+    """
+    columns = FEATURES + HISTORY_FEATURES if history else FEATURES
+    X = frame[columns].astype({col: MODEL_DTYPES[col] for col in columns})
+    if payload_fill is None:
+        payload_fill = X['PayloadMass'].median()
+    if X['PayloadMass'].hasnans and not pd.isna(payload_fill):
+        X = X.assign(PayloadMass=X['PayloadMass'].fillna(payload_fill))
+    return X, frame[TARGET]
+
+
+def prepare_frame(df, payload_fill=None, history=None):
+    """استخراج ستون هدف و ویژگی‌ها از سطرهای خام فایل داده؛ خروجی (X، y)
+
+    با history (یک BoosterHistory) سطرها به فهرست اضافه و ستون‌های سابقه هم برگردانده می‌شوند.
+    """
+    frame = derive(df)
+    if history is not None:
+        frame, _ = add_history(frame, history)
+    return split(frame, payload_fill, history is not None)
+
+
+def input_frame(rows):
+    """دیتافریم ورودی مدل از تاپل‌هایی به ترتیب FEATURES با همان انواع داده آموزش"""
+    return pd.DataFrame(list(rows), columns=FEATURES).astype(MODEL_DTYPES)
+
+
+def cache_key(data_path):
+    """کلید cache: هش محتوای فایل داده، نسخه تبدیل‌ها و نسخه pandas"""
+    digest = hashlib.sha256(file_sha256(data_path).encode('ascii'))
+    digest.update(f"{TRANSFORM_VERSION}:{pd.__version__}".encode('ascii'))
+    return digest.hexdigest()
+
+
+def cache_path(data_path, cache_dir=None):
+    directory = os.path.join(cache_dir or default_cache_dir(), CACHE_SUBDIR)
+    return os.path.join(directory, f"{cache_key(data_path)}.pkl")
+
+
+def _prune_cache(directory, keep=MAX_CACHE_ENTRIES):
+    """حذف قدیمی‌ترین فایل‌های cache تا حداکثر keep فایل باقی بماند"""
+    entries = sorted(glob.glob(os.path.join(directory, '*.pkl')), key=os.path.getmtime, reverse=True)
+    for path in entries[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def load_features(data_path, cache_dir=None, use_cache=True):
+    """دیتافریم آماده‌شده فایل داده (همه ستون‌ها به همراه Success، Year و Month)
+
+    در صورت وجود، نتیجه از cache خوانده می‌شود؛ در غیر این صورت CSV خوانده و پس از
+    آماده‌سازی به صورت اتمی در cache نوشته می‌شود.
+    """
+    if not use_cache:
+        return add_history(derive(pd.read_csv(data_path)))[0]
+
+    path = cache_path(data_path, cache_dir)
+    try:
+        with open(path, 'rb') as f:
+            frame = pickle.load(f)
+        os.utime(path)
+        return frame
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        pass
+
+    frame = add_history(derive(pd.read_csv(data_path)))[0]
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        _prune_cache(os.path.dirname(path))
+    except OSError as e:
+        print(f"ذخیره cache ویژگی‌ها ممکن نشد: {e}")
+    return frame
+
+
+def load_training_data(data_path, use_cache=True, history=False):
+    """بارگذاری و آماده‌سازی داده‌های آموزش؛ خروجی (X، y)"""
+    return split(load_features(data_path, use_cache=use_cache), history=history)
+
+
+def clear_cache(cache_dir=None):
+    """حذف همه فایل‌های cache ویژگی‌ها؛ خروجی تعداد فایل‌های حذف‌شده"""
+    paths = glob.glob(os.path.join(cache_dir or default_cache_dir(), CACHE_SUBDIR, '*.pkl'))
+    for path in paths:
+        os.remove(path)
+    return len(paths)
+
+
+def main(argv=None):
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="آماده‌سازی ویژگی‌ها با cache روی دیسک")
+    parser.add_argument('--data', default=os.path.join(base_dir, 'data', 'data_falcon9.csv'),
+                        help="مسیر فایل داده")
+    parser.add_argument('--cache-dir', default=None, help="پوشه cache (پیش‌فرض پوشه cache کاربر)")
+    parser.add_argument('--clear', action='store_true', help="حذف cache ویژگی‌ها")
+    args = parser.parse_args(argv)
+
+    if args.clear:
+        print(f"{clear_cache(args.cache_dir)} فایل cache حذف شد.")
+        return 0
+
+    start = time.perf_counter()
+    raw = pd.read_csv(args.data)
+    derive(raw)
+    parse_seconds = time.perf_counter() - start
+
+    cached = os.path.exists(cache_path(args.data, args.cache_dir))
+    start = time.perf_counter()
+    frame = load_features(args.data, args.cache_dir)
+    load_seconds = time.perf_counter() - start
+
+    print(f"{len(frame)} سطر، {frame.shape[1]} ستون؛ حافظه {frame.memory_usage(deep=True).sum() / 1024:.1f} KB "
+          f"(CSV خام: {raw.memory_usage(deep=True).sum() / 1024:.1f} KB)")
+    print(f"خواندن CSV و آماده‌سازی: {parse_seconds * 1000:.2f} میلی‌ثانیه")
+    print(f"load_features ({'از cache' if cached else 'ساخت cache'}): {load_seconds * 1000:.2f} میلی‌ثانیه")
+    print(f"مسیر cache: {cache_path(args.data, args.cache_dir)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+لایه ابزارگذاری کم‌هزینه: زمان‌سنج‌ها، شمارنده‌ها، خروجی دوره‌ای و پروفایلر نمونه‌بردار
+
+در حالت غیرفعال (پیش‌فرض) timer یک شیء ثابت بدون عملیات برمی‌گرداند و count بلافاصله
+بازمی‌گردد، بنابراین هزینه آن روی مسیرهای داغ در حد یک فراخوانی تابع است.
+
+پیکربندی از طریق متغیرهای محیطی (configure_from_env):
+    FALCON9_METRICS_FILE      مسیر فایل خروجی (.json یا قالب متنی Prometheus برای سایر پسوندها)
+    FALCON9_METRICS_INTERVAL  فاصله نوشتن فایل به ثانیه (پیش‌فرض 10)
+    FALCON9_PROFILE_FILE      مسیر فایل پشته‌های فشرده (قابل استفاده با flamegraph.pl)
+    FALCON9_PROFILE_SLOW_MS   آستانه پیش‌بینی کند برای ذخیره پشته‌ها (پیش‌فرض 50)
+    FALCON9_VERBOSE           چاپ پیام‌های جزئی مسیرها و بارگذاری
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+from collections import Counter, defaultdict
+
+
+# مرز سطل‌های هیستوگرام زمان (ثانیه)
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+DEFAULT_EXPORT_INTERVAL = 10.0
+DEFAULT_SLOW_MS = 50.0
+DEFAULT_SAMPLE_INTERVAL = 0.002
+METRIC_PREFIX = 'falcon9_'
+
+_enabled = False
+_verbose = bool(os.environ.get('FALCON9_VERBOSE'))
+_profiler = None
+_exporter = None
+
+
+class _Histogram:
+    __slots__ = ('count', 'total', 'maximum', 'last', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.last = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+
+class MetricsRegistry:
+    """نگهداری شمارنده‌ها و هیستوگرام‌های زمان با دسترسی ایمن بین رشته‌ها"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = Counter()
+        self.timers = defaultdict(_Histogram)
+
+    def observe(self, name, seconds):
+        with self._lock:
+            self.timers[name].observe(seconds)
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def last(self, name):
+        with self._lock:
+            histogram = self.timers.get(name)
+            return histogram.last if histogram is not None else None
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.timers.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': dict(self.counters),
+                'timers': {name: {'count': h.count,
+                                  'sum_seconds': h.total,
+                                  'mean_seconds': h.total / h.count if h.count else 0.0,
+                                  'max_seconds': h.maximum,
+                                  'last_seconds': h.last,
+                                  'buckets': dict(zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'],
+                                                      h.buckets))}
+                           for name, h in self.timers.items()},
+            }
+
+    def to_prometheus(self):
+        """خروجی متنی با قالب Prometheus"""
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = f"{METRIC_PREFIX}{name}_total"
+                lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+            for name, h in sorted(self.timers.items()):
+                metric = f"{METRIC_PREFIX}{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, bucket in zip(LATENCY_BUCKETS, h.buckets):
+                    cumulative += bucket
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {h.count}')
+                lines += [f"{metric}_sum {h.total:.9f}", f"{metric}_count {h.count}"]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class _NullTimer:
+    """زمان‌سنج بدون عملیات برای حالت غیرفعال"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ('name', 'profile', 'start', 'token')
+
+    def __init__(self, name, profile):
+        self.name = name
+        self.profile = profile
+        self.token = None
+
+    def __enter__(self):
+        if self.profile and _profiler is not None:
+            self.token = _profiler.begin()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        registry.observe(self.name, elapsed)
+        if self.token is not None:
+            _profiler.end(self.token, self.name, elapsed)
+        return False
+
+
+def enabled():
+    return _enabled
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def timer(name, profile=False):
+    """زمان‌سنج context manager؛ با profile=True فراخوانی‌های کند پروفایل می‌شوند"""
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name, profile)
+
+
+def observe(name, seconds):
+    """ثبت یک زمان اندازه‌گیری‌شده در بیرون از timer"""
+    if _enabled:
+        registry.observe(name, seconds)
+
+
+def count(name, value=1):
+    if _enabled:
+        registry.count(name, value)
+
+
+def snapshot():
+    return registry.snapshot()
+
+
+def log(message):
+    """پیام‌های جزئی (مانند مسیرهای بررسی‌شده) فقط در حالت FALCON9_VERBOSE چاپ می‌شوند"""
+    if _verbose:
+        print(message)
+
+
+def write_metrics(path):
+    """نوشتن اتمی وضعیت فعلی متریک‌ها در فایل (JSON یا Prometheus بر اساس پسوند)"""
+    if path.endswith('.json'):
+        content = json.dumps(registry.snapshot(), ensure_ascii=False, indent=2)
+    else:
+        content = registry.to_prometheus()
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+class MetricsExporter:
+    """نوشتن دوره‌ای متریک‌ها در یک رشته پس‌زمینه"""
+
+    def __init__(self, path, interval=DEFAULT_EXPORT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        write_metrics(self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                write_metrics(self.path)
+            except OSError as e:
+                print(f"خطا در نوشتن متریک‌ها: {e}")
+
+
+class SlowCallProfiler:
+    """پروفایلر نمونه‌بردار برای فراخوانی‌های کند
+
+    هنگام اجرای یک بخش پروفایل‌شده، یک رشته پس‌زمینه پشته رشته فراخواننده را در فواصل
+    کوتاه نمونه‌برداری می‌کند. اگر زمان کل از آستانه بیشتر شود، پشته‌ها با قالب فشرده
+    (frame;frame;frame تعداد) به فایل افزوده می‌شوند که با flamegraph.pl یا speedscope
+    قابل نمایش است؛ در غیر این صورت نمونه‌ها دور ریخته می‌شوند.
+    """
+
+    def __init__(self, path, slow_ms=DEFAULT_SLOW_MS, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.path = path
+        self.threshold = slow_ms / 1000
+        self.interval = interval
+        self.dumps = 0
+        self._lock = threading.Lock()
+        self._active = {}
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="slow-call-profiler", daemon=True)
+        self._thread.start()
+
+    def begin(self):
+        token = (threading.get_ident(), object())
+        with self._lock:
+            self._active[token] = Counter()
+        self._wake.set()
+        return token
+
+    def end(self, token, name, elapsed):
+        with self._lock:
+            samples = self._active.pop(token)
+            if not self._active:
+                self._wake.clear()
+        if elapsed < self.threshold or not samples:
+            return
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            for stack, hits in samples.items():
+                f.write(f"{name};{stack} {hits}\n")
+            self.dumps += 1
+
+    @staticmethod
+    def _collapse(frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name}@{os.path.basename(code.co_filename)}:{frame.f_lineno}"
+                         .replace(" ", "_"))
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            frames = sys._current_frames()
+            with self._lock:
+                for (thread_id, _), samples in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        samples[self._collapse(frame)] += 1
+            del frames
+            time.sleep(self.interval)
+
+
+def start_exporter(path, interval=DEFAULT_EXPORT_INTERVAL):
+    global _exporter
+    enable()
+    if _exporter is None:
+        _exporter = MetricsExporter(path, interval).start()
+        # آخرین وضعیت هنگام خروج برنامه هم نوشته می‌شود
+        atexit.register(_exporter.stop)
+    return _exporter
+
+
+def start_profiler(path, slow_ms=DEFAULT_SLOW_MS, interval=DEFAULT_SAMPLE_INTERVAL):
+    global _profiler
+    enable()
+    if _profiler is None:
+        _profiler = SlowCallProfiler(path, slow_ms, interval)
+    return _profiler
+
+
+def configure_from_env(environ=None):
+    """فعال‌سازی خروجی متریک‌ها و پروفایلر بر اساس متغیرهای محیطی"""
+    environ = os.environ if environ is None else environ
+    if environ.get('FALCON9_METRICS_FILE'):
+        start_exporter(environ['FALCON9_METRICS_FILE'],
+                       float(environ.get('FALCON9_METRICS_INTERVAL', DEFAULT_EXPORT_INTERVAL)))
+    if environ.get('FALCON9_PROFILE_FILE'):
+        start_profiler(environ['FALCON9_PROFILE_FILE'],
+                       float(environ.get('FALCON9_PROFILE_SLOW_MS', DEFAULT_SLOW_MS)))
+    return _enabled
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+قالب فایل نسخه‌دار و قابل نگاشت در حافظه برای مدل پیش‌بینی
+
+به جای pickle (که همه آرایه‌های درخت‌ها را در حافظه هر فرآیند کپی می‌کند)، آرایه‌های
+عددی مدل کامپایل‌شده به صورت بافرهای خام هم‌تراز ذخیره می‌شوند و با mmap بدون کپی
+خوانده می‌شوند؛ بنابراین چند فرآیند روی یک میزبان صفحات مدل را به اشتراک می‌گذارند.
+
+ساختار فایل:
+    MAGIC (8 بایت) | طول سرآیند (uint64) | سرآیند JSON | آرایه‌ها (هر کدام هم‌تراز ۶۴ بایتی)
+
+سرآیند شامل نسخه قالب، فهرست ویژگی‌ها، نسخه sklearn، هش محتوا و محل هر آرایه است.
+
+نمونه اجرا:
+    python src/model_artifact.py convert
+    python src/model_artifact.py bench
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+import argparse
+import subprocess
+import numpy as np
+
+try:
+    from .compiled_model import CompiledPipeline
+except ImportError:
+    from compiled_model import CompiledPipeline
+
+
+MAGIC = b'F9MODEL\x00'
+SCHEMA_VERSION = 1
+ALIGNMENT = 64
+ARTIFACT_FILENAME = 'falcon9_landing_model.f9m'
+_LENGTH = struct.Struct('<Q')
+
+# فایل‌هایی که هش محتوای آن‌ها در این فرآیند بررسی شده است: (مسیر، mtime، اندازه)
+_verified = set()
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def content_hash(metadata, arrays):
+    """هش SHA-256 محتوای مدل (متادیتا و بایت‌های همه آرایه‌ها به ترتیب ثابت)"""
+    digest = hashlib.sha256(json.dumps(metadata, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+    for name in CompiledPipeline.ARRAY_NAMES:
+        array = np.ascontiguousarray(arrays[name])
+        digest.update(name.encode('ascii'))
+        digest.update(str(array.dtype).encode('ascii'))
+        digest.update(memoryview(array).cast('B'))
+    return digest.hexdigest()
+
+
+def save_artifact(compiled, path, sklearn_version=None):
+    """ذخیره مدل کامپایل‌شده در قالب قابل نگاشت؛ هش محتوا را برمی‌گرداند"""
+    arrays = {name: np.ascontiguousarray(array) for name, array in compiled.arrays().items()}
+    digest = content_hash(compiled.metadata, arrays)
+
+    layout = {}
+    offset = 0
+    for name in CompiledPipeline.ARRAY_NAMES:
+        array = arrays[name]
+        offset = _align(offset)
+        layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape),
+                        'offset': offset, 'nbytes': array.nbytes}
+        offset += array.nbytes
+
+    header = {
+        'schema_version': SCHEMA_VERSION,
+        'feature_columns': compiled.feature_columns,
+        'sklearn_version': sklearn_version,
+        'content_hash': digest,
+        'metadata': compiled.metadata,
+        'arrays': layout,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    data_start = _align(len(MAGIC) + _LENGTH.size + len(header_bytes))
+
+    # نوشتن در فایل موقت و جایگزینی اتمی تا خواننده‌ها فایل نیمه‌کاره نبینند
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_LENGTH.pack(len(header_bytes)))
+        f.write(header_bytes)
+        for name in CompiledPipeline.ARRAY_NAMES:
+            f.write(b'\x00' * (data_start + layout[name]['offset'] - f.tell()))
+            f.write(memoryview(arrays[name]).cast('B'))
+    # فایل نوشته‌شده پیش از جایگزینی دوباره خوانده و با هش محتوا مقایسه می‌شود
+    verify_file(temp_path)
+    os.replace(temp_path, path)
+    return digest
+
+
+def read_header(path):
+    """خواندن سرآیند بدون بارگذاری آرایه‌ها"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"فایل مدل معتبر نیست: {path}")
+        (length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+        header = json.loads(f.read(length).decode('utf-8'))
+    if header.get('schema_version') != SCHEMA_VERSION:
+        raise ValueError(f"نسخه قالب مدل پشتیبانی نمی‌شود: {header.get('schema_version')}")
+    header['data_start'] = _align(len(MAGIC) + _LENGTH.size + length)
+    return header
+
+
+def _read_arrays(header, buffer):
+    """آرایه‌های مدل به صورت نما روی buffer (بدون کپی)"""
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        count = spec['nbytes'] // dtype.itemsize
+        arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                     offset=header['data_start'] + spec['offset']
+                                     ).reshape(spec['shape'])
+    return arrays
+
+
+def verify_file(path):
+    """بررسی هش محتوای فایل مدل با سرآیند آن (بدون نگاشت فایل)؛ در صورت مغایرت خطا می‌دهد"""
+    header = read_header(path)
+    with open(path, 'rb') as f:
+        arrays = _read_arrays(header, f.read())
+    if content_hash(header['metadata'], arrays) != header['content_hash']:
+        raise ValueError(f"هش محتوای فایل مدل مطابقت ندارد: {path}")
+    return header
+
+
+def load_artifact(path, verify=None):
+    """بارگذاری مدل با نگاشت فایل در حافظه (بدون کپی آرایه‌ها)
+
+    خروجی: (CompiledPipeline، سرآیند). هش محتوا با verify=True همیشه، با verify=False
+    هرگز و به طور پیش‌فرض فقط در اولین بارگذاری هر نسخه فایل (مسیر، mtime و اندازه) در
+    این فرآیند بررسی می‌شود.
+    """
+    header = read_header(path)
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    arrays = _read_arrays(header, buffer)
+
+    state = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+    if verify or (verify is None and state not in _verified):
+        if content_hash(header['metadata'], arrays) != header['content_hash']:
+            raise ValueError(f"هش محتوای فایل مدل مطابقت ندارد: {path}")
+        _verified.add(state)
+
+    return CompiledPipeline(header['metadata'], arrays), header
+
+
+def convert(pickle_path, artifact_path):
+    """تبدیل مدل pickle شده به قالب قابل نگاشت"""
+    import pickle
+    import sklearn
+
+    with open(pickle_path, 'rb') as f:
+        pipeline = pickle.load(f)
+    compiled = CompiledPipeline.from_pipeline(pipeline)
+    return save_artifact(compiled, artifact_path, sklearn_version=sklearn.__version__)
+
+
+# اسکریپت اندازه‌گیری در یک فرآیند تازه اجرا می‌شود تا زمان و حافظه مستقل باشند. RSS فعلی
+# (VmRSS) خوانده می‌شود، نه ru_maxrss که بیشینه‌ای است که از فرآیند والد هم به ارث می‌رسد؛
+# آرایه‌های فایل نگاشته‌شده پس از بارگذاری یک بار خوانده می‌شوند تا صفحات آن‌ها در RSS بیایند.
+_BENCH_SCRIPT = r"""
+import sys, time
+sys.path.insert(0, {src_dir!r})
+import numpy as np
+
+def rss_kb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss // 1024
+    except ImportError:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+
+before = rss_kb()
+start = time.perf_counter()
+if {kind!r} == 'pickle':
+    import pickle
+    with open({path!r}, 'rb') as f:
+        model = pickle.load(f)
+    elapsed = time.perf_counter() - start
+else:
+    from model_artifact import load_artifact
+    model, _ = load_artifact({path!r}, verify=False)
+    elapsed = time.perf_counter() - start
+    touched = sum(int(array.view(np.uint8).sum()) for array in model.arrays().values())
+print(elapsed, rss_kb() - before)
+"""
+
+
+def benchmark(pickle_path, artifact_path, repeats=3):
+    """مقایسه زمان بارگذاری و افزایش RSS بین pickle و قالب قابل نگاشت"""
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for kind, path in (('pickle', pickle_path), ('artifact', artifact_path)):
+        script = _BENCH_SCRIPT.format(src_dir=src_dir, kind=kind, path=path)
+        runs = []
+        for _ in range(repeats):
+            output = subprocess.run([sys.executable, '-c', script], check=True,
+                                    capture_output=True, text=True).stdout.split()
+            runs.append((float(output[0]), int(output[1])))
+        results[kind] = {
+            'load_seconds': min(run[0] for run in runs),
+            'rss_increase_kb': min(run[1] for run in runs),
+            'file_bytes': os.path.getsize(path),
+        }
+    return results
+
+
+def main():
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    default_pickle = os.path.join(base_dir, 'models', 'falcon9_landing_model.pkl')
+    default_artifact = os.path.join(base_dir, 'models', ARTIFACT_FILENAME)
+
+    parser = argparse.ArgumentParser(description="ابزار قالب فایل قابل نگاشت مدل")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('convert', "تبدیل فایل pickle به قالب قابل نگاشت"),
+                            ('bench', "مقایسه زمان بارگذاری و حافظه")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('pickle_path', nargs='?', default=default_pickle)
+        sub.add_argument('artifact_path', nargs='?', default=default_artifact)
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        digest = convert(args.pickle_path, args.artifact_path)
+        print(f"مدل در قالب قابل نگاشت در '{args.artifact_path}' ذخیره شد (هش {digest[:12]}).")
+        return 0
+
+    results = benchmark(args.pickle_path, args.artifact_path)
+    for kind, stats in results.items():
+        print(f"{kind:>8}: بارگذاری {stats['load_seconds'] * 1000:.1f} میلی‌ثانیه، "
+              f"افزایش RSS {stats['rss_increase_kb'] / 1024:.1f} مگابایت، "
+              f"اندازه فایل {stats['file_bytes'] / 1024:.0f} کیلوبایت")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
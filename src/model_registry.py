@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+فهرست نسخه‌دار مدل‌ها با اشاره‌گر «نسخه فعلی» و جایگزینی مدل بدون راه‌اندازی مجدد
+
+ساختار پوشه فهرست (پیش‌فرض models/registry):
+    versions/<نسخه>/falcon9_landing_model.pkl و .f9m   فایل‌های مدل
+    versions/<نسخه>/metadata.json                      زمان، منبع، اندازه و هش فایل‌ها و آمار آموزش
+    current.json                                       اشاره‌گر نسخه فعلی و تاریخچه فعال‌سازی‌ها
+
+هر نسخه ابتدا در یک پوشه موقت ساخته و سپس با یک تغییر نام اتمی منتشر می‌شود و اشاره‌گر هم
+با os.replace نوشته می‌شود، بنابراین خواننده‌ها هیچ‌گاه نسخه یا اشاره‌گر نیمه‌کاره نمی‌بینند.
+
+HotSwapModel همان رابط PredictionModel را دارد. یک رشته پس‌زمینه اشاره‌گر را زیر نظر دارد،
+نسخه تازه را کنار مدل فعلی بارگذاری و بررسی می‌کند و سپس با یک انتساب مرجع جایگزین می‌کند؛
+هر فراخوانی پیش‌بینی مدل را یک بار در ابتدا برمی‌دارد، پس پیش‌بینی‌های در حال اجرا با مدل
+قبلی تمام می‌شوند و هیچ پیش‌بینی‌ای متوقف نمی‌شود. با keep_previous مدل قبلی گرم نگه داشته
+می‌شود تا بازگشت فوری و مقایسه A/B (compare_batch) ممکن باشد.
+
+نمونه اجرا:
+    python -m src registry publish --note "داده ۲۰۲۱"   # انتشار مدل پوشه models و فعال‌سازی آن
+    python -m src registry list
+    python -m src registry activate 20240101-120000-1a2b3c4d
+    python -m src registry rollback
+    python -m src registry compare                     # مقایسه نسخه فعلی و قبلی
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import threading
+
+try:
+    from .predictor import (PredictionModel, MODEL_RESOURCE, ARTIFACT_RESOURCE,
+                            SIMILAR_INDEX_RESOURCE, HISTORY_RESOURCE, random_launches)
+    from .resources import get_registry, file_sha256
+    from . import instrumentation
+except ImportError:
+    from predictor import (PredictionModel, MODEL_RESOURCE, ARTIFACT_RESOURCE,
+                           SIMILAR_INDEX_RESOURCE, HISTORY_RESOURCE, random_launches)
+    from resources import get_registry, file_sha256
+    import instrumentation
+
+
+REGISTRY_RESOURCE = 'models/registry'
+POINTER_FILENAME = 'current.json'
+METADATA_FILENAME = 'metadata.json'
+VERSIONS_DIR = 'versions'
+MODEL_FILES = tuple(os.path.basename(path) for path in (MODEL_RESOURCE, ARTIFACT_RESOURCE, SIMILAR_INDEX_RESOURCE,
+                                                         HISTORY_RESOURCE))
+TRAINING_MANIFEST_FILENAME = 'falcon9_training_manifest.json'
+MAX_HISTORY = 50
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+def default_root():
+    """پوشه فهرست مدل‌ها در پوشه منابع"""
+    return get_registry().resolve(REGISTRY_RESOURCE)
+
+
+def _write_json(path, document):
+    """نوشتن اتمی فایل JSON"""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+
+class ModelRegistry:
+    """پوشه نسخه‌های مدل و اشاره‌گر نسخه فعلی"""
+
+    def __init__(self, root=None):
+        self.root = root or default_root()
+        self.pointer_path = os.path.join(self.root, POINTER_FILENAME)
+        self._lock = threading.Lock()
+
+    def version_dir(self, version):
+        return os.path.join(self.root, VERSIONS_DIR, version)
+
+    def metadata(self, version):
+        with open(os.path.join(self.version_dir(version), METADATA_FILENAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def versions(self):
+        """فراداده همه نسخه‌ها به ترتیب زمان انتشار"""
+        directory = os.path.join(self.root, VERSIONS_DIR)
+        if not os.path.isdir(directory):
+            return []
+        result = []
+        for name in os.listdir(directory):
+            if name.startswith('.'):
+                continue
+            try:
+                result.append(self.metadata(name))
+            except (OSError, ValueError):
+                continue
+        return sorted(result, key=lambda metadata: (metadata['created'], metadata['version']))
+
+    def pointer(self):
+        """محتوای اشاره‌گر ({'version'، 'history'، 'updated'}) یا None"""
+        try:
+            with open(self.pointer_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def pointer_state(self):
+        """زمان تغییر و اندازه فایل اشاره‌گر برای تشخیص ارزان تغییر آن"""
+        try:
+            stat = os.stat(self.pointer_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def current_version(self):
+        pointer = self.pointer()
+        return pointer['version'] if pointer else None
+
+    def previous_version(self):
+        pointer = self.pointer()
+        history = pointer['history'] if pointer else []
+        return history[-2] if len(history) > 1 else None
+
+    def verify(self, version):
+        """بررسی اندازه و هش فایل‌های نسخه با فراداده آن"""
+        directory = self.version_dir(version)
+        for name, expected in self.metadata(version)['files'].items():
+            path = os.path.join(directory, name)
+            if not os.path.exists(path) or os.path.getsize(path) != expected['size']:
+                return False
+            if file_sha256(path) != expected['sha256']:
+                return False
+        return True
+
+    def publish(self, model_dir, note=None, activate=True):
+        """انتشار فایل‌های مدل یک پوشه به عنوان نسخه تازه؛ خروجی شناسه نسخه
+
+        اگر نسخه‌ای با همان محتوا از قبل وجود داشته باشد، همان نسخه برگردانده (و در صورت
+        درخواست فعال) می‌شود.
+        """
+        files = {}
+        for name in MODEL_FILES:
+            path = os.path.join(model_dir, name)
+            if os.path.exists(path):
+                files[name] = {'size': os.path.getsize(path), 'sha256': file_sha256(path)}
+        if not files:
+            raise FileNotFoundError(f"فایل مدلی در '{model_dir}' پیدا نشد")
+
+        content = files.get(MODEL_FILES[0], files.get(MODEL_FILES[-1]))['sha256']
+        for metadata in self.versions():
+            if metadata['files'] == files:
+                if activate:
+                    self.activate(metadata['version'])
+                return metadata['version']
+
+        version = f"{time.strftime('%Y%m%d-%H%M%S')}-{content[:8]}"
+        metadata = {'version': version, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'source': os.path.abspath(model_dir), 'note': note, 'files': files}
+        training_manifest = os.path.join(model_dir, TRAINING_MANIFEST_FILENAME)
+        if os.path.exists(training_manifest):
+            with open(training_manifest, 'r', encoding='utf-8') as f:
+                history = json.load(f).get('history') or [{}]
+            metadata['training'] = history[-1]
+
+        # نسخه در پوشه موقت کامل می‌شود و با یک تغییر نام اتمی ظاهر می‌شود
+        versions_dir = os.path.join(self.root, VERSIONS_DIR)
+        os.makedirs(versions_dir, exist_ok=True)
+        temp_dir = os.path.join(versions_dir, f".{version}.{os.getpid()}.tmp")
+        os.makedirs(temp_dir)
+        try:
+            for name in files:
+                shutil.copy2(os.path.join(model_dir, name), temp_dir)
+            _write_json(os.path.join(temp_dir, METADATA_FILENAME), metadata)
+            os.replace(temp_dir, self.version_dir(version))
+        except OSError:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version):
+        """تنظیم اشاره‌گر روی یک نسخه موجود"""
+        if not os.path.exists(os.path.join(self.version_dir(version), METADATA_FILENAME)):
+            raise ValueError(f"نسخه '{version}' در فهرست مدل‌ها وجود ندارد")
+        with self._lock:
+            pointer = self.pointer() or {'history': []}
+            history = [v for v in pointer['history'] if v != version] + [version]
+            self._write_pointer(version, history[-MAX_HISTORY:])
+        return version
+
+    def rollback(self):
+        """بازگشت به نسخه فعال پیش از نسخه فعلی؛ خروجی نسخه تازه فعال"""
+        with self._lock:
+            pointer = self.pointer()
+            if not pointer or len(pointer['history']) < 2:
+                raise ValueError("نسخه قبلی برای بازگشت وجود ندارد")
+            history = pointer['history'][:-1]
+            self._write_pointer(history[-1], history)
+        return history[-1]
+
+    def _write_pointer(self, version, history):
+        os.makedirs(self.root, exist_ok=True)
+        _write_json(self.pointer_path, {'version': version, 'history': history,
+                                        'updated': time.strftime('%Y-%m-%dT%H:%M:%S')})
+
+
+class HotSwapModel:
+    """مدل با رابط PredictionModel که با تغییر اشاره‌گر فهرست بدون توقف جایگزین می‌شود
+
+    ویژگی‌ها و متدهای PredictionModel (predict_row، predict_batch، model_hash و ...) از مدل
+    فعال خوانده می‌شوند. on_swap(نسخه) پس از هر جایگزینی در رشته بارگذاری فراخوانی می‌شود.
+    """
+
+    def __init__(self, registry=None, keep_previous=False, interval=DEFAULT_POLL_INTERVAL,
+                 watch=True, on_swap=None, **model_options):
+        self.registry = registry or ModelRegistry()
+        self.keep_previous = keep_previous
+        self.on_swap = on_swap
+        self.model_options = model_options
+        self.interval = interval
+        self.version = None
+        self.previous = None
+        self.previous_version = None
+        self.swaps = 0
+        self._active = None
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pointer_state = None
+        self.reload()
+        if keep_previous:
+            self.warm_previous()
+        if watch:
+            self.watch()
+
+    def __getattr__(self, name):
+        # فقط برای نام‌هایی که در خود این کلاس نیستند؛ مدل فعال یک بار خوانده می‌شود
+        active = self.__dict__.get('_active')
+        if active is None:
+            raise AttributeError(name)
+        return getattr(active, name)
+
+    @property
+    def is_loaded(self):
+        active = self._active
+        return active is not None and active.is_loaded
+
+    def _load_version(self, version):
+        """بارگذاری و بررسی یک نسخه؛ خروجی PredictionModel یا None"""
+        if not self.registry.verify(version):
+            print(f"بررسی یکپارچگی نسخه {version} ناموفق بود و بارگذاری نمی‌شود.")
+            instrumentation.count('integrity_failures')
+            return None
+        with instrumentation.timer('model_swap_load'):
+            model = PredictionModel(model_dir=self.registry.version_dir(version), **self.model_options)
+        if not model.is_loaded:
+            print(f"بارگذاری نسخه {version} ناموفق بود؛ مدل فعلی حفظ می‌شود.")
+            return None
+        return model
+
+    def _swap(self, model, version):
+        """جایگزینی مدل فعال با یک انتساب؛ پیش‌بینی‌های در حال اجرا مدل قبلی را نگه می‌دارند"""
+        previous, previous_version = self._active, self.version
+        self._active, self.version = model, version
+        if self.keep_previous and previous is not None:
+            self.previous, self.previous_version = previous, previous_version
+        else:
+            self.previous, self.previous_version = None, None
+        self.swaps += 1
+        instrumentation.count('model_swaps')
+        print(f"نسخه مدل {version} فعال شد.")
+        if self.on_swap is not None:
+            self.on_swap(version)
+
+    def reload(self):
+        """بارگذاری نسخه اشاره‌گر در صورت تفاوت با نسخه فعال؛ خروجی True اگر مدل جایگزین شود"""
+        with self._load_lock:
+            self._pointer_state = self.registry.pointer_state()
+            version = self.registry.current_version()
+            if version is None or version == self.version:
+                return False
+            if version == self.previous_version and self.previous is not None:
+                # مدل قبلی هنوز گرم است (مثلاً پس از rollback در فرآیند دیگر)
+                self._swap(self.previous, version)
+                return True
+            model = self._load_version(version)
+            if model is None:
+                return False
+            self._swap(model, version)
+            return True
+
+    def warm_previous(self):
+        """بارگذاری نسخه فعال پیشین (در تاریخچه اشاره‌گر) به عنوان مدل قبلی گرم"""
+        version = self.registry.previous_version()
+        if version is None or version == self.previous_version:
+            return False
+        model = self._load_version(version)
+        if model is None:
+            return False
+        with self._load_lock:
+            self.previous, self.previous_version = model, version
+        return True
+
+    def rollback(self):
+        """بازگشت به نسخه قبلی؛ اگر مدل قبلی گرم باشد جایگزینی بدون بارگذاری انجام می‌شود"""
+        self.registry.rollback()
+        return self.reload()
+
+    @property
+    def watching(self):
+        """آیا بررسی اشاره‌گر شروع شده است (در فرآیند فرزند fork رشته آن وجود ندارد)"""
+        return self._thread is not None and not self._stop.is_set()
+
+    def watch(self, interval=None):
+        """شروع رشته پس‌زمینه بررسی اشاره‌گر (پس از fork هم دوباره قابل فراخوانی است)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, args=(interval or self.interval,),
+                                        name="model-registry-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _watch(self, interval):
+        while not self._stop.wait(interval):
+            if self.registry.pointer_state() == self._pointer_state:
+                continue
+            try:
+                self.reload()
+            except Exception as e:
+                print(f"خطا در بارگذاری نسخه تازه مدل: {e}")
+
+    def compare_batch(self, input_data):
+        """مقایسه A/B احتمال موفقیت مدل فعلی و مدل قبلی گرم روی یک دسته ورودی"""
+        current, previous = self._active, self.previous
+        if previous is None:
+            raise ValueError("مدل قبلی گرم نگه داشته نشده است (keep_previous)")
+        current_result = current.predict_batch(input_data)
+        previous_result = previous.predict_batch(input_data)
+        difference = abs(current_result['probability'] - previous_result['probability'])
+        return {
+            'current_version': self.version,
+            'previous_version': self.previous_version,
+            'current': current_result['probability'],
+            'previous': previous_result['probability'],
+            'max_difference': float(difference.max()),
+            'mean_difference': float(difference.mean()),
+            'agreement': float((current_result['prediction'] == previous_result['prediction']).mean()),
+        }
+
+
+def open_model(registry_root=None, watch=True, keep_previous=False, on_swap=None, **model_options):
+    """HotSwapModel اگر فهرست مدل‌ها نسخه فعال داشته باشد؛ در غیر این صورت PredictionModel"""
+    registry = ModelRegistry(registry_root)
+    if registry.current_version() is None:
+        return PredictionModel(**model_options)
+    return HotSwapModel(registry, keep_previous=keep_previous, watch=watch, on_swap=on_swap,
+                        **model_options)
+
+
+def main(argv=None):
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="مدیریت نسخه‌های مدل و نسخه فعال")
+    parser.add_argument('--root', default=None, help="پوشه فهرست مدل‌ها (پیش‌فرض models/registry)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('list', help="فهرست نسخه‌ها")
+    publish = subparsers.add_parser('publish', help="انتشار مدل یک پوشه به عنوان نسخه تازه")
+    publish.add_argument('--model-dir', default=os.path.join(base_dir, 'models'))
+    publish.add_argument('--note', default=None, help="توضیح نسخه")
+    publish.add_argument('--no-activate', action='store_true', help="انتشار بدون فعال‌سازی")
+    activate = subparsers.add_parser('activate', help="فعال‌سازی یک نسخه")
+    activate.add_argument('version')
+    subparsers.add_parser('rollback', help="بازگشت به نسخه قبلی")
+    compare = subparsers.add_parser('compare', help="مقایسه نسخه فعلی با نسخه قبلی")
+    compare.add_argument('--rows', type=int, default=10000, help="تعداد سطرهای تصادفی")
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry(args.root)
+    try:
+        if args.command == 'publish':
+            version = registry.publish(args.model_dir, args.note, activate=not args.no_activate)
+            print(f"نسخه {version} منتشر شد{' و فعال است' if not args.no_activate else ''}.")
+        elif args.command == 'activate':
+            print(f"نسخه {registry.activate(args.version)} فعال شد.")
+        elif args.command == 'rollback':
+            print(f"بازگشت به نسخه {registry.rollback()} انجام شد.")
+        elif args.command == 'compare':
+            if registry.previous_version() is None:
+                raise ValueError("نسخه قبلی برای مقایسه وجود ندارد")
+            model = HotSwapModel(registry, keep_previous=True, watch=False, compiled=True)
+            result = model.compare_batch(random_launches(args.rows))
+            print(f"{result['current_version']} در برابر {result['previous_version']} روی {args.rows} سطر: "
+                  f"توافق برچسب {result['agreement']:.1%}، بیشینه اختلاف احتمال "
+                  f"{result['max_difference']:.2f} درصد و میانگین آن {result['mean_difference']:.3f} درصد")
+        else:
+            current = registry.current_version()
+            for metadata in registry.versions():
+                marker = '*' if metadata['version'] == current else ' '
+                training = metadata.get('training', {})
+                details = ', '.join(f"{key}={training[key]}" for key in ('rows', 'n_estimators', 'mode')
+                                    if key in training)
+                print(f"{marker} {metadata['version']}  {metadata['created']}  {details}  {metadata.get('note') or ''}")
+    except (ValueError, OSError) as e:
+        print(f"خطا: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+حافظه نهان (LRU) برای نتایج پیش‌بینی
+
+ورودی‌های مدل تقریباً همه گسسته هستند (مدار، محل پرتاب، پرچم‌های بولین، بلوک و
+مقادیر صحیح) و وزن محموله نیز بدون اعشار وارد می‌شود، بنابراین پرس‌وجوهای تکراری
+زیادند. کلیدها پیش از ذخیره فقط برای مقادیر واقعاً هم‌ارز به شکل استاندارد درمی‌آیند و
+با تغییر مدل بارگذاری‌شده (بر اساس هش فایل مدل) کل حافظه نهان خودکار باطل می‌شود.
+"""
+
+import copy
+import functools
+import threading
+from collections import OrderedDict
+
+
+DEFAULT_CACHE_SIZE = 4096
+
+
+def _is_missing(value):
+    """تشخیص مقدار گمشده (None یا NaN)"""
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _canonical(value):
+    """شکل استاندارد یک مقدار: عدد به float و رشته بدون تغییر"""
+    if _is_missing(value):
+        return None
+    if isinstance(value, str):
+        return value
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return value
+    return None if number != number else number
+
+
+@functools.lru_cache(maxsize=None)
+def _feature_count():
+    """تعداد ستون‌های ورودی مدل؛ با تأخیر خوانده می‌شود چون predictor خودش این ماژول را وارد می‌کند"""
+    try:
+        from .predictor import FEATURE_COLUMNS
+    except ImportError:
+        from predictor import FEATURE_COLUMNS
+    return len(FEATURE_COLUMNS)
+
+
+def canonical_key(values, serial=None):
+    """ساخت کلید استاندارد از یک سطر ورودی به ترتیب FEATURE_COLUMNS
+
+    فقط مقادیری که مدل دقیقاً یکسان می‌بیند کلید یکسان می‌گیرند: True و 1 یا 5000.0 و 5000
+    (هر عدد به float تبدیل می‌شود) و None و NaN. عددها گرد نمی‌شوند، چون آستانه‌های درخت‌ها
+    بین اعداد صحیح هم قرار دارند، و رشته‌ها بدون تغییر می‌مانند، چون رمزگذار one-hot مثلاً
+    ' GTO' را دسته‌ای ناشناخته و 'False' را متفاوت با 0 می‌بیند.
+    شماره سریال بوستر (در صورت وجود) هم به انتهای کلید افزوده می‌شود.
+    """
+    if len(values) != _feature_count():
+        raise ValueError(f"سطر ورودی باید {_feature_count()} مقدار داشته باشد، نه {len(values)}")
+    key = tuple(_canonical(value) for value in values)
+    return key if _is_missing(serial) else key + (_canonical(serial),)
+
+
+class PredictionCache:
+    """حافظه نهان LRU با اندازه محدود و آمار برخورد
+
+    نتایج هنگام ذخیره و خواندن کپی عمیق می‌شوند تا تغییر فهرست‌ها و دیکشنری‌های تودرتوی
+    نتیجه (مانند similar و explanation) توسط فراخواننده، برخوردهای بعدی را خراب نکند.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        if maxsize <= 0:
+            raise ValueError("اندازه حافظه نهان باید مثبت باشد")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._model_key = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _bind(self, model_key):
+        """باطل کردن همه نتایج در صورت تغییر مدل"""
+        if model_key != self._model_key:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._model_key = model_key
+
+    def get(self, model_key, key):
+        """خواندن نتیجه از حافظه نهان؛ در صورت نبودن None برمی‌گرداند"""
+        with self._lock:
+            self._bind(model_key)
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # نتیجه ذخیره‌شده هیچ‌وقت تغییر نمی‌کند، بنابراین کپی بیرون از قفل انجام می‌شود
+        return copy.deepcopy(result)
+
+    def put(self, model_key, key, result):
+        """ذخیره نتیجه و حذف قدیمی‌ترین مورد در صورت پر بودن"""
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._bind(model_key)
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """پاک کردن نتایج و آمار"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self):
+        """آمار استفاده از حافظه نهان برای تعیین اندازه مناسب"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+فهرست منابع برنامه با یک بار جستجو و بررسی یکپارچگی مبتنی بر فایل manifest
+
+به جای بررسی چند مسیر پایه با os.path.exists در هر فراخوانی، هر منبع فقط یک بار پیدا
+و مسیر آن در حافظه نگه داشته می‌شود. مسیرهای پایه همیشه به ترتیب اولویت بررسی می‌شوند.
+بسته PyInstaller یک فایل manifest شامل اندازه و هش SHA-256 همه منابع همراه دارد؛ منابعی
+که در manifest یک مسیر پایه ثبت شده‌اند در همان مسیر بدون بررسی فایل پیدا می‌شوند، و هر
+manifest فقط برای بررسی یکپارچگی منابع ریشه خودش استفاده می‌شود. نتیجه بررسی یکپارچگی هر فایل بر اساس mtime و اندازه در پوشه cache کاربر
+ذخیره می‌شود تا در اجراهای بعدی فایل دوباره هش نشود.
+
+نمونه اجرا:
+    python src/resources.py build     # ساخت manifest برای models و assets
+    python src/resources.py verify    # بررسی یکپارچگی همه منابع manifest
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import threading
+
+try:
+    from . import instrumentation
+except ImportError:
+    import instrumentation
+
+
+MANIFEST_FILENAME = 'resources_manifest.json'
+MANIFEST_VERSION = 1
+RESOURCE_DIRS = ('models', 'assets')
+INTEGRITY_CACHE_FILENAME = 'integrity.json'
+
+
+def default_base_paths():
+    """مسیرهای پایه جستجوی منابع به ترتیب اولویت"""
+    base_paths = [
+        # PyInstaller ایجاد یک _MEIPASS مسیر موقت می‌کند
+        getattr(sys, '_MEIPASS', None),
+        # مسیر کنار فایل اجرایی
+        os.path.dirname(sys.executable),
+        # مسیر فعلی
+        os.getcwd(),
+        # مسیر پوشه اصلی پروژه
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ]
+    # حذف مسیرهای خالی یا None
+    return [p for p in base_paths if p]
+
+
+def default_cache_dir():
+    """پوشه cache کاربر برای نگهداری نتایج بررسی یکپارچگی بین اجراها"""
+    if os.environ.get('FALCON9_CACHE_DIR'):
+        return os.environ['FALCON9_CACHE_DIR']
+    if sys.platform == 'win32' and os.environ.get('LOCALAPPDATA'):
+        root = os.environ['LOCALAPPDATA']
+    else:
+        root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, 'falcon9-predictor')
+
+
+def _normalize(relative_path):
+    return relative_path.replace('\\', '/')
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_manifest(root, relative_paths=None):
+    """ساخت manifest (اندازه و هش) برای منابع زیر root؛ به طور پیش‌فرض همه فایل‌های models و assets"""
+    if relative_paths is None:
+        relative_paths = []
+        for directory in RESOURCE_DIRS:
+            full_dir = os.path.join(root, directory)
+            if os.path.isdir(full_dir):
+                relative_paths += [f"{directory}/{name}" for name in sorted(os.listdir(full_dir))
+                                   if os.path.isfile(os.path.join(full_dir, name))]
+
+    resources = {}
+    for relative_path in relative_paths:
+        full_path = os.path.join(root, relative_path)
+        resources[_normalize(relative_path)] = {'size': os.path.getsize(full_path),
+                                                'sha256': file_sha256(full_path)}
+    return {'version': MANIFEST_VERSION, 'resources': resources}
+
+
+def write_manifest(root, relative_paths=None):
+    """نوشتن manifest در ریشه منابع؛ خروجی مسیر فایل"""
+    manifest = build_manifest(root, relative_paths)
+    path = os.path.join(root, MANIFEST_FILENAME)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return path
+
+
+class ResourceRegistry:
+    """نمایه درون‌حافظه‌ای مسیر منابع با بررسی یکپارچگی ذخیره‌شده بین اجراها"""
+
+    def __init__(self, base_paths=None, cache_dir=None):
+        self.base_paths = base_paths or default_base_paths()
+        self.cache_path = os.path.join(cache_dir or default_cache_dir(), INTEGRITY_CACHE_FILENAME)
+        # manifest هر مسیر پایه: {مسیر پایه: {منبع: اندازه و هش}}
+        self.manifests = {}
+        self._index = {}
+        self._integrity = None
+        self._lock = threading.Lock()
+        self._load_manifest()
+
+    @property
+    def manifest(self):
+        """manifest پراولویت‌ترین مسیر پایه‌ای که manifest دارد (یا دیکشنری خالی)"""
+        for base_path in self.base_paths:
+            if base_path in self.manifests:
+                return self.manifests[base_path]
+        return {}
+
+    def _load_manifest(self):
+        """خواندن manifest هر مسیر پایه (در صورت وجود) بدون بررسی تک‌تک فایل‌ها"""
+        for base_path in self.base_paths:
+            path = os.path.join(base_path, MANIFEST_FILENAME)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if manifest.get('version') != MANIFEST_VERSION or base_path in self.manifests:
+                continue
+            self.manifests[base_path] = manifest['resources']
+            instrumentation.log(f"فهرست منابع از {path} بارگذاری شد ({len(manifest['resources'])} منبع).")
+
+    def _locate(self, relative_path):
+        """یافتن منبع به ترتیب اولویت مسیرهای پایه؛ خروجی (مسیر کامل، مسیر پایه) یا None"""
+        key = _normalize(relative_path)
+        for base_path in self.base_paths:
+            full_path = os.path.join(base_path, *key.split('/'))
+            # منبع ثبت‌شده در manifest همین مسیر پایه بدون بررسی فایل پذیرفته می‌شود
+            if key in self.manifests.get(base_path, ()):
+                return full_path, base_path
+            instrumentation.count('resource_probes')
+            if os.path.exists(full_path):
+                instrumentation.log(f"فایل پیدا شد: {full_path}")
+                return full_path, base_path
+        # اگر با مسیر نسبی پیدا نشد، یک بار دیگر با مسیر مطلق بررسی کنیم
+        if os.path.exists(relative_path):
+            instrumentation.log(f"فایل با مسیر مطلق پیدا شد: {relative_path}")
+            return relative_path, None
+        return None
+
+    def find(self, relative_path):
+        """مسیر کامل منبع یا None؛ هر منبع فقط یک بار در مسیرهای پایه جستجو می‌شود"""
+        key = _normalize(relative_path)
+        entry = self._index.get(key)
+        if entry is None:
+            entry = self._locate(relative_path)
+            # فقط مسیرهای یافت‌شده نگه داشته می‌شوند تا فایل‌هایی که بعداً ساخته می‌شوند پیدا شوند
+            if entry is None:
+                return None
+            with self._lock:
+                self._index[key] = entry
+        return entry[0]
+
+    def resolve(self, relative_path):
+        """مانند find، اما در صورت نبود فایل مسیر پیش‌فرض در پوشه پروژه را برمی‌گرداند"""
+        path = self.find(relative_path)
+        if path is None:
+            path = os.path.join(default_base_paths()[-1], relative_path)
+            instrumentation.log(f"فایل پیدا نشد، مسیر پیش‌فرض: {path}")
+        return path
+
+    def invalidate(self, relative_path=None):
+        """حذف مسیرهای ذخیره‌شده (مثلاً پس از جایگزینی فایل‌ها)"""
+        with self._lock:
+            if relative_path is None:
+                self._index.clear()
+            else:
+                self._index.pop(_normalize(relative_path), None)
+
+    def _load_integrity_cache(self):
+        if self._integrity is None:
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    self._integrity = json.load(f)
+            except (OSError, ValueError):
+                self._integrity = {}
+        return self._integrity
+
+    def _save_integrity_cache(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._integrity, f)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            instrumentation.log(f"ذخیره نتایج بررسی یکپارچگی ممکن نشد: {e}")
+
+    def verify(self, relative_path):
+        """بررسی اندازه و هش منبع با manifest ریشه‌ای که منبع در آن پیدا شده است
+
+        خروجی True یا False، یا None اگر منبع در manifest آن ریشه نباشد. اگر mtime و اندازه
+        فایل از آخرین بررسی موفق تغییر نکرده باشد، فایل دوباره هش نمی‌شود.
+        """
+        key = _normalize(relative_path)
+        path = self.find(key)
+        if path is None:
+            return None
+        expected = self.manifests.get(self._index[key][1], {}).get(key)
+        if expected is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except (OSError, TypeError):
+            return False
+        if stat.st_size != expected['size']:
+            return False
+
+        with self._lock:
+            cache = self._load_integrity_cache()
+            cached = cache.get(os.path.abspath(path))
+            if (cached is not None and cached['mtime_ns'] == stat.st_mtime_ns
+                    and cached['size'] == stat.st_size and cached['sha256'] == expected['sha256']):
+                instrumentation.count('integrity_cache_hits')
+                return True
+
+        with instrumentation.timer('integrity_hash'):
+            valid = file_sha256(path) == expected['sha256']
+        if valid:
+            with self._lock:
+                cache[os.path.abspath(path)] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                                                'sha256': expected['sha256']}
+                self._save_integrity_cache()
+        return valid
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """نمونه مشترک فهرست منابع که در اولین استفاده ساخته می‌شود"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ResourceRegistry()
+    return _registry
+
+
+def main():
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="ساخت و بررسی manifest منابع برنامه")
+    parser.add_argument('command', choices=['build', 'verify'])
+    parser.add_argument('root', nargs='?', default=base_dir, help="ریشه منابع (شامل models و assets)")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        path = write_manifest(args.root)
+        print(f"فهرست منابع در '{path}' نوشته شد.")
+        return 0
+
+    registry = ResourceRegistry(base_paths=[args.root])
+    if not registry.manifest:
+        print(f"فایل {MANIFEST_FILENAME} در '{args.root}' پیدا نشد.")
+        return 1
+    failures = [name for name in registry.manifest if not registry.verify(name)]
+    for name in failures:
+        print(f"بررسی یکپارچگی ناموفق: {name}")
+    print(f"{len(registry.manifest) - len(failures)} از {len(registry.manifest)} منبع سالم است.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,112 +3,567 @@
 
 """
 این اسکریپت مدل جنگل تصادفی را برای پیش‌بینی فرود فالکون ۹ آموزش می‌دهد و ذخیره می‌کند.
+
+با گزینه --tune به جای پارامترهای ثابت، یک جستجوی اعتبارسنجی متقاطع روی پارامترهای
+جنگل و پیش‌پردازش روی همه هسته‌ها اجرا می‌شود و بهترین پایپ‌لاین ذخیره می‌شود:
+    python src/save_model.py --tune --cv 5 --jobs -1
+
+با گزینه --incremental فقط سطرهای تازه افزوده‌شده به فایل داده پردازش می‌شوند و به جای
+آموزش از ابتدا، چند درخت تازه روی داده بزرگ‌شده به جنگل افزوده (و قدیمی‌ترین درخت‌ها کنار
+گذاشته) می‌شوند؛ اگر داده تغییری نکرده باشد آموزش کاملاً رد می‌شود:
+    python src/save_model.py --incremental --new-trees 20
+
+با گزینه --compact پس از ذخیره (آموزش کامل یا به‌روزرسانی افزایشی)، فایل .f9m با نسخه
+فشرده مدل (compact_model.py) جایگزین می‌شود؛ مقدار آن بیشینه اختلاف مجاز احتمال به درصد است:
+    python src/save_model.py --compact 3
+
+با گزینه --publish مدل ذخیره‌شده به عنوان نسخه تازه در فهرست مدل‌ها (model_registry.py)
+منتشر و فعال می‌شود و برنامه‌ها و سرورهای در حال اجرا بدون راه‌اندازی مجدد به آن می‌روند:
+    python src/save_model.py --publish
+
+با گزینه --booster-history ویژگی‌های سابقه بوستر و سکو (booster_history.py) هم به مدل داده
+می‌شوند و فهرست سابقه کنار مدل ذخیره می‌شود؛ همراه --tune استفاده یا عدم استفاده از آن‌ها هم
+جزو فضای جستجو است:
+    python src/save_model.py --booster-history
 """
 
 import pandas as pd
 import numpy as np
+import io
 import os
+import json
+import time
 import pickle
-from sklearn.model_selection import train_test_split
+import hashlib
+import argparse
+import itertools
+from sklearn.model_selection import train_test_split, StratifiedKFold
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
 from sklearn.ensemble import RandomForestClassifier
+import sklearn
 
-def main():
-    # مسیر فایل‌ها
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    base_dir = os.path.dirname(script_dir)
-    data_path = os.path.join(base_dir, 'data', 'data_falcon9.csv')
-    model_dir = os.path.join(base_dir, 'models')
-    os.makedirs(model_dir, exist_ok=True)
+try:
+    from .compiled_model import CompiledPipeline
+    from .model_artifact import save_artifact, ARTIFACT_FILENAME
+    from .resources import write_manifest, MANIFEST_FILENAME as RESOURCE_MANIFEST_FILENAME
+    from .features import (prepare_frame, load_training_data, FEATURES, NUMERICAL_FEATURES,
+                           CATEGORICAL_FEATURES, BOOLEAN_FEATURES)
+    from .similar_launches import save_index
+    from .predictor import HISTORY_FEATURES
+    from .booster_history import BoosterHistory, save_history, HISTORY_FILENAME
+except ImportError:
+    from compiled_model import CompiledPipeline
+    from model_artifact import save_artifact, ARTIFACT_FILENAME
+    from resources import write_manifest, MANIFEST_FILENAME as RESOURCE_MANIFEST_FILENAME
+    from features import (prepare_frame, load_training_data, FEATURES, NUMERICAL_FEATURES,
+                          CATEGORICAL_FEATURES, BOOLEAN_FEATURES)
+    from similar_launches import save_index
+    from predictor import HISTORY_FEATURES
+    from booster_history import BoosterHistory, save_history, HISTORY_FILENAME
+
+
+MODEL_FILENAME = 'falcon9_landing_model.pkl'
+MANIFEST_FILENAME = 'falcon9_training_manifest.json'
+ROWS_FILENAME = 'falcon9_training_rows.pkl'
+MANIFEST_VERSION = 1
+DEFAULT_NEW_TREES = 20
+
+# پارامترهای پیش‌فرض (همان مدل اولیه)
+DEFAULT_PREPROCESSING = {'num_imputer': 'median', 'scale': True}
+DEFAULT_FOREST = {'n_estimators': 100, 'max_depth': None, 'min_samples_leaf': 1, 'max_features': 'sqrt'}
+
+# فضای جستجو در حالت --tune؛ تعداد درخت‌ها بودجه مرحله‌های حذف متوالی است
+PREPROCESSING_GRID = {
+    'num_imputer': ['median', 'mean'],
+    'scale': [True, False],
+}
+FOREST_GRID = {
+    'max_depth': [None, 4, 8],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': ['sqrt', 0.5, None],
+}
+
+
+def build_preprocessor(num_imputer='median', scale=True, history=False):
+    """پایپ‌لاین پیش‌پردازش ستون‌ها (با history ستون‌های سابقه بوستر هم جزو ویژگی‌های عددی هستند)"""
+    numerical_steps = [('imputer', SimpleImputer(strategy=num_imputer))]
+    if scale:
+        numerical_steps.append(('scaler', StandardScaler()))
+    numerical_transformer = Pipeline(steps=numerical_steps)
     
-    # بارگذاری داده‌ها
-    print("بارگذاری داده‌ها...")
-    df = pd.read_csv(data_path)
+    categorical_transformer = Pipeline(steps=[
+        ('imputer', SimpleImputer(strategy='most_frequent')),
+        ('onehot', OneHotEncoder(handle_unknown='ignore'))
+    ])
     
-    # ایجاد ستون هدف برای تعیین موفقیت فرود
-    print("پردازش داده‌ها...")
+    boolean_transformer = Pipeline(steps=[
+        ('imputer', SimpleImputer(strategy='most_frequent'))
+    ])
+    
+    return ColumnTransformer(
+        transformers=[
+            ('num', numerical_transformer, NUMERICAL_FEATURES + HISTORY_FEATURES if history else NUMERICAL_FEATURES),
+            ('cat', categorical_transformer, CATEGORICAL_FEATURES),
+            ('bool', boolean_transformer, BOOLEAN_FEATURES)
+        ])
+
+
+def build_pipeline(preprocessing=None, forest=None):
+    """پایپ‌لاین کامل پیش‌پردازش و جنگل تصادفی"""
+    preprocessing = {**DEFAULT_PREPROCESSING, **(preprocessing or {})}
+    forest = {**DEFAULT_FOREST, **(forest or {})}
+    return Pipeline(steps=[('preprocessor', build_preprocessor(**preprocessing)),
+                           ('classifier', RandomForestClassifier(random_state=42, **forest))])
+
+
+def uses_history(pipeline):
+    """آیا پایپ‌لاین با ستون‌های سابقه بوستر (HISTORY_FEATURES) آموزش دیده است"""
+    columns = getattr(pipeline, 'feature_names_in_', ())
+    return any(col in columns for col in HISTORY_FEATURES)
+
+
+def training_columns(preprocessing=None):
+    """ستون‌های ورودی مدل برای پارامترهای پیش‌پردازش داده‌شده"""
+    return FEATURES + HISTORY_FEATURES if (preprocessing or {}).get('history') else FEATURES
+
+
+def save_pipeline(model, model_dir, data_path=None, history=None):
+    """ذخیره پایپ‌لاین به صورت pickle و نسخه قابل نگاشت؛ خروجی مسیر فایل pickle
+
+    با data_path شاخص پرتاب‌های مشابه همان داده هم کنار مدل ذخیره می‌شود. اگر مدل ویژگی‌های
+    سابقه بوستر داشته باشد، فهرست سابقه (history یا ساخته‌شده از data_path) هم ذخیره می‌شود.
+    """
+    model_filename = os.path.join(model_dir, MODEL_FILENAME)
+    with open(model_filename, 'wb') as file:
+        pickle.dump(model, file)
     
-    def get_landing_outcome(outcome):
-        if outcome is np.nan:
-            return 0
-        elif outcome.startswith('True'):
-            return 1
-        else:
-            return 0
+    print(f"مدل با موفقیت در مسیر '{model_filename}' ذخیره شد.")
     
-    df['Success'] = df['Outcome'].apply(get_landing_outcome)
+    # ذخیره نسخه قابل نگاشت در حافظه برای بارگذاری سریع و اشتراکی
+    artifact_filename = os.path.join(model_dir, ARTIFACT_FILENAME)
+    save_artifact(CompiledPipeline.from_pipeline(model), artifact_filename,
+                  sklearn_version=sklearn.__version__)
+    print(f"نسخه قابل نگاشت مدل در مسیر '{artifact_filename}' ذخیره شد.")
     
-    # تبدیل تاریخ
-    df['Date'] = pd.to_datetime(df['Date'])
-    df['Year'] = df['Date'].dt.year
-    df['Month'] = df['Date'].dt.month
+    if data_path is not None:
+        save_index(data_path, model_dir)
+    if uses_history(model) and (history is not None or data_path is not None):
+        save_history(model_dir, data_path, history)
     
-    # پر کردن مقادیر گمشده
-    df['PayloadMass'].fillna(df['PayloadMass'].median(), inplace=True)
+    # اگر برای این پوشه فهرست منابع ساخته شده باشد، هش‌های آن با مدل تازه به‌روز می‌شوند
+    resource_root = os.path.dirname(os.path.abspath(model_dir))
+    if os.path.exists(os.path.join(resource_root, RESOURCE_MANIFEST_FILENAME)):
+        write_manifest(resource_root)
+    return model_filename
+
+
+def file_fingerprint(path, length=None):
+    """هش SHA-256 فایل (یا فقط length بایت ابتدای آن)"""
+    digest = hashlib.sha256()
+    remaining = os.path.getsize(path) if length is None else length
+    with open(path, 'rb') as f:
+        while remaining > 0:
+            chunk = f.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(model_dir):
+    """خواندن فهرست آموزش (کدام داده کدام مدل را ساخته است)؛ در صورت نبود None"""
+    path = os.path.join(model_dir, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def record_training(model_dir, data_path, model_path, rows, mode, seconds, manifest=None):
+    """ثبت اثر انگشت داده پردازش‌شده و مدل حاصل در فهرست آموزش
+
+    rows دیکشنری سطرهای آموزش و آزمون پردازش‌شده است که برای به‌روزرسانی بعدی ذخیره می‌شود.
+    اگر manifest داده نشود، ورودی تازه به فهرست موجود در model_dir افزوده می‌شود تا تاریخچه
+    آموزش‌های قبلی (از جمله آموزش کامل جایگزین به‌روزرسانی افزایشی) از دست نرود.
+    """
+    with open(os.path.join(model_dir, ROWS_FILENAME), 'wb') as f:
+        pickle.dump(rows, f)
+
+    size = os.path.getsize(data_path)
+    with open(data_path, 'rb') as f:
+        f.seek(max(0, size - 1))
+        ends_with_newline = f.read(1) in (b'\n', b'\r')
+    with open(model_path, 'rb') as f:
+        model_bytes = f.read()
+        classifier = pickle.loads(model_bytes).named_steps['classifier']
+
+    manifest = manifest or load_manifest(model_dir) or {'version': MANIFEST_VERSION, 'history': []}
+    manifest['data'] = {
+        'path': os.path.basename(data_path),
+        'bytes': size,
+        'rows': len(rows['y_train']) + len(rows['y_test']),
+        'sha256': file_fingerprint(data_path),
+        'ends_with_newline': ends_with_newline,
+    }
+    manifest['history'].append({
+        'data_sha256': manifest['data']['sha256'],
+        'rows': manifest['data']['rows'],
+        'model_sha256': hashlib.sha256(model_bytes).hexdigest(),
+        'n_estimators': len(classifier.estimators_),
+        'mode': mode,
+        'seconds': round(seconds, 3),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    })
+
+    path = os.path.join(model_dir, MANIFEST_FILENAME)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+    return manifest
+
+
+def _unknown_categories(pipeline, X):
+    """مقادیر دسته‌ای تازه‌ای که رمزگذار one-hot مدل فعلی نمی‌شناسد"""
+    encoder = pipeline.named_steps['preprocessor'].named_transformers_['cat'].named_steps['onehot']
+    unknown = []
+    for col, known in zip(CATEGORICAL_FEATURES, encoder.categories_):
+        values = set(X[col].dropna()) - set(known)
+        unknown.extend(f"{col}={value}" for value in sorted(values))
+    return unknown
+
+
+def incremental_update(data_path, model_dir, new_trees=DEFAULT_NEW_TREES, max_trees=None):
+    """به‌روزرسانی مدل فقط با سطرهای تازه افزوده‌شده به انتهای فایل داده
+
+    خروجی 'unchanged' اگر داده تغییری نکرده باشد، 'updated' پس از به‌روزرسانی و None
+    اگر به‌روزرسانی افزایشی ممکن نباشد (نبود فهرست، ویرایش سطرهای قبلی، دسته تازه)
+    و آموزش کامل لازم باشد.
+
+    پیش‌پردازش برازش‌شده ثابت می‌ماند تا درخت‌های قبلی معتبر بمانند؛ new_trees درخت
+    تازه با warm_start روی همه سطرهای آموزش (قبلی و تازه) ساخته می‌شوند و اگر تعداد
+    درخت‌ها از max_trees بیشتر شود، قدیمی‌ترین درخت‌ها کنار گذاشته می‌شوند.
+    """
+    start = time.perf_counter()
+    manifest = load_manifest(model_dir)
+    model_path = os.path.join(model_dir, MODEL_FILENAME)
+    rows_path = os.path.join(model_dir, ROWS_FILENAME)
+    if manifest is None or not os.path.exists(model_path) or not os.path.exists(rows_path):
+        print("فهرست آموزش قبلی یافت نشد؛ آموزش کامل لازم است.")
+        return None
+
+    recorded = manifest['data']
+    with open(model_path, 'rb') as f:
+        model_bytes = f.read()
+    if hashlib.sha256(model_bytes).hexdigest() != manifest['history'][-1]['model_sha256']:
+        print("فایل مدل با فهرست آموزش مطابقت ندارد؛ آموزش کامل لازم است.")
+        return None
+
+    size = os.path.getsize(data_path)
+    if size == recorded['bytes'] and file_fingerprint(data_path) == recorded['sha256']:
+        print(f"داده تغییری نکرده است ({recorded['rows']} سطر)؛ آموزش لازم نیست.")
+        return 'unchanged'
+    if size < recorded['bytes'] or file_fingerprint(data_path, recorded['bytes']) != recorded['sha256']:
+        print("سطرهای قبلی فایل داده تغییر کرده‌اند؛ آموزش کامل لازم است.")
+        return None
+
+    # فقط بایت‌های افزوده‌شده پس از محدوده پردازش‌شده خوانده می‌شوند
+    with open(data_path, 'rb') as f:
+        header_line = f.readline()
+        f.seek(recorded['bytes'])
+        tail = f.read()
+    if not recorded['ends_with_newline'] and tail[:1] not in (b'\n', b'\r'):
+        print("سطر آخر داده قبلی ادامه یافته است؛ آموزش کامل لازم است.")
+        return None
+
+    with open(rows_path, 'rb') as f:
+        rows = pickle.load(f)
+    pipeline = pickle.loads(model_bytes)
+    history = None
+    if uses_history(pipeline):
+        # سطرهای تازه فقط به فهرست سابقه ذخیره‌شده افزوده می‌شوند (O(1) برای هر پرتاب)
+        try:
+            history = BoosterHistory.load(os.path.join(model_dir, HISTORY_FILENAME))
+        except (OSError, ValueError, KeyError):
+            print("فهرست سابقه بوسترها یافت نشد؛ آموزش کامل لازم است.")
+            return None
+    new_X, new_y = prepare_frame(pd.read_csv(io.BytesIO(header_line + tail)),
+                                 payload_fill=rows['payload_fill'], history=history)
+    new_X = new_X[list(rows['X_train'].columns)]
+    if len(new_y) == 0:
+        print("سطر تازه‌ای اضافه نشده است؛ آموزش لازم نیست.")
+        record_training(model_dir, data_path, model_path, rows, 'unchanged',
+                        time.perf_counter() - start, manifest)
+        return 'unchanged'
+
+    unknown = _unknown_categories(pipeline, new_X)
+    if unknown:
+        print(f"مقادیر دسته‌ای تازه ({', '.join(unknown)})؛ آموزش کامل لازم است.")
+        return None
+
+    rows['X_train'] = pd.concat([rows['X_train'], new_X], ignore_index=True)
+    rows['y_train'] = pd.concat([rows['y_train'], new_y], ignore_index=True)
+    features = pipeline.named_steps['preprocessor'].transform(rows['X_train'])
+
+    classifier = pipeline.named_steps['classifier']
+    n_before = len(classifier.estimators_)
+    # بذر تصادفی درخت‌های تازه از اثر انگشت داده گرفته می‌شود تا با درخت‌های قبلی تکراری نباشد
+    classifier.set_params(warm_start=True, n_estimators=n_before + new_trees,
+                          random_state=int(file_fingerprint(data_path)[:8], 16))
+    classifier.fit(features, rows['y_train'].to_numpy())
+    retired = 0
+    if max_trees and len(classifier.estimators_) > max_trees:
+        retired = len(classifier.estimators_) - max_trees
+        classifier.estimators_ = classifier.estimators_[retired:]
+    classifier.set_params(warm_start=False, n_estimators=len(classifier.estimators_))
+
+    print(f"{len(new_y)} سطر تازه؛ {new_trees} درخت افزوده و {retired} درخت قدیمی کنار گذاشته شد "
+          f"({len(classifier.estimators_)} درخت).")
+    print(f"دقت روی داده آزمون: {pipeline.score(rows['X_test'], rows['y_test']):.3f}")
+    model_path = save_pipeline(pipeline, model_dir, data_path, history)
+    record_training(model_dir, data_path, model_path, rows, 'incremental',
+                    time.perf_counter() - start, manifest)
+    print(f"به‌روزرسانی افزایشی در {time.perf_counter() - start:.2f} ثانیه انجام شد.")
+    return 'updated'
+
+
+def publish_model(model_dir, registry_root=None):
+    """انتشار و فعال‌سازی فایل‌های مدل پوشه در فهرست نسخه‌های مدل؛ خروجی شناسه نسخه"""
+    try:
+        from .model_registry import ModelRegistry
+    except ImportError:
+        from model_registry import ModelRegistry
+    version = ModelRegistry(registry_root).publish(model_dir)
+    print(f"مدل به عنوان نسخه {version} منتشر و فعال شد.")
+    return version
+
+
+def finish_model(model_dir, compact=None, publish=False, registry_root=None):
+    """مراحل پس از ذخیره مدل تازه (آموزش کامل یا افزایشی): فشرده‌سازی و سپس انتشار"""
+    if compact is not None:
+        print("فشرده‌سازی مدل...")
+        try:
+            from .compact_model import compact_saved_model
+        except ImportError:
+            from compact_model import compact_saved_model
+        compact_saved_model(model_dir, compact, install=True)
+    if publish:
+        publish_model(model_dir, registry_root)
+
+
+def _grid(grid):
+    """همه ترکیب‌های یک فضای جستجو به صورت فهرستی از دیکشنری‌ها"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def _param_key(params):
+    return tuple(sorted(params.items(), key=lambda item: item[0]))
+
+
+def _transform_folds(X, y, folds, preprocessing_options):
+    """خروجی ColumnTransformer برای هر fold و هر حالت پیش‌پردازش فقط یک بار محاسبه می‌شود
+
+    خروجی: {کلید پیش‌پردازش: [(X_train، y_train، X_valid، y_valid) برای هر fold]}
+    """
+    cache = {}
+    for preprocessing in preprocessing_options:
+        fold_data = []
+        for train_index, valid_index in folds:
+            preprocessor = build_preprocessor(**preprocessing)
+            X_fit = preprocessor.fit_transform(X.iloc[train_index])
+            X_valid = preprocessor.transform(X.iloc[valid_index])
+            fold_data.append((X_fit, y.iloc[train_index].to_numpy(),
+                              X_valid, y.iloc[valid_index].to_numpy()))
+        cache[_param_key(preprocessing)] = fold_data
+    return cache
+
+
+def _fit_fold(forest, n_estimators, fold):
+    """آموزش جنگل روی یک fold از پیش تبدیل‌شده؛ خروجی (دقت، زمان)"""
+    X_fit, y_fit, X_valid, y_valid = fold
+    start = time.perf_counter()
+    classifier = RandomForestClassifier(random_state=42, n_jobs=1,
+                                        **{**forest, 'n_estimators': n_estimators})
+    classifier.fit(X_fit, y_fit)
+    score = float((classifier.predict(X_valid) == y_valid).mean())
+    return score, time.perf_counter() - start
+
+
+def tune(X, y, cv=5, n_jobs=-1, min_trees=25, max_trees=400, factor=3, history=False):
+    """جستجوی پارامترها با اعتبارسنجی متقاطع و حذف متوالی (successive halving)
+
+    در هر مرحله همه نامزدهای باقی‌مانده با بودجه فعلی (تعداد درخت) ارزیابی می‌شوند،
+    فقط بهترین 1/factor آن‌ها به مرحله بعد می‌روند و بودجه factor برابر می‌شود.
+    خروجی فهرست نتایج آخرین ارزیابی هر نامزد، مرتب از بهترین. با history مدل‌های با و
+    بدون ستون‌های سابقه بوستر (که باید در X باشند) هر دو جزو نامزدها هستند.
+    """
+    from joblib import Parallel, delayed
+
+    grid = {**PREPROCESSING_GRID, 'history': [False, True]} if history else PREPROCESSING_GRID
+    preprocessing_options = _grid(grid)
+    candidates = [{'preprocessing': p, 'forest': f}
+                  for p in preprocessing_options for f in _grid(FOREST_GRID)]
+    folds = list(StratifiedKFold(n_splits=cv, shuffle=True, random_state=42).split(X, y))
+
+    start = time.perf_counter()
+    fold_cache = _transform_folds(X, y, folds, preprocessing_options)
+    print(f"پیش‌پردازش {len(preprocessing_options)} حالت × {cv} fold در "
+          f"{time.perf_counter() - start:.2f} ثانیه (یک بار برای همه نامزدها)")
+
+    results = {}
+    remaining = list(range(len(candidates)))
+    n_estimators = min_trees
+    with Parallel(n_jobs=n_jobs) as parallel:
+        while True:
+            print(f"مرحله با {n_estimators} درخت: {len(remaining)} نامزد")
+            tasks = [(index, fold)
+                     for index in remaining
+                     for fold in fold_cache[_param_key(candidates[index]['preprocessing'])]]
+            outputs = parallel(delayed(_fit_fold)(candidates[index]['forest'], n_estimators, fold)
+                               for index, fold in tasks)
+
+            scores = {index: [] for index in remaining}
+            seconds = {index: 0.0 for index in remaining}
+            for (index, _), (score, elapsed) in zip(tasks, outputs):
+                scores[index].append(score)
+                seconds[index] += elapsed
+            for index in remaining:
+                previous = results.get(index, {}).get('seconds', 0.0)
+                results[index] = {
+                    **candidates[index],
+                    'n_estimators': n_estimators,
+                    'mean_score': float(np.mean(scores[index])),
+                    'std_score': float(np.std(scores[index])),
+                    'seconds': previous + seconds[index],
+                }
+
+            if len(remaining) <= 1 or n_estimators >= max_trees:
+                break
+            remaining.sort(key=lambda index: -results[index]['mean_score'])
+            remaining = remaining[:max(1, len(remaining) // factor)]
+            n_estimators = min(max_trees, n_estimators * factor)
+
+    # نامزدهای حذف‌نشده (با بیشترین بودجه) جلوتر از حذف‌شده‌ها قرار می‌گیرند
+    return sorted(results.values(),
+                  key=lambda r: (-r['n_estimators'], -r['mean_score'], r['seconds']))
+
+
+def print_leaderboard(results, limit=15):
+    """چاپ جدول نتایج جستجو به همراه زمان اجرای هر نامزد"""
+    print(f"{'رتبه':>4} {'دقت':>7} {'±':>6} {'درخت':>5} {'زمان(ث)':>8}  پارامترها")
+    for rank, result in enumerate(results[:limit], 1):
+        params = {**result['preprocessing'], **result['forest']}
+        params_text = ', '.join(f"{name}={value}" for name, value in params.items())
+        print(f"{rank:>4} {result['mean_score']:>7.3f} {result['std_score']:>6.3f} "
+              f"{result['n_estimators']:>5} {result['seconds']:>8.2f}  {params_text}")
+    if len(results) > limit:
+        print(f"... و {len(results) - limit} نامزد دیگر")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="آموزش و ذخیره مدل پیش‌بینی فرود فالکون ۹")
+    parser.add_argument('--tune', action='store_true',
+                        help="جستجوی پارامترها با اعتبارسنجی متقاطع پیش از آموزش نهایی")
+    parser.add_argument('--cv', type=int, default=5, help="تعداد foldهای اعتبارسنجی")
+    parser.add_argument('--jobs', type=int, default=-1, help="تعداد فرآیندهای موازی (-1 یعنی همه هسته‌ها)")
+    parser.add_argument('--min-trees', type=int, default=25, help="بودجه اولیه تعداد درخت‌ها")
+    parser.add_argument('--max-trees', type=int, default=400, help="بیشینه تعداد درخت‌ها")
+    parser.add_argument('--factor', type=int, default=3, help="ضریب حذف در هر مرحله")
+    parser.add_argument('--incremental', action='store_true',
+                        help="به‌روزرسانی افزایشی مدل فقط با سطرهای تازه فایل داده")
+    parser.add_argument('--new-trees', type=int, default=DEFAULT_NEW_TREES,
+                        help="تعداد درخت‌های تازه در به‌روزرسانی افزایشی")
+    parser.add_argument('--keep-trees', type=int, default=None,
+                        help="بیشینه تعداد درخت‌ها؛ قدیمی‌ترین درخت‌های اضافه کنار گذاشته می‌شوند")
+    parser.add_argument('--compact', type=float, default=None, metavar='TOLERANCE',
+                        help="فشرده‌سازی فایل .f9m با بیشینه اختلاف داده‌شده (واحد درصد)")
+    parser.add_argument('--publish', action='store_true',
+                        help="انتشار و فعال‌سازی مدل در فهرست نسخه‌های مدل")
+    parser.add_argument('--booster-history', action='store_true',
+                        help="افزودن ویژگی‌های سابقه بوستر و سکو به مدل")
+    parser.add_argument('--registry', default=None, help="پوشه فهرست مدل‌ها (پیش‌فرض models/registry)")
+    parser.add_argument('--data', default=None, help="مسیر فایل داده (پیش‌فرض data/data_falcon9.csv)")
+    parser.add_argument('--model-dir', default=None, help="پوشه خروجی مدل (پیش‌فرض models)")
+    args = parser.parse_args(argv)
+
+    # مسیر فایل‌ها
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    base_dir = os.path.dirname(script_dir)
+    data_path = args.data or os.path.join(base_dir, 'data', 'data_falcon9.csv')
+    model_dir = args.model_dir or os.path.join(base_dir, 'models')
+    os.makedirs(model_dir, exist_ok=True)
+    start_time = time.perf_counter()
     
-    # تبدیل ستون‌های بولین به عددی
-    boolean_columns = ['GridFins', 'Reused', 'Legs']
-    for col in boolean_columns:
-        df[col] = df[col].astype(int)
+    if args.incremental:
+        print("به‌روزرسانی افزایشی مدل...")
+        status = incremental_update(data_path, model_dir, args.new_trees, args.keep_trees)
+        if status is not None:
+            if status == 'updated':
+                finish_model(model_dir, args.compact, args.publish, args.registry)
+            return os.path.join(model_dir, MODEL_FILENAME)
+        # آموزش کامل جایگزین، ویژگی‌های سابقه مدل قبلی را حفظ می‌کند
+        model_path = os.path.join(model_dir, MODEL_FILENAME)
+        if not args.booster_history and os.path.exists(model_path):
+            with open(model_path, 'rb') as f:
+                args.booster_history = uses_history(pickle.load(f))
     
-    # انتخاب ویژگی‌ها
-    print("آماده‌سازی ویژگی‌ها...")
-    features = ['PayloadMass', 'Orbit', 'LaunchSite', 'GridFins', 'Reused', 'Legs', 'Block', 'ReusedCount', 'Year', 'Month']
-    X = df[features]
-    y = df['Success']
+    # بارگذاری داده‌ها
+    print("بارگذاری داده‌ها...")
+    print("پردازش داده‌ها...")
+    X, y = load_training_data(data_path, history=args.booster_history)
     
     # تقسیم داده‌ها به آموزش و آزمون
+    print("آماده‌سازی ویژگی‌ها...")
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
     
-    # تعریف پایپ‌لاین پیش‌پردازش
-    print("ایجاد مدل...")
-    numerical_features = ['PayloadMass', 'Block', 'ReusedCount', 'Year', 'Month']
-    categorical_features = ['Orbit', 'LaunchSite']
-    boolean_features = ['GridFins', 'Reused', 'Legs']
-    
-    numerical_transformer = Pipeline(steps=[
-        ('imputer', SimpleImputer(strategy='median')),
-        ('scaler', StandardScaler())
-    ])
-    
-    categorical_transformer = Pipeline(steps=[
-        ('imputer', SimpleImputer(strategy='most_frequent')),
-        ('onehot', OneHotEncoder(handle_unknown='ignore'))
-    ])
+    preprocessing = {'history': True} if args.booster_history else None
+    forest = None
+    if args.tune:
+        print("جستجوی پارامترها...")
+        start = time.perf_counter()
+        results = tune(X_train, y_train, cv=args.cv, n_jobs=args.jobs, min_trees=args.min_trees,
+                       max_trees=args.max_trees, factor=args.factor, history=args.booster_history)
+        print_leaderboard(results)
+        print(f"جستجو در {time.perf_counter() - start:.1f} ثانیه انجام شد.")
+        best = results[0]
+        preprocessing = best['preprocessing']
+        forest = {**best['forest'], 'n_estimators': best['n_estimators']}
     
-    boolean_transformer = Pipeline(steps=[
-        ('imputer', SimpleImputer(strategy='most_frequent'))
-    ])
-    
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ('num', numerical_transformer, numerical_features),
-            ('cat', categorical_transformer, categorical_features),
-            ('bool', boolean_transformer, boolean_features)
-        ])
+    # مدل فقط ستون‌هایی را می‌گیرد که پیش‌پردازش انتخاب‌شده استفاده می‌کند
+    columns = training_columns(preprocessing)
+    X_train, X_test = X_train[columns], X_test[columns]
     
     # تعریف مدل
-    model = Pipeline(steps=[('preprocessor', preprocessor),
-                          ('classifier', RandomForestClassifier(n_estimators=100, random_state=42))])
+    print("ایجاد مدل...")
+    model = build_pipeline(preprocessing, forest)
     
     # آموزش مدل
     print("آموزش مدل...")
     model.fit(X_train, y_train)
+    print(f"دقت روی داده آزمون: {model.score(X_test, y_test):.3f}")
     
     # ذخیره مدل
     print("ذخیره مدل...")
-    model_filename = os.path.join(model_dir, 'falcon9_landing_model.pkl')
-    with open(model_filename, 'wb') as file:
-        pickle.dump(model, file)
+    model_path = save_pipeline(model, model_dir, data_path)
     
-    print(f"مدل با موفقیت در مسیر '{model_filename}' ذخیره شد.")
+    # ثبت داده پردازش‌شده برای به‌روزرسانی‌های افزایشی بعدی
+    rows = {'X_train': X_train, 'y_train': y_train, 'X_test': X_test, 'y_test': y_test,
+            'payload_fill': X['PayloadMass'].median()}
+    record_training(model_dir, data_path, model_path, rows, 'tune' if args.tune else 'full',
+                    time.perf_counter() - start_time)
     
-    return model_filename
+    finish_model(model_dir, args.compact, args.publish, args.registry)
+    return model_path
 
 if __name__ == "__main__":
     model_path = main()
     print(f"مسیر فایل مدل: {model_path}")
-    print("اکنون می‌توانید اپلیکیشن ویندوزی را با دستور 'python src/falcon9_app.py' اجرا کنید.") 
\ No newline at end of file
+    print("اکنون می‌توانید اپلیکیشن ویندوزی را با دستور 'python src/falcon9_app.py' اجرا کنید.")
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+سرور HTTP محلی برای پیش‌بینی با تجمیع درخواست‌ها در دسته‌های کوچک
+
+درخواست‌های هم‌زمانی که در یک پنجره زمانی کوتاه (مثلاً ۲ میلی‌ثانیه یا ۶۴ مورد) می‌رسند
+در یک فراخوانی predict_batch تجمیع می‌شوند و هر فراخواننده نتیجه خودش را دریافت می‌کند.
+سرور فقط از کتابخانه استاندارد (asyncio) استفاده می‌کند.
+
+نمونه اجرا:
+    python -m src serve --port 8000 --window-ms 2 --max-batch 64
+
+مسیرها:
+    POST /predict   بدنه JSON: یک مشخصه پرتاب یا فهرستی از آن‌ها
+    GET  /metrics   تأخیر p50/p99 و هیستوگرام اندازه دسته‌ها
+    GET  /health    وضعیت سرور
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+from collections import Counter, deque
+
+try:
+    from .predictor import FEATURE_COLUMNS
+    from .model_registry import open_model
+    from .batch_score import BOOLEAN_COLUMNS, BOOLEAN_VALUES
+    from . import instrumentation
+except ImportError:
+    from predictor import FEATURE_COLUMNS
+    from model_registry import open_model
+    from batch_score import BOOLEAN_COLUMNS, BOOLEAN_VALUES
+    import instrumentation
+
+
+DEFAULT_WINDOW_MS = 2.0
+DEFAULT_MAX_BATCH = 64
+MAX_BODY_BYTES = 1024 * 1024
+LATENCY_SAMPLES = 10000
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class ServerMetrics:
+    """آمار تأخیر درخواست‌ها و اندازه دسته‌ها برای تنظیم پنجره تجمیع"""
+
+    def __init__(self, samples=LATENCY_SAMPLES):
+        self.latencies = deque(maxlen=samples)
+        self.batch_sizes = Counter()
+        self.requests = 0
+        self.batches = 0
+        self.rows = 0
+
+    def record_latency(self, seconds):
+        self.requests += 1
+        self.latencies.append(seconds)
+
+    def record_batch(self, size):
+        self.batches += 1
+        self.rows += size
+        # دسته‌ها در بازه‌های توان دو شمرده می‌شوند: 1، 2، 4، ...
+        bucket = 1
+        while bucket < size:
+            bucket *= 2
+        self.batch_sizes[bucket] += 1
+
+    @staticmethod
+    def _percentile(ordered, fraction):
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return ordered[index]
+
+    def snapshot(self):
+        ordered = sorted(self.latencies)
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch_size': self.rows / self.batches if self.batches else 0.0,
+            'latency_ms': {
+                'p50': self._percentile(ordered, 0.50) * 1000,
+                'p99': self._percentile(ordered, 0.99) * 1000,
+                'max': ordered[-1] * 1000 if ordered else 0.0,
+            },
+            'batch_size_histogram': {f"<={size}": count
+                                     for size, count in sorted(self.batch_sizes.items())},
+        }
+
+
+def _parse_flag(col, value):
+    """مقدار ستون بولی: true/false در JSON، عدد 0 یا 1 یا یکی از رشته‌های BOOLEAN_VALUES"""
+    if value is None:
+        return None
+    if isinstance(value, bool) or (isinstance(value, int) and value in (0, 1)):
+        return int(value)
+    if isinstance(value, str) and value in BOOLEAN_VALUES:
+        return BOOLEAN_VALUES[value]
+    raise ValueError(f"مقدار نامعتبر ستون {col}: {value!r}")
+
+
+def parse_spec(spec):
+    """بررسی و تبدیل یک مشخصه پرتاب JSON به تاپل به ترتیب FEATURE_COLUMNS"""
+    if not isinstance(spec, dict):
+        raise ValueError("هر مشخصه پرتاب باید یک شیء JSON باشد")
+    missing = [col for col in FEATURE_COLUMNS if col not in spec]
+    if missing:
+        raise ValueError(f"ستون‌های ورودی ناقص هستند: {', '.join(missing)}")
+
+    values = []
+    for col in FEATURE_COLUMNS:
+        value = spec[col]
+        if col in ('Orbit', 'LaunchSite'):
+            values.append(None if value is None else str(value))
+        elif col in BOOLEAN_COLUMNS:
+            values.append(_parse_flag(col, value))
+        else:
+            values.append(float('nan') if value is None else float(value))
+    return tuple(values)
+
+
+class MicroBatcher:
+    """تجمیع درخواست‌های هم‌زمان در یک فراخوانی predict_batch
+
+    دسته زمانی ارسال می‌شود که یا پنجره زمانی از رسیدن اولین درخواست بگذرد
+    یا تعداد درخواست‌های در انتظار به max_batch برسد.
+    """
+
+    def __init__(self, model, window_ms=DEFAULT_WINDOW_MS, max_batch=DEFAULT_MAX_BATCH, metrics=None):
+        self.model = model
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.metrics = metrics or ServerMetrics()
+        self._pending = []
+        self._timer = None
+
+    async def submit(self, values):
+        """افزودن یک سطر به دسته جاری و انتظار برای نتیجه همان سطر"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((values, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch):
+        rows = [values for values, _ in batch]
+        columns = {col: [row[i] for row in rows] for i, col in enumerate(FEATURE_COLUMNS)}
+        self.metrics.record_batch(len(rows))
+        try:
+            # پیش‌بینی در یک رشته جداگانه اجرا می‌شود تا حلقه رویداد درخواست‌ها را بپذیرد
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, self.model.predict_batch, columns)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for i, (_, future) in enumerate(batch):
+            if not future.done():
+                future.set_result({
+                    'prediction': int(result['prediction'][i]),
+                    'success': bool(result['success'][i]),
+                    'probability': float(result['probability'][i]),
+                })
+
+
+class PredictionServer:
+    """سرور HTTP/1.1 ساده مبتنی بر asyncio"""
+
+    def __init__(self, model, host='127.0.0.1', port=8000, window_ms=DEFAULT_WINDOW_MS,
+                 max_batch=DEFAULT_MAX_BATCH):
+        self.model = model
+        self.host = host
+        self.port = port
+        self.metrics = ServerMetrics()
+        self.batcher = MicroBatcher(model, window_ms, max_batch, self.metrics)
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # در صورت انتخاب پورت 0، پورت واقعی ثبت می‌شود
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                status, payload = await self._dispatch(method, path, body)
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader):
+        """خواندن یک درخواست HTTP؛ در صورت بسته شدن اتصال None"""
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, path, version = request_line.decode('latin-1').split()
+        except ValueError:
+            return 'INVALID', '', b'', False
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        # طول نامعتبر یا منفی پاسخ 400 می‌گیرد و اتصال پس از پاسخ بسته می‌شود
+        try:
+            length = int(headers.get('content-length', '').strip() or 0)
+        except ValueError:
+            return 'INVALID', path, b'', False
+        if length < 0:
+            return 'INVALID', path, b'', False
+        if length > MAX_BODY_BYTES:
+            return 'TOO_LARGE', path, b'', False
+        body = await reader.readexactly(length) if length else b''
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+        return method, path, body, keep_alive
+
+    async def _dispatch(self, method, path, body):
+        if method == 'INVALID':
+            return 400, {'error': "درخواست نامعتبر"}
+        if method == 'TOO_LARGE':
+            return 413, {'error': "بدنه درخواست بیش از حد بزرگ است"}
+
+        if path == '/health':
+            return 200, {'status': 'ok', 'model_loaded': self.model.is_loaded,
+                         'model_version': getattr(self.model, 'version', None)}
+        if path == '/metrics':
+            snapshot = self.metrics.snapshot()
+            if instrumentation.enabled():
+                snapshot['instrumentation'] = instrumentation.snapshot()
+            return 200, snapshot
+        if path != '/predict':
+            return 404, {'error': "مسیر یافت نشد"}
+        if method != 'POST':
+            return 405, {'error': "فقط POST پشتیبانی می‌شود"}
+        if not self.model.is_loaded:
+            return 503, {'error': "مدل بارگذاری نشده است"}
+
+        start_time = time.perf_counter()
+        try:
+            document = json.loads(body.decode('utf-8'))
+            specs = document if isinstance(document, list) else [document]
+            rows = [parse_spec(spec) for spec in specs]
+        except (ValueError, TypeError) as e:
+            return 400, {'error': str(e)}
+
+        try:
+            results = await asyncio.gather(*(self.batcher.submit(row) for row in rows))
+        except Exception as e:
+            return 500, {'error': f"خطا در پیش‌بینی: {e}"}
+
+        self.metrics.record_latency(time.perf_counter() - start_time)
+        return 200, results if isinstance(document, list) else results[0]
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                   f"Content-Type: application/json; charset=utf-8\r\n"
+                   f"Content-Length: {len(body)}\r\n"
+                   f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(headers.encode('latin-1') + body)
+
+
+def main(argv=None):
+    """اجرای سرور پیش‌بینی از خط فرمان"""
+    parser = argparse.ArgumentParser(prog='falcon9-predictor serve',
+                                     description="سرور HTTP محلی پیش‌بینی با تجمیع درخواست‌ها")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--window-ms', type=float, default=DEFAULT_WINDOW_MS,
+                        help="پنجره زمانی تجمیع درخواست‌ها (میلی‌ثانیه)")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH,
+                        help="بیشینه تعداد درخواست در هر دسته")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="تعداد فرآیندهای کارگر پیش‌بینی (بیش از ۱ برای استفاده از چند هسته)")
+    args = parser.parse_args(argv)
+
+    # با نسخه فعال در فهرست مدل‌ها، مدل با تغییر اشاره‌گر بدون توقف سرور جایگزین می‌شود
+    model = open_model(compiled=True, prefer_artifact=True)
+    if not model.is_loaded:
+        print("مدل بارگذاری نشد؛ سرور اجرا نمی‌شود.", file=sys.stderr)
+        return 1
+
+    pool = None
+    if args.workers > 1:
+        try:
+            from .worker_pool import PredictionWorkerPool
+        except ImportError:
+            from worker_pool import PredictionWorkerPool
+        # دسته‌های هم‌زمان بین کارگرهایی که مدل والد را به اشتراک دارند پخش می‌شوند
+        pool = PredictionWorkerPool(args.workers, model=model)
+
+    server = PredictionServer(pool or model, args.host, args.port, args.window_ms, args.max_batch)
+
+    async def run():
+        await server.start()
+        print(f"سرور پیش‌بینی روی http://{server.host}:{server.port} در حال اجراست "
+              f"(پنجره {args.window_ms} میلی‌ثانیه، حداکثر {args.max_batch} مورد).")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("سرور متوقف شد.")
+    finally:
+        if pool is not None:
+            pool.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
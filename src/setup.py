@@ -4,15 +4,28 @@
 """
 اسکریپت برای ساخت فایل اجرایی (exe) از برنامه پیش‌بینی فرود فالکون ۹
 با استفاده از PyInstaller به جای cx_Freeze
+
+با گزینه --slim فقط نسخه NumPy مدل (.f9m) بسته‌بندی و pandas، scikit-learn و SciPy
+کنار گذاشته می‌شوند (slim_bundle.py)؛ پیش از ساخت، برابری پیش‌بینی‌ها با مدل pickle شده
+بررسی و حجم بسته‌ها و زمان شروع سرد دو حالت گزارش می‌شود:
+    python src/setup.py --slim
 """
 
 import sys
 import os
 import shutil
+import argparse
 import subprocess
 import time
 from pathlib import Path
 
+try:
+    from .resources import write_manifest, MANIFEST_FILENAME
+    from .slim_bundle import export, report, print_report, EXCLUDED_PACKAGES
+except ImportError:
+    from resources import write_manifest, MANIFEST_FILENAME
+    from slim_bundle import export, report, print_report, EXCLUDED_PACKAGES
+
 # مسیر پایه
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -36,8 +49,8 @@ def clean_build_folders():
         shutil.rmtree(dist_dir)
         print(f"پوشه {dist_dir} پاک شد")
 
-def prepare_resources():
-    """آماده‌سازی منابع برای بسته‌بندی"""
+def prepare_resources(slim=False):
+    """آماده‌سازی منابع برای بسته‌بندی؛ با slim فقط فایل .f9m مدل کپی می‌شود"""
     root_dir = get_project_root()
     models_dir = root_dir / 'models'
     assets_dir = root_dir / 'assets'
@@ -55,26 +68,53 @@ def prepare_resources():
     
     # کپی فایل مدل
     model_file = models_dir / 'falcon9_landing_model.pkl'
-    if model_file.exists():
+    if model_file.exists() and slim:
+        artifact_path = export(str(models_dir), str(temp_models_dir))
+        print(f"نسخه NumPy مدل از {model_file} در {artifact_path} ساخته شد")
+    elif model_file.exists():
         shutil.copy(model_file, temp_models_dir)
         print(f"فایل مدل از {model_file} به {temp_models_dir} کپی شد")
     else:
         print(f"خطا: فایل مدل در {model_file} پیدا نشد")
         sys.exit(1)
     
+    # کپی نسخه قابل نگاشت مدل (در صورت وجود) برای بارگذاری سریع
+    artifact_file = models_dir / 'falcon9_landing_model.f9m'
+    if artifact_file.exists() and not slim:
+        shutil.copy(artifact_file, temp_models_dir)
+        print(f"فایل مدل قابل نگاشت از {artifact_file} به {temp_models_dir} کپی شد")
+    
+    # کپی شاخص پرتاب‌های مشابه (در حالت slim بدون sklearn با جستجوی کامل NumPy خوانده می‌شود)
+    similar_index_file = models_dir / 'falcon9_similar_launches.pkl'
+    if similar_index_file.exists():
+        shutil.copy(similar_index_file, temp_models_dir)
+        print(f"شاخص پرتاب‌های مشابه از {similar_index_file} به {temp_models_dir} کپی شد")
+    
+    # کپی فهرست سابقه بوسترها (برای مدل‌های آموزش‌دیده با --booster-history)
+    history_file = models_dir / 'falcon9_booster_history.pkl'
+    if history_file.exists():
+        shutil.copy(history_file, temp_models_dir)
+        print(f"فهرست سابقه بوسترها از {history_file} به {temp_models_dir} کپی شد")
+    
     # کپی آیکون و فایل‌های گرافیکی
     if assets_dir.exists():
         for file in assets_dir.glob('*'):
             shutil.copy(file, temp_assets_dir)
             print(f"فایل {file} به {temp_assets_dir} کپی شد")
     
+    # فهرست منابع با اندازه و هش هر فایل تا برنامه بدون جستجو مسیرها را بداند
+    manifest_path = write_manifest(str(temp_dir))
+    print(f"فهرست منابع در {manifest_path} ساخته شد")
+    
     return temp_dir
 
-def create_spec_file(temp_dir):
+def create_spec_file(temp_dir, slim=False):
     """ایجاد فایل spec برای PyInstaller"""
     root_dir = get_project_root()
     app_path = root_dir / 'src' / 'falcon9_app.py'
-    spec_path = root_dir / 'Falcon9Predictor.spec'
+    name = get_app_name(slim)
+    spec_path = root_dir / f'{name}.spec'
+    excludes = list(EXCLUDED_PACKAGES) if slim else []
     
     spec_content = f"""# -*- mode: python ; coding: utf-8 -*-
 
@@ -87,12 +127,13 @@ a = Analysis(
     datas=[
         ('{temp_dir.as_posix()}/models/*', 'models'),
         ('{temp_dir.as_posix()}/assets/*', 'assets'),
+        ('{temp_dir.as_posix()}/{MANIFEST_FILENAME}', '.'),
     ],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={{}},
     runtime_hooks=[],
-    excludes=[],
+    excludes={excludes!r},
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -106,7 +147,7 @@ exe = EXE(
     a.scripts,
     [],
     exclude_binaries=True,
-    name='Falcon9Predictor',
+    name='{name}',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
@@ -128,7 +169,7 @@ coll = COLLECT(
     strip=False,
     upx=True,
     upx_exclude=[],
-    name='Falcon9Predictor',
+    name='{name}',
 )
 """
     
@@ -138,8 +179,12 @@ coll = COLLECT(
     print(f"فایل spec در {spec_path} ایجاد شد")
     return spec_path
 
-def run_pyinstaller(spec_path):
-    """اجرای PyInstaller برای ساخت فایل اجرایی"""
+def get_app_name(slim=False):
+    """نام فایل اجرایی و پوشه خروجی"""
+    return 'Falcon9PredictorSlim' if slim else 'Falcon9Predictor'
+
+def run_pyinstaller(spec_path, slim=False):
+    """اجرای PyInstaller برای ساخت فایل اجرایی؛ خروجی پوشه ساخته‌شده"""
     print("در حال ساخت فایل اجرایی با PyInstaller...")
     
     try:
@@ -148,12 +193,14 @@ def run_pyinstaller(spec_path):
         
         # نمایش مسیر فایل اجرایی
         root_dir = get_project_root()
-        exe_path = root_dir / 'dist' / 'Falcon9Predictor' / 'Falcon9Predictor.exe'
+        name = get_app_name(slim)
+        exe_path = root_dir / 'dist' / name / f'{name}.exe'
         
         if exe_path.exists():
             print(f"فایل اجرایی در {exe_path} ساخته شد")
         else:
             print("فایل اجرایی ساخته شد اما در مسیر مورد انتظار پیدا نشد")
+        return root_dir / 'dist' / name
             
     except subprocess.CalledProcessError as e:
         print(f"خطا در ساخت فایل اجرایی: {e}")
@@ -162,6 +209,10 @@ def run_pyinstaller(spec_path):
         print("خطا: PyInstaller نصب نشده است. لطفاً با دستور 'pip install pyinstaller' آن را نصب کنید")
         sys.exit(1)
 
+def get_folder_size(path):
+    """حجم کل فایل‌های یک پوشه به بایت"""
+    return sum(f.stat().st_size for f in Path(path).rglob('*') if f.is_file() and not f.is_symlink())
+
 def cleanup(temp_dir):
     """پاک‌سازی فایل‌های موقت"""
     if temp_dir.exists():
@@ -170,19 +221,35 @@ def cleanup(temp_dir):
 
 def main():
     """تابع اصلی ساخت فایل اجرایی"""
+    parser = argparse.ArgumentParser(description="ساخت فایل اجرایی پیش‌بینی‌کننده فرود فالکون ۹")
+    parser.add_argument('--slim', action='store_true',
+                        help="بسته سبک فقط با NumPy (بدون pandas، scikit-learn و SciPy)")
+    args = parser.parse_args()
+    
     print("شروع فرآیند ساخت فایل اجرایی برای پیش‌بینی‌کننده فرود فالکون ۹...")
     
+    if args.slim:
+        # پیش از ساخت، برابری پیش‌بینی‌های نسخه NumPy با مدل pickle شده بررسی می‌شود
+        root_dir = get_project_root()
+        try:
+            results = report(str(root_dir / 'models'), str(root_dir / 'data' / 'data_falcon9.csv'))
+        except (AssertionError, RuntimeError, OSError) as e:
+            print(f"خطا در بررسی بسته سبک: {e}")
+            sys.exit(1)
+        print_report(results)
+    
     # پاک کردن پوشه‌های ساخت قبلی
     clean_build_folders()
     
     # آماده‌سازی منابع
-    temp_dir = prepare_resources()
+    temp_dir = prepare_resources(args.slim)
     
     # ایجاد فایل spec
-    spec_path = create_spec_file(temp_dir)
+    spec_path = create_spec_file(temp_dir, args.slim)
     
     # اجرای PyInstaller
-    run_pyinstaller(spec_path)
+    dist_dir = run_pyinstaller(spec_path, args.slim)
+    print(f"حجم پوشه خروجی: {get_folder_size(dist_dir) / 2**20:.1f} مگابایت")
     
     # پاک‌سازی فایل‌های موقت
     cleanup(temp_dir)
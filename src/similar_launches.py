@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+جستجوی پرتاب‌های تاریخی مشابه با شاخص فضایی KD-tree
+
+هر پرتاب فایل داده به یک بردار نرمال‌شده تبدیل می‌شود: وزن محموله، تاریخ، بلوک و تعداد
+استفاده مجدد (با میانگین و انحراف معیار داده)، ستون‌های بولین، مدار (one-hot) و موقعیت
+جغرافیایی سکوی پرتاب (مختصات سه‌بعدی روی کره زمین از Longitude و Latitude). شاخص
+KDTree روی این بردارها k پرتاب نزدیک را برای یک سطر در کسری از میلی‌ثانیه و برای
+دسته‌ها به صورت برداری برمی‌گرداند. تا TREE_MIN_POINTS پرتاب (داده واقعی حدود ۹۰ پرتاب
+دارد) جستجوی کامل برداری NumPy از پیمایش درخت سریع‌تر است و درختی ساخته نمی‌شود.
+
+save_model.py شاخص را کنار فایل مدل ذخیره می‌کند تا برنامه در هر اجرا آن را دوباره
+نسازد. فایل آرایه‌های NumPy و درخت سریال‌شده sklearn را دارد؛ خواندن شاخص بدون درخت به
+sklearn نیاز ندارد و اگر sklearn در دسترس نباشد (بسته slim) جستجو کامل انجام می‌شود.
+
+نمونه اجرا:
+    python -m src similar                 # ساخت شاخص، نمونه جستجو و زمان‌سنجی
+    python -m src similar --save          # ذخیره شاخص در پوشه models
+"""
+
+import os
+import sys
+import time
+import pickle
+import argparse
+import numpy as np
+
+try:
+    from .predictor import FEATURE_COLUMNS, SIMILAR_NEIGHBORS, SITE_ALIASES, random_launches
+except ImportError:
+    from predictor import FEATURE_COLUMNS, SIMILAR_NEIGHBORS, SITE_ALIASES, random_launches
+
+
+INDEX_FILENAME = 'falcon9_similar_launches.pkl'
+# با هر تغییر در نحوه ساخت بردارها این عدد افزایش می‌یابد تا شاخص قبلی کنار گذاشته شود
+INDEX_VERSION = 1
+DEFAULT_NEIGHBORS = SIMILAR_NEIGHBORS
+LEAF_SIZE = 16
+# از این تعداد پرتاب به بالا KDTree ساخته می‌شود
+TREE_MIN_POINTS = 1024
+# بیشینه اندازه ماتریس فاصله در هر مرحله جستجوی کامل (تعداد عنصر)
+BRUTE_FORCE_CHUNK = 1 << 22
+
+# وزن هر گروه ویژگی در فاصله؛ ستون‌های عددی پیش از وزن‌دهی استاندارد می‌شوند
+NUMERIC_WEIGHTS = {'PayloadMass': 1.0, 'Date': 1.0, 'Block': 1.0, 'ReusedCount': 0.5}
+FLAG_COLUMNS = ['GridFins', 'Reused', 'Legs']
+FLAG_WEIGHT = 0.5
+# پرچم نامعلوم در میانه 0 و 1 قرار می‌گیرد تا به هیچ‌کدام نزدیک‌تر نباشد
+MISSING_FLAG = 0.5
+ORBIT_WEIGHT = 1.0
+# فاصله دو سکو به این مقیاس (کیلومتر) تقسیم می‌شود؛ فلوریدا تا کالیفرنیا حدود ۱٫۵ واحد است
+SITE_SCALE_KM = 2500.0
+EARTH_RADIUS_KM = 6371.0
+
+# ستون‌های هر پرتاب تاریخی که همراه نتیجه جستجو برگردانده می‌شوند
+RESULT_COLUMNS = ['FlightNumber', 'Date', 'Serial', 'Orbit', 'LaunchSite', 'LandingPad',
+                  'PayloadMass', 'Outcome', 'Success']
+
+
+def _site_vectors(longitude, latitude):
+    """مختصات سه‌بعدی سکوها روی کره زمین به واحد SITE_SCALE_KM (فاصله وتری)"""
+    lon = np.radians(np.asarray(longitude, dtype=np.float64))
+    lat = np.radians(np.asarray(latitude, dtype=np.float64))
+    radius = EARTH_RADIUS_KM / SITE_SCALE_KM
+    return np.column_stack([radius * np.cos(lat) * np.cos(lon),
+                            radius * np.cos(lat) * np.sin(lon),
+                            radius * np.sin(lat)])
+
+
+class SimilarLaunchIndex:
+    """شاخص نزدیک‌ترین پرتاب‌های تاریخی روی بردارهای نرمال‌شده ویژگی‌ها و موقعیت سکو"""
+
+    def __init__(self, frame):
+        """ساخت شاخص از دیتافریم آماده‌شده features.load_features"""
+        payload = frame['PayloadMass'].astype(np.float64)
+        self.payload_fill = float(payload.median())
+        self.orbits = np.array(sorted(frame['Orbit'].astype(str).unique()), dtype=object)
+
+        sites = frame['LaunchSite'].astype(str).str.strip()
+        coordinates = frame[['Longitude', 'Latitude']].astype(np.float64).groupby(sites.to_numpy()).mean()
+        self.sites = {site: (float(lon), float(lat)) for site, (lon, lat) in coordinates.iterrows()}
+        self.default_site = tuple(float(v) for v in coordinates.mean())
+
+        numeric = self._numeric_columns({
+            'PayloadMass': payload.to_numpy(),
+            'Year': frame['Year'].to_numpy(),
+            'Month': frame['Month'].to_numpy(),
+            'Block': frame['Block'].to_numpy(),
+            'ReusedCount': frame['ReusedCount'].to_numpy(),
+        })
+        self.center = np.nanmean(numeric, axis=0)
+        scale = np.nanstd(numeric, axis=0)
+        self.scale = np.where(scale > 0, scale, 1.0)
+
+        columns = {col: frame[col].to_numpy() for col in FEATURE_COLUMNS}
+        columns['LaunchSite'] = sites.to_numpy()
+        columns['Longitude'] = frame['Longitude'].to_numpy()
+        columns['Latitude'] = frame['Latitude'].to_numpy()
+        self.points = self.encode(columns)
+        self.tree = None
+        if len(self.points) >= TREE_MIN_POINTS:
+            from sklearn.neighbors import KDTree
+            self.tree = KDTree(self.points, leaf_size=LEAF_SIZE)
+
+        self.launches = {
+            'FlightNumber': frame['FlightNumber'].to_numpy(np.int64),
+            'Date': frame['Date'].dt.strftime('%Y-%m-%d').to_numpy(object),
+            'Serial': frame['Serial'].astype(str).to_numpy(object),
+            'Orbit': frame['Orbit'].astype(str).to_numpy(object),
+            'LaunchSite': sites.to_numpy(object),
+            'LandingPad': frame['LandingPad'].astype(object).where(frame['LandingPad'].notna(), None).to_numpy(object),
+            'PayloadMass': payload.to_numpy(),
+            'Outcome': frame['Outcome'].astype(str).to_numpy(object),
+            'Success': frame['Success'].to_numpy(bool),
+        }
+
+    def __len__(self):
+        return len(self.points)
+
+    def _numeric_columns(self, columns):
+        """ستون‌های عددی پیش از استانداردسازی: وزن محموله، تاریخ (سال اعشاری)، بلوک و ReusedCount"""
+        payload = np.asarray(columns['PayloadMass'], dtype=np.float64)
+        payload = np.where(np.isnan(payload), self.payload_fill, payload)
+        date = (np.asarray(columns['Year'], dtype=np.float64)
+                + (np.asarray(columns['Month'], dtype=np.float64) - 1) / 12)
+        return np.column_stack([payload, date,
+                                np.asarray(columns['Block'], dtype=np.float64),
+                                np.asarray(columns['ReusedCount'], dtype=np.float64)])
+
+    def _site_coordinates(self, columns):
+        """طول و عرض جغرافیایی هر سطر؛ از ستون‌های Longitude/Latitude یا نام سکو"""
+        if 'Longitude' in columns and 'Latitude' in columns:
+            return (np.asarray(columns['Longitude'], dtype=np.float64),
+                    np.asarray(columns['Latitude'], dtype=np.float64))
+        names, inverse = np.unique(np.asarray(columns['LaunchSite'], dtype=str), return_inverse=True)
+        table = np.array([self.sites.get(SITE_ALIASES.get(name.strip(), name.strip()), self.default_site)
+                          for name in names])
+        return table[inverse, 0], table[inverse, 1]
+
+    def encode(self, input_data):
+        """بردارهای شاخص برای ستون‌های FEATURE_COLUMNS (و در صورت وجود Longitude و Latitude)"""
+        weights = np.array([NUMERIC_WEIGHTS[name] for name in ('PayloadMass', 'Date', 'Block', 'ReusedCount')])
+        numeric = self._numeric_columns(input_data)
+        # مقدار گم‌شده در هر ستون عددی با میانگین همان ستون (و در پرچم‌ها با MISSING_FLAG)
+        # جایگزین می‌شود تا فاصله‌ها NaN نشوند
+        numeric = np.where(np.isnan(numeric), self.center, numeric)
+        numeric = (numeric - self.center) / self.scale * weights
+        flags = np.column_stack([np.asarray(input_data[col], dtype=np.float64) for col in FLAG_COLUMNS])
+        flags = np.where(np.isnan(flags), MISSING_FLAG, flags) * FLAG_WEIGHT
+        # دو مدار متفاوت در دو ستون one-hot تفاوت دارند؛ تقسیم بر رادیکال ۲ فاصله آن‌ها را ORBIT_WEIGHT می‌کند
+        orbit = np.asarray(input_data['Orbit'], dtype=object)[:, None] == self.orbits[None, :]
+        orbit = orbit * (ORBIT_WEIGHT / np.sqrt(2))
+        return np.hstack([numeric, flags, orbit, _site_vectors(*self._site_coordinates(input_data))])
+
+    def query_batch(self, input_data, k=DEFAULT_NEIGHBORS):
+        """k پرتاب نزدیک هر سطر؛ خروجی (فاصله‌ها، اندیس‌ها) با ابعاد (سطر، k) به ترتیب فاصله"""
+        k = min(k, len(self.points))
+        points = self.encode(input_data)
+        if self.tree is not None:
+            return self.tree.query(points, k=k)
+        # جستجوی کامل برداری در مراحل محدود (|a-b|² = |a|² + |b|² - 2a·b)
+        norms = (self.points ** 2).sum(axis=1)
+        chunk = max(1, BRUTE_FORCE_CHUNK // len(self.points))
+        distances = np.empty((len(points), k))
+        indices = np.empty((len(points), k), dtype=np.intp)
+        for start in range(0, len(points), chunk):
+            block = points[start:start + chunk]
+            squared = (block ** 2).sum(axis=1)[:, None] + norms[None, :] - 2 * block @ self.points.T
+            nearest = np.argpartition(squared, k - 1, axis=1)[:, :k]
+            nearest_squared = np.take_along_axis(squared, nearest, axis=1)
+            order = np.argsort(nearest_squared, axis=1, kind='stable')
+            indices[start:start + chunk] = np.take_along_axis(nearest, order, axis=1)
+            distances[start:start + chunk] = np.sqrt(np.maximum(np.take_along_axis(nearest_squared, order, axis=1), 0))
+        return distances, indices
+
+    def query(self, values, k=DEFAULT_NEIGHBORS):
+        """k پرتاب نزدیک یک سطر (تاپل به ترتیب FEATURE_COLUMNS) به صورت فهرستی از دیکشنری‌ها"""
+        columns = {col: [value] for col, value in zip(FEATURE_COLUMNS, values)}
+        distances, indices = self.query_batch(columns, k)
+        return self.records(indices[0], distances[0])
+
+    def records(self, indices, distances):
+        """اطلاعات پرتاب‌های تاریخی اندیس‌های داده‌شده به همراه فاصله هر کدام"""
+        rows = self.__dict__.get('_rows')
+        if rows is None:
+            # سطرهای پایتونی یک بار ساخته می‌شوند تا جستجوی تک‌سطری به تبدیل NumPy نیاز نداشته باشد
+            rows = self._rows = [dict(zip(RESULT_COLUMNS, row))
+                                 for row in zip(*(self.launches[col].tolist() for col in RESULT_COLUMNS))]
+        return [dict(rows[i], distance=distance) for i, distance in zip(indices.tolist(), distances.tolist())]
+
+    def save(self, path):
+        """ذخیره اتمی شاخص؛ درخت جداگانه سریال می‌شود تا خواندن فایل به sklearn نیاز نداشته باشد"""
+        state = {name: value for name, value in vars(self).items() if name != 'tree' and not name.startswith('_')}
+        state['version'] = INDEX_VERSION
+        state['tree'] = pickle.dumps(self.tree, protocol=pickle.HIGHEST_PROTOCOL)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """بارگذاری شاخص ذخیره‌شده بدون ساخت دوباره درخت"""
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if state.pop('version', None) != INDEX_VERSION:
+            raise ValueError(f"نسخه فایل شاخص {path} پشتیبانی نمی‌شود")
+        tree = state.pop('tree')
+        index = cls.__new__(cls)
+        vars(index).update(state)
+        try:
+            index.tree = pickle.loads(tree)
+        except ImportError:
+            index.tree = None
+        return index
+
+
+def build_index(data_path, use_cache=True):
+    """ساخت شاخص از فایل داده (با cache ویژگی‌ها)"""
+    try:
+        from .features import load_features
+    except ImportError:
+        from features import load_features
+    return SimilarLaunchIndex(load_features(data_path, use_cache=use_cache))
+
+
+def save_index(data_path, model_dir):
+    """ساخت و ذخیره شاخص کنار فایل مدل؛ خروجی مسیر فایل"""
+    path = build_index(data_path).save(os.path.join(model_dir, INDEX_FILENAME))
+    print(f"شاخص پرتاب‌های مشابه در مسیر '{path}' ذخیره شد.")
+    return path
+
+
+def main(argv=None):
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="جستجوی پرتاب‌های تاریخی مشابه")
+    parser.add_argument('--data', default=os.path.join(base_dir, 'data', 'data_falcon9.csv'),
+                        help="مسیر فایل داده")
+    parser.add_argument('--model-dir', default=os.path.join(base_dir, 'models'), help="پوشه مدل")
+    parser.add_argument('--k', type=int, default=DEFAULT_NEIGHBORS, help="تعداد پرتاب‌های مشابه")
+    parser.add_argument('--rows', type=int, default=10000, help="تعداد سطرهای دسته زمان‌سنجی")
+    parser.add_argument('--save', action='store_true', help="ذخیره شاخص در پوشه مدل")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index = build_index(args.data)
+    build_seconds = time.perf_counter() - start
+    print(f"شاخص {len(index)} پرتاب با {index.points.shape[1]} بعد در {build_seconds * 1000:.1f} میلی‌ثانیه ساخته شد.")
+    if args.save:
+        path = index.save(os.path.join(args.model_dir, INDEX_FILENAME))
+        start = time.perf_counter()
+        SimilarLaunchIndex.load(path)
+        print(f"شاخص در '{path}' ذخیره شد؛ بارگذاری: {(time.perf_counter() - start) * 1000:.2f} میلی‌ثانیه")
+
+    values = (6000.0, 'GTO', 'CCAFS SLC 40', 1, 1, 1, 5.0, 3, 2020, 6)
+    print(f"نزدیک‌ترین پرتاب‌ها به {values}:")
+    for launch in index.query(values, args.k):
+        print(f"  #{launch['FlightNumber']:<3} {launch['Date']}  {launch['Orbit']:<6} {launch['LaunchSite']:<13} "
+              f"{launch['PayloadMass']:>8.0f} kg  {launch['Outcome']:<12} فاصله {launch['distance']:.3f}")
+
+    repeats = 1000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        index.query(values, args.k)
+    single_seconds = (time.perf_counter() - start) / repeats
+
+    batch = random_launches(args.rows)
+    start = time.perf_counter()
+    index.query_batch(batch, args.k)
+    batch_seconds = time.perf_counter() - start
+    print(f"جستجوی تک‌سطری: {single_seconds * 1e6:.0f} میکروثانیه؛ دسته {args.rows} سطری: "
+          f"{batch_seconds * 1000:.1f} میلی‌ثانیه ({args.rows / batch_seconds:,.0f} سطر در ثانیه)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+بسته اجرایی سبک فقط با NumPy: خروجی گرفتن از مدل، بررسی برابری و گزارش اندازه و زمان شروع
+
+برای اجرای یک جنگل آموزش‌دیده نیازی به pandas، scikit-learn و SciPy نیست: مسیر پیش‌بینی
+compiled_model.py و قالب فایل model_artifact.py (.f9m) فقط به NumPy وابسته‌اند. export
+پایپ‌لاین pickle شده را مستقیماً به فایل .f9m تبدیل می‌کند و setup.py --slim فقط همین
+فایل را همراه برنامه بسته‌بندی کرده و بسته‌های EXCLUDED_PACKAGES را کنار می‌گذارد.
+
+بررسی برابری در یک فرآیند تازه اجرا می‌شود که وارد کردن بسته‌های کنارگذاشته در آن ممکن
+نیست؛ احتمال‌های آن برای سطرهای داده آموزش (با مقادیر گمشده) و سطرهای تصادفی با خروجی
+predict_proba مدل pickle شده مقایسه می‌شود.
+
+نمونه اجرا:
+    python -m src slim                 # بررسی برابری و گزارش اندازه بسته‌ها و زمان شروع سرد
+    python src/setup.py --slim         # ساخت فایل اجرایی سبک
+"""
+
+import os
+import sys
+import json
+import site
+import shutil
+import argparse
+import tempfile
+import importlib.util
+import subprocess
+import numpy as np
+
+try:
+    from .model_artifact import convert, ARTIFACT_FILENAME
+    from .predictor import FEATURE_COLUMNS, HISTORY_FEATURES, random_launches
+    from .booster_history import BoosterHistory, HISTORY_FILENAME
+except ImportError:
+    from model_artifact import convert, ARTIFACT_FILENAME
+    from predictor import FEATURE_COLUMNS, HISTORY_FEATURES, random_launches
+    from booster_history import BoosterHistory, HISTORY_FILENAME
+
+
+MODEL_FILENAME = 'falcon9_landing_model.pkl'
+# بسته‌هایی که در بسته سبک حذف می‌شوند و در فرآیند بررسی قابل وارد کردن نیستند
+EXCLUDED_PACKAGES = ('sklearn', 'pandas', 'scipy', 'joblib', 'threadpoolctl', 'pyarrow',
+                     'matplotlib', 'seaborn')
+DEFAULT_RANDOM_ROWS = 2000
+DEFAULT_REPEATS = 3
+PARITY_TOLERANCE = 1e-9
+
+# شروع سرد: از وارد کردن predictor تا نخستین پیش‌بینی، در یک فرآیند تازه
+_COLD_START_SCRIPT = r"""
+import sys, json, time
+start = time.perf_counter()
+for name in {blocked!r}:
+    sys.modules[name] = None
+sys.path.insert(0, {src_dir!r})
+from predictor import PredictionModel
+model = PredictionModel(compiled={slim!r}, prefer_artifact={slim!r}, model_dir={model_dir!r})
+if not model.is_loaded or (model.model is not None) == {slim!r}:
+    raise SystemExit("model was not loaded from the expected file")
+columns = json.load(sys.stdin)
+probability = model.predict_batch(columns)['probability']
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'model_path': model.model_path,
+                  'probability': probability.tolist(),
+                  'packages': sorted({{name.split('.')[0] for name, module in list(sys.modules.items())
+                                      if module is not None}})}}))
+"""
+
+
+def export(model_dir, output_dir):
+    """تبدیل مستقیم مدل pickle شده به فایل .f9m در output_dir؛ خروجی مسیر فایل
+
+    فایل .f9m موجود در model_dir استفاده نمی‌شود، چون ممکن است نسخه فشرده (compact_model)
+    باشد که خروجی آن عمداً با مدل اصلی اندکی فرق دارد.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    artifact_path = os.path.join(output_dir, ARTIFACT_FILENAME)
+    convert(os.path.join(model_dir, MODEL_FILENAME), artifact_path)
+    # مدل‌های دارای ویژگی‌های سابقه بوستر بدون فایل سابقه قابل اجرا نیستند
+    history_path = os.path.join(model_dir, HISTORY_FILENAME)
+    if os.path.exists(history_path):
+        shutil.copy2(history_path, os.path.join(output_dir, HISTORY_FILENAME))
+    return artifact_path
+
+
+def parity_rows(data_path, n_random=DEFAULT_RANDOM_ROWS):
+    """ستون‌های ورودی بررسی: سطرهای فایل داده (وزن محموله گمشده دست‌نخورده) و سطرهای تصادفی"""
+    try:
+        from .features import load_features, split
+    except ImportError:
+        from features import load_features, split
+
+    X, _ = split(load_features(data_path), payload_fill=np.nan)
+    random_rows = random_launches(n_random)
+    return {col: np.asarray(X[col], dtype=object).tolist() + np.asarray(random_rows[col]).tolist()
+            for col in FEATURE_COLUMNS}
+
+
+def _json_columns(columns):
+    # NaN در JSON استاندارد نیست؛ در هر دو سمت به None تبدیل می‌شود
+    return {col: [None if isinstance(v, float) and v != v else v for v in values]
+            for col, values in columns.items()}
+
+
+def _site_footprint(packages):
+    """حجم روی دیسک بسته‌های شخص ثالث (به همراه پوشه‌های .libs آن‌ها)؛ خروجی {بسته: بایت}"""
+    site_dirs = [os.path.normcase(os.path.abspath(path))
+                 for path in site.getsitepackages() + [site.getusersitepackages()]]
+    sizes = {}
+    for name in packages:
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            continue
+        if spec is None or not spec.origin or not os.path.isabs(spec.origin):
+            continue
+        root = list(spec.submodule_search_locations or [spec.origin])[0]
+        if os.path.normcase(os.path.dirname(os.path.abspath(root))) not in site_dirs:
+            continue
+        paths = [root] + [os.path.join(os.path.dirname(root), f"{name}{suffix}")
+                          for suffix in ('.libs', '_libs')]
+        sizes[name] = sum(_path_size(path) for path in paths if os.path.exists(path))
+    return sizes
+
+
+def _path_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files
+                     if not os.path.islink(os.path.join(root, name)))
+    return total
+
+
+def cold_start(columns, slim, root, repeats=DEFAULT_REPEATS):
+    """اجرای پیش‌بینی در فرآیند تازه با پوشه جاری root؛ مدل فقط از پوشه models همان root خوانده می‌شود
+
+    در حالت slim بسته‌های EXCLUDED_PACKAGES مسدود هستند و مدل از فایل .f9m خوانده می‌شود؛
+    در غیر این صورت مسیر کامل (pickle، sklearn و pandas) اجرا می‌شود. خروجی سریع‌ترین
+    اجرا به همراه احتمال‌ها و بسته‌های بارگذاری‌شده است.
+    """
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    script = _COLD_START_SCRIPT.format(blocked=EXCLUDED_PACKAGES if slim else (),
+                                       src_dir=src_dir, slim=slim,
+                                       model_dir=os.path.join(os.path.abspath(root), 'models'))
+    payload = json.dumps(_json_columns(columns))
+    best = None
+    for _ in range(repeats):
+        completed = subprocess.run([sys.executable, '-c', script], input=payload, text=True,
+                                   capture_output=True, cwd=root)
+        if completed.returncode != 0:
+            lines = completed.stderr.strip().splitlines()
+            raise RuntimeError(lines[-1] if lines else f"کد خروج {completed.returncode}")
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        if best is None or result['seconds'] < best['seconds']:
+            best = result
+    best['probability'] = np.asarray(best['probability'])
+    return best
+
+
+def check_parity(model_dir, data_path, n_random=DEFAULT_RANDOM_ROWS, tolerance=PARITY_TOLERANCE):
+    """مقایسه احتمال‌های بسته سبک (فرآیند بدون sklearn و pandas) با مدل pickle شده
+
+    مدل در یک پوشه موقت export می‌شود تا همان فایلی بررسی شود که بسته‌بندی خواهد شد.
+    خروجی (بیشینه اختلاف به درصد، تعداد سطرها)؛ در صورت عبور از آستانه خطا می‌دهد.
+    """
+    import pickle
+    import pandas as pd
+
+    columns = parity_rows(data_path, n_random)
+    with open(os.path.join(model_dir, MODEL_FILENAME), 'rb') as f:
+        pipeline = pickle.load(f)
+    success_index = list(pipeline.classes_).index(1)
+    model_columns = list(getattr(pipeline, 'feature_names_in_', FEATURE_COLUMNS))
+    frame = pd.DataFrame(columns)
+    if any(col in model_columns for col in HISTORY_FEATURES):
+        frame = BoosterHistory.load(os.path.join(model_dir, HISTORY_FILENAME)).with_history(frame)
+    expected = pipeline.predict_proba(frame[model_columns])[:, success_index] * 100
+
+    with tempfile.TemporaryDirectory() as root:
+        export(model_dir, os.path.join(root, 'models'))
+        slim = cold_start(columns, slim=True, root=root, repeats=1)
+        if not os.path.abspath(slim['model_path']).startswith(os.path.abspath(root)):
+            raise RuntimeError(f"بسته سبک فایل خروجی را بارگذاری نکرد: {slim['model_path']}")
+    difference = float(np.abs(slim['probability'] - expected).max())
+    if difference > tolerance * 100:
+        raise AssertionError(f"اختلاف خروجی بسته سبک با مدل pickle شده بیش از حد مجاز است: {difference:.3g}")
+    return difference, len(expected)
+
+
+def report(model_dir, data_path, n_random=DEFAULT_RANDOM_ROWS, repeats=DEFAULT_REPEATS):
+    """برابری، حجم بسته‌های شخص ثالث و زمان شروع سرد مسیر کامل (pickle) و سبک (.f9m)"""
+    difference, n_rows = check_parity(model_dir, data_path, n_random)
+    columns = {col: values[:1] for col, values in parity_rows(data_path, 0).items()}
+    results = {'parity': {'rows': n_rows, 'max_difference': difference}}
+    with tempfile.TemporaryDirectory() as full_root, tempfile.TemporaryDirectory() as slim_root:
+        os.makedirs(os.path.join(full_root, 'models'))
+        for name in (MODEL_FILENAME, HISTORY_FILENAME):
+            if os.path.exists(os.path.join(model_dir, name)):
+                shutil.copy(os.path.join(model_dir, name), os.path.join(full_root, 'models'))
+        full = cold_start(columns, False, full_root, repeats)
+        export(model_dir, os.path.join(slim_root, 'models'))
+        slim = cold_start(columns, True, slim_root, repeats)
+        for name, run in (('full', full), ('slim', slim)):
+            footprint = _site_footprint(run['packages'])
+            results[name] = {
+                'cold_start_seconds': run['seconds'],
+                'model_file': os.path.basename(run['model_path']),
+                'model_bytes': os.path.getsize(run['model_path']),
+                'packages': footprint,
+                'package_bytes': sum(footprint.values()),
+            }
+    return results
+
+
+def print_report(results):
+    parity = results['parity']
+    print(f"برابری: {parity['rows']} سطر، بیشینه اختلاف {parity['max_difference']:.3g} درصد")
+    print(f"{'حالت':<6} {'فایل مدل':<28} {'مدل(KB)':>8} {'بسته‌ها(MB)':>11} {'شروع سرد(ms)':>13}  بسته‌ها")
+    for name in ('full', 'slim'):
+        stats = results[name]
+        packages = ', '.join(f"{package} {size / 2**20:.0f}MB"
+                             for package, size in sorted(stats['packages'].items(), key=lambda item: -item[1])
+                             if size >= 2**20)
+        print(f"{name:<6} {stats['model_file']:<28} {stats['model_bytes'] / 1024:>8.0f} "
+              f"{stats['package_bytes'] / 2**20:>11.1f} {stats['cold_start_seconds'] * 1000:>13.0f}  {packages}")
+    full, slim = results['full'], results['slim']
+    print(f"حجم بسته‌ها {full['package_bytes'] / max(slim['package_bytes'], 1):.1f} برابر کوچک‌تر و "
+          f"شروع سرد {full['cold_start_seconds'] / slim['cold_start_seconds']:.1f} برابر سریع‌تر")
+
+
+def main(argv=None):
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="بررسی و گزارش بسته اجرایی سبک (فقط NumPy)")
+    parser.add_argument('--model-dir', default=os.path.join(base_dir, 'models'), help="پوشه مدل")
+    parser.add_argument('--data', default=os.path.join(base_dir, 'data', 'data_falcon9.csv'),
+                        help="فایل داده برای سطرهای بررسی برابری")
+    parser.add_argument('--random-rows', type=int, default=DEFAULT_RANDOM_ROWS,
+                        help="تعداد سطرهای تصادفی افزون بر داده")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS,
+                        help="تعداد اجرای شروع سرد (کمترین زمان گزارش می‌شود)")
+    parser.add_argument('--json', default=None, help="ذخیره نتایج در فایل JSON")
+    args = parser.parse_args(argv)
+
+    results = report(args.model_dir, args.data, args.random_rows, args.repeats)
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
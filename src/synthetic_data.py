@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+تولید داده‌های مصنوعی پرتاب با توزیع آماری مشابه data_falcon9.csv برای آزمون مقیاس
+
+توزیع توأم ستون‌ها به صورت یک زنجیره از جدول‌های شرطی آموخته می‌شود؛ ستون‌هایی که با هم
+معنا دارند (مثلاً محل پرتاب و مختصات آن، یا پایه‌ها، سکوی فرود و رشته Outcome) به صورت
+یک تاپل نمونه‌برداری می‌شوند تا ترکیب‌های ناممکن ساخته نشوند. برای والدهای کم‌تکرار،
+احتمال‌ها با جدول والدهای کمتر هموار می‌شوند. تاریخ و وزن محموله با نمونه‌برداری هسته‌ای
+(نمونه تجربی به علاوه نویز گاوسی با پهنای باند Silverman) تولید می‌شوند.
+
+داده به صورت بخش‌به‌بخش و در چند فرآیند تولید و به ترتیب نوشته می‌شود. هر بخش بذر
+مخصوص خودش را دارد، بنابراین خروجی برای یک بذر و اندازه بخش ثابت، مستقل از تعداد
+فرآیندها یکسان است.
+
+نمونه اجرا:
+    python -m src generate --rows 10000000 -o data/synthetic.parquet --workers 4
+    python src/synthetic_data.py --rows 1000000 -o data/synthetic.csv --with-features
+"""
+
+import os
+import sys
+import time
+import argparse
+from collections import deque
+import numpy as np
+import pandas as pd
+
+try:
+    from .batch_score import create_writer
+except ImportError:
+    from batch_score import create_writer
+
+
+DEFAULT_CHUNK_ROWS = 200000
+DEFAULT_SMOOTHING = 1.0
+
+# زنجیره مدل مولد: (ستون‌های نمونه‌برداری‌شده با هم، ستون‌های والد)
+CATEGORICAL_CHAIN = [
+    (('Block', 'BoosterVersion'), ()),
+    (('Orbit',), ('Block',)),
+    (('LaunchSite', 'Longitude', 'Latitude'), ('Orbit',)),
+    (('GridFins', 'Legs', 'LandingPad', 'Outcome'), ('Block', 'Orbit')),
+    (('Reused', 'Flights', 'ReusedCount', 'Serial'), ('Block',)),
+]
+# ستون‌های پیوسته: (ستون، والد)؛ مقدار در ترتیب زنجیره پس از ستون والد نمونه‌برداری می‌شود
+KERNEL_COLUMNS = [('Date', 'Block'), ('PayloadMass', 'Orbit')]
+TEXT_COLUMNS = ['BoosterVersion', 'Orbit', 'LaunchSite', 'Outcome', 'LandingPad', 'Serial']
+
+
+def _group_positions(columns, n_rows):
+    """گروه‌بندی سطرها بر اساس مقادیر والد؛ خروجی {کلید: اندیس سطرها}"""
+    if not columns:
+        return {(): np.arange(n_rows)}
+    frame = pd.DataFrame(columns)
+    groups = frame.groupby(list(frame.columns), dropna=False, sort=False).indices
+    if len(columns) == 1:
+        return {(key,): positions for key, positions in groups.items()}
+    return groups
+
+
+class ConditionalTable:
+    """توزیع شرطی یک تاپل از ستون‌ها به شرط ستون‌های والد
+
+    احتمال هر تاپل برای یک کلید والد برابر (تعداد + α × احتمال پیشین) / (کل + α) است؛
+    احتمال پیشین از جدول همان تاپل با یک والد کمتر (یا توزیع حاشیه‌ای) گرفته می‌شود.
+    """
+
+    def __init__(self, frame, columns, parents, smoothing=DEFAULT_SMOOTHING):
+        self.columns = list(columns)
+        self.parents = list(parents)
+        self.smoothing = smoothing
+
+        rows = [tuple(row) for row in frame[self.columns].astype(object)
+                .where(frame[self.columns].notna(), None).itertuples(index=False)]
+        self.outcomes = list(dict.fromkeys(rows))
+        outcome_index = {outcome: i for i, outcome in enumerate(self.outcomes)}
+        codes = np.array([outcome_index[row] for row in rows])
+
+        self.marginal = np.bincount(codes, minlength=len(self.outcomes)) / len(codes)
+        self.backoff = (ConditionalTable(frame, columns, parents[:-1], smoothing)
+                        if parents else None)
+        self.counts = {}
+        if parents:
+            parent_values = {col: frame[col].to_numpy(dtype=object) for col in self.parents}
+            for key, positions in _group_positions(parent_values, len(frame)).items():
+                self.counts[key] = np.bincount(codes[positions], minlength=len(self.outcomes))
+
+    def probabilities(self, key):
+        """توزیع تاپل‌ها برای یک کلید والد"""
+        if self.backoff is None:
+            return self.marginal
+        prior = self.backoff.probabilities(key[:-1])
+        counts = self.counts.get(key)
+        if counts is None:
+            return prior
+        return (counts + self.smoothing * prior) / (counts.sum() + self.smoothing)
+
+    def sample(self, values, n_rows, rng):
+        """نمونه‌برداری تاپل‌ها برای سطرهایی که ستون‌های والدشان در values پر شده است"""
+        codes = np.empty(n_rows, dtype=np.int64)
+        parent_values = {col: values[col] for col in self.parents}
+        for key, positions in _group_positions(parent_values, n_rows).items():
+            codes[positions] = rng.choice(len(self.outcomes), size=len(positions),
+                                          p=self.probabilities(key))
+        table = np.array(self.outcomes, dtype=object).reshape(len(self.outcomes), len(self.columns))
+        for i, col in enumerate(self.columns):
+            values[col] = table[codes, i]
+
+
+class KernelSampler:
+    """نمونه‌برداری هسته‌ای یک ستون عددی به شرط یک ستون والد، با احتمال مقدار گمشده"""
+
+    def __init__(self, frame, column, parent):
+        self.column = column
+        self.parent = parent
+        values = frame[column].to_numpy(dtype=np.float64)
+        self.low, self.high = np.nanmin(values), np.nanmax(values)
+        self.groups = {}
+        for key, positions in frame.groupby(parent, sort=False).indices.items():
+            group = values[positions]
+            self.groups[key] = (group[~np.isnan(group)], float(np.isnan(group).mean()))
+        observed = values[~np.isnan(values)]
+        self.fallback = (observed, float(np.isnan(values).mean()))
+
+    @staticmethod
+    def _bandwidth(values):
+        if len(values) < 2:
+            return 0.0
+        return 1.06 * float(np.std(values)) * len(values) ** -0.2
+
+    def sample(self, values, n_rows, rng):
+        result = np.empty(n_rows, dtype=np.float64)
+        for (key,), positions in _group_positions({self.parent: values[self.parent]}, n_rows).items():
+            observed, missing_rate = self.groups.get(key, self.fallback)
+            if len(observed) == 0:
+                observed, missing_rate = self.fallback
+            draws = rng.choice(observed, size=len(positions))
+            draws = draws + rng.normal(0.0, self._bandwidth(observed), size=len(positions))
+            draws = np.clip(draws, self.low, self.high)
+            draws[rng.random(len(positions)) < missing_rate] = np.nan
+            result[positions] = draws
+        values[self.column] = result
+
+
+class LaunchDataModel:
+    """مدل مولد آموخته‌شده از فایل داده پرتاب‌ها"""
+
+    def __init__(self, source):
+        self.columns = list(source.columns)
+        frame = source.copy()
+        # تاریخ به صورت تعداد روز از مبدأ یونیکس مدل می‌شود
+        frame['Date'] = pd.to_datetime(frame['Date']).to_numpy().astype('datetime64[D]').astype(np.float64)
+
+        self.steps = []
+        kernels = dict(KERNEL_COLUMNS)
+        for columns, parents in CATEGORICAL_CHAIN:
+            self.steps.append(ConditionalTable(frame, columns, parents))
+            for column, parent in KERNEL_COLUMNS:
+                if parent in columns:
+                    self.steps.append(KernelSampler(frame, column, kernels[column]))
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls(pd.read_csv(path))
+
+    def sample(self, n_rows, rng, first_flight=1, with_features=False):
+        """تولید n_rows سطر با همان ستون‌های فایل منبع"""
+        values = {}
+        for step in self.steps:
+            step.sample(values, n_rows, rng)
+
+        dates = np.round(values['Date']).astype('datetime64[D]')
+        values['Date'] = np.datetime_as_string(dates, unit='D')
+        values['FlightNumber'] = np.arange(first_flight, first_flight + n_rows)
+        frame = pd.DataFrame({col: values[col] for col in self.columns})
+
+        for col in ('GridFins', 'Reused', 'Legs'):
+            frame[col] = frame[col].astype(bool)
+        for col in ('Flights', 'ReusedCount'):
+            frame[col] = frame[col].astype(np.int64)
+        for col in ('Block', 'Longitude', 'Latitude'):
+            frame[col] = frame[col].astype(np.float64)
+        frame['PayloadMass'] = frame['PayloadMass'].round()
+        # نوع متنی ثابت تا طرح Parquet بین بخش‌ها حتی با ستون کاملاً خالی تغییر نکند
+        for col in TEXT_COLUMNS:
+            frame[col] = frame[col].astype('string')
+
+        if with_features:
+            frame['Year'] = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+            frame['Month'] = dates.astype('datetime64[M]').astype(np.int64) % 12 + 1
+        return frame
+
+
+# مدل در هر فرآیند کارگر فقط یک بار دریافت می‌شود
+_worker_model = None
+
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+
+def _generate_chunk(task):
+    seed, index, first_flight, n_rows, with_features = task
+    rng = np.random.default_rng([seed, index])
+    return _worker_model.sample(n_rows, rng, first_flight, with_features)
+
+
+def generate(source_path, output_path, n_rows, seed=42, chunk_rows=DEFAULT_CHUNK_ROWS,
+             workers=1, with_features=False):
+    """تولید و نوشتن بخش‌به‌بخش داده مصنوعی؛ در حافظه فقط چند بخش نگه داشته می‌شود"""
+    model = LaunchDataModel.from_csv(source_path)
+    tasks = [(seed, index, start + 1, min(chunk_rows, n_rows - start), with_features)
+             for index, start in enumerate(range(0, n_rows, chunk_rows))]
+
+    writer = create_writer(output_path)
+    start_time = time.perf_counter()
+    written = 0
+    first_chunk = None
+    try:
+        if workers > 1:
+            import multiprocessing
+            with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(model,)) as pool:
+                # تعداد بخش‌های در انتظار محدود است تا نوشتن کندتر از تولید حافظه را پر نکند
+                pending = deque()
+                for task in tasks:
+                    pending.append(pool.apply_async(_generate_chunk, (task,)))
+                    if len(pending) >= 2 * workers:
+                        chunk = pending.popleft().get()
+                        first_chunk = chunk if first_chunk is None else first_chunk
+                        writer.write(chunk)
+                        written += len(chunk)
+                while pending:
+                    chunk = pending.popleft().get()
+                    first_chunk = chunk if first_chunk is None else first_chunk
+                    writer.write(chunk)
+                    written += len(chunk)
+        else:
+            _init_worker(model)
+            for task in tasks:
+                chunk = _generate_chunk(task)
+                first_chunk = chunk if first_chunk is None else first_chunk
+                writer.write(chunk)
+                written += len(chunk)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start_time
+    return {'rows': written, 'seconds': elapsed,
+            'rows_per_second': written / elapsed if elapsed > 0 else float('inf'),
+            'sample': first_chunk}
+
+
+def compare_distributions(source, synthetic):
+    """فاصله تغییرات کل (TVD) بین توزیع حاشیه‌ای ستون‌های دسته‌ای منبع و داده مصنوعی"""
+    report = {}
+    for col in ('Orbit', 'LaunchSite', 'Block', 'Outcome', 'ReusedCount', 'Serial', 'GridFins'):
+        expected = source[col].astype(str).value_counts(normalize=True)
+        observed = synthetic[col].astype(str).value_counts(normalize=True)
+        expected, observed = expected.align(observed, fill_value=0.0)
+        report[col] = float((expected - observed).abs().sum() / 2)
+    return report
+
+
+def main(argv=None):
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(prog='falcon9-predictor generate',
+                                     description="تولید داده مصنوعی پرتاب برای آزمون مقیاس")
+    parser.add_argument('--rows', type=int, default=1000000, help="تعداد سطرهای خروجی")
+    parser.add_argument('-o', '--output', required=True, help="مسیر خروجی (.csv یا .parquet)")
+    parser.add_argument('--source', default=os.path.join(base_dir, 'data', 'data_falcon9.csv'),
+                        help="فایل داده‌ای که توزیع از آن آموخته می‌شود")
+    parser.add_argument('--seed', type=int, default=42, help="بذر تولید داده")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help="تعداد سطرهای هر بخش")
+    parser.add_argument('--workers', type=int, default=1, help="تعداد فرآیندهای تولیدکننده")
+    parser.add_argument('--with-features', action='store_true',
+                        help="افزودن ستون‌های Year و Month برای امتیازدهی مستقیم با دستور score")
+    args = parser.parse_args(argv)
+
+    try:
+        stats = generate(args.source, args.output, args.rows, args.seed, args.chunk_rows,
+                         args.workers, args.with_features)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"خطا در تولید داده: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{stats['rows']} سطر در {stats['seconds']:.1f} ثانیه در '{args.output}' نوشته شد "
+          f"({stats['rows_per_second']:.0f} سطر در ثانیه).")
+    if stats['sample'] is not None:
+        report = compare_distributions(pd.read_csv(args.source), stats['sample'])
+        print("فاصله توزیع با داده منبع (TVD روی بخش اول): " +
+              ', '.join(f"{col}={distance:.3f}" for col, distance in report.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
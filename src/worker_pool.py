@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+استخر فرآیندهای کارگر برای استفاده از چند هسته پردازنده در پیش‌بینی
+
+مدل فقط یک بار در فرآیند والد بارگذاری می‌شود و کارگرها با fork ساخته می‌شوند تا
+صفحات حافظه مدل به صورت copy-on-write به اشتراک گذاشته شوند (پیش از fork، اشیای
+موجود با gc.freeze از جمع‌آوری زباله خارج می‌شوند تا صفحات مشترک دست‌نخورده بمانند).
+کارها به صورت نوبتی بین کارگرها پخش می‌شوند؛ اگر کارگری از کار بیفتد، دوباره
+راه‌اندازی شده و کارهای ناتمامش مجدداً ارسال می‌شوند.
+
+روی سیستم‌هایی که fork ندارند (ویندوز)، هر کارگر مدل را خودش بارگذاری می‌کند؛
+در این حالت استفاده از فایل قابل نگاشت (.f9m) صفحات مدل را بین فرآیندها مشترک نگه می‌دارد.
+
+نمونه اجرای بنچمارک مقیاس‌پذیری:
+    python src/worker_pool.py --rows 200000 --workers 4
+"""
+
+import os
+import gc
+import sys
+import time
+import queue
+import signal
+import argparse
+import itertools
+import threading
+import multiprocessing
+from concurrent.futures import Future
+import numpy as np
+
+try:
+    from .predictor import PredictionModel, FEATURE_COLUMNS, random_launches
+except ImportError:
+    from predictor import PredictionModel, FEATURE_COLUMNS, random_launches
+
+
+DEFAULT_CHUNK_ROWS = 10000
+POLL_INTERVAL = 0.5
+# gc.freeze روی کل فرآیند اثر دارد؛ gc.unfreeze فقط با بسته شدن آخرین استخر فعال اجرا می‌شود
+_frozen_pools = 0
+_freeze_lock = threading.Lock()
+
+# ستون‌های اختیاری ورودی که مدل‌های دارای ویژگی‌های سابقه بوستر استفاده می‌کنند
+OPTIONAL_COLUMNS = ('Serial', 'Date')
+
+
+def _freeze():
+    global _frozen_pools
+    with _freeze_lock:
+        gc.freeze()
+        _frozen_pools += 1
+
+
+def _unfreeze():
+    global _frozen_pools
+    with _freeze_lock:
+        _frozen_pools -= 1
+        if _frozen_pools == 0:
+            gc.unfreeze()
+
+
+def _worker_main(task_queue, result_queue, model, model_options):
+    """حلقه اصلی کارگر: دریافت کار، پیش‌بینی و ارسال نتیجه"""
+    # Ctrl+C فقط به فرآیند والد مربوط است که کارگرها را مرتب متوقف می‌کند
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if model is None:
+        model = PredictionModel(**model_options)
+    elif getattr(model, 'watching', False):
+        # رشته بررسی فهرست مدل‌ها به فرآیند فرزند fork منتقل نمی‌شود
+        model.watch()
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        job_id, columns = task
+        try:
+            result = model.predict_batch(columns)
+            result_queue.put((job_id, True, (result['prediction'], result['probability'])))
+        except Exception as e:
+            result_queue.put((job_id, False, str(e)))
+
+
+class PredictionWorkerPool:
+    """استخر کارگرهای پیش‌بینی با مدل مشترک و راه‌اندازی مجدد خودکار کارگرهای از کار افتاده
+
+    ارسال کار از چند رشته هم‌زمان مجاز است؛ یک رشته جمع‌کننده نتایج را به Future هر کار
+    می‌رساند و وضعیت کارگرها را زیر نظر دارد.
+    """
+
+    def __init__(self, workers=None, model=None, **model_options):
+        self.n_workers = workers or os.cpu_count() or 1
+        self.model_options = model_options
+        self.restarts = 0
+
+        self._frozen = False
+        self._fork = 'fork' in multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context('fork' if self._fork else 'spawn')
+        if self._fork:
+            self.model = model or PredictionModel(**model_options)
+            if not self.model.is_loaded:
+                raise ValueError("مدل بارگذاری نشده است")
+            # اشیای موجود از جمع‌آوری زباله کنار گذاشته می‌شوند تا صفحات مشترک کپی نشوند
+            _freeze()
+            self._frozen = True
+        else:
+            self.model = None
+
+        self._lock = threading.Lock()
+        self._result_queue = self._context.Queue()
+        self._workers = []
+        self._task_queues = []
+        self._in_flight = [dict() for _ in range(self.n_workers)]
+        self._job_ids = itertools.count()
+        self._next_worker = 0
+        self._closed = False
+
+        for index in range(self.n_workers):
+            self._task_queues.append(self._context.Queue())
+            self._workers.append(self._start_worker(index))
+
+        self._collector = threading.Thread(target=self._collect, name="predict-pool-collector",
+                                           daemon=True)
+        self._collector.start()
+
+    @property
+    def is_loaded(self):
+        return not self._closed
+
+    def _start_worker(self, index):
+        process = self._context.Process(
+            target=_worker_main, name=f"predict-worker-{index}", daemon=True,
+            args=(self._task_queues[index], self._result_queue, self.model, self.model_options))
+        process.start()
+        return process
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """توقف همه کارگرها"""
+        if self._closed:
+            return
+        self._closed = True
+        self._collector.join()
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+        for process in self._workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for in_flight in self._in_flight:
+            for future, _ in in_flight.values():
+                future.set_exception(RuntimeError("استخر کارگرها بسته شد"))
+            in_flight.clear()
+        if self._frozen:
+            _unfreeze()
+            self._frozen = False
+
+    def submit(self, columns):
+        """ارسال یک کار به کارگر بعدی به صورت نوبتی؛ خروجی Future با (برچسب‌ها، احتمال‌ها)"""
+        if self._closed:
+            raise RuntimeError("استخر کارگرها بسته شده است")
+        future = Future()
+        with self._lock:
+            job_id = next(self._job_ids)
+            index = self._next_worker
+            self._next_worker = (self._next_worker + 1) % self.n_workers
+            self._in_flight[index][job_id] = (future, columns)
+            self._task_queues[index].put((job_id, columns))
+        return future
+
+    def _collect(self):
+        """رشته جمع‌کننده: تحویل نتایج و بررسی سلامت کارگرها
+
+        سلامت کارگرها در فاصله‌های POLL_INTERVAL بررسی می‌شود، حتی اگر صف نتایج هیچ‌وقت
+        خالی نشود؛ در غیر این صورت کارهای کارگر از کار افتاده زیر بار پیوسته منتظر می‌ماندند.
+        """
+        next_check = time.monotonic() + POLL_INTERVAL
+        while not self._closed:
+            if time.monotonic() >= next_check:
+                self._check_workers()
+                next_check = time.monotonic() + POLL_INTERVAL
+            try:
+                job_id, ok, payload = self._result_queue.get(
+                    timeout=max(0.0, next_check - time.monotonic()))
+            except queue.Empty:
+                continue
+
+            with self._lock:
+                entry = None
+                for in_flight in self._in_flight:
+                    entry = in_flight.pop(job_id, None)
+                    if entry is not None:
+                        break
+            if entry is None:
+                # نتیجه تکراری کاری که پس از راه‌اندازی مجدد دوباره ارسال شده بود
+                continue
+
+            future = entry[0]
+            if ok:
+                future.set_result(payload)
+            else:
+                future.set_exception(RuntimeError(f"خطا در کارگر پیش‌بینی: {payload}"))
+
+    def _check_workers(self):
+        """راه‌اندازی مجدد کارگرهای از کار افتاده و ارسال دوباره کارهای ناتمام آن‌ها"""
+        with self._lock:
+            for index, process in enumerate(self._workers):
+                if process.is_alive():
+                    continue
+                print(f"کارگر {index} با کد {process.exitcode} متوقف شد؛ راه‌اندازی مجدد...")
+                self.restarts += 1
+                # صف قبلی ممکن است در وضعیت ناسازگار باشد، بنابراین کنار گذاشته و صف تازه
+                # ساخته می‌شود؛ رشته ارسال صف قبلی نباید هنگام خروج منتظر خواننده‌ای بماند
+                abandoned = self._task_queues[index]
+                abandoned.cancel_join_thread()
+                abandoned.close()
+                self._task_queues[index] = self._context.Queue()
+                self._workers[index] = self._start_worker(index)
+                for job_id, (_, columns) in self._in_flight[index].items():
+                    self._task_queues[index].put((job_id, columns))
+
+    def predict_batch(self, input_data, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """پیش‌بینی دسته بزرگ با تقسیم آن بین کارگرها؛ خروجی هم‌تراز با ورودی"""
+        columns = {col: np.asarray(input_data[col]) for col in FEATURE_COLUMNS}
+        columns.update({col: np.asarray(input_data[col]) for col in OPTIONAL_COLUMNS if col in input_data})
+        n_rows = len(columns[FEATURE_COLUMNS[0]])
+
+        futures = []
+        for start in range(0, n_rows, chunk_rows):
+            chunk = {col: values[start:start + chunk_rows] for col, values in columns.items()}
+            futures.append(self.submit(chunk))
+
+        if not futures:
+            prediction, probability = np.empty(0, dtype=np.int64), np.empty(0)
+        else:
+            parts = [future.result() for future in futures]
+            prediction = np.concatenate([labels for labels, _ in parts])
+            probability = np.concatenate([chunk_probability for _, chunk_probability in parts])
+        return {'prediction': prediction, 'success': prediction == 1, 'probability': probability}
+
+
+def benchmark_scaling(n_rows=200000, max_workers=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """اندازه‌گیری توان عملیاتی استخر با ۱ تا N کارگر روی یک دسته بزرگ"""
+    max_workers = max_workers or os.cpu_count() or 1
+    data = random_launches(n_rows)
+    model = PredictionModel()
+    results = []
+
+    for workers in range(1, max_workers + 1):
+        with PredictionWorkerPool(workers, model=model) as pool:
+            # یک دور گرم‌کردن تا زمان راه‌اندازی کارگرها در اندازه‌گیری نیاید
+            pool.predict_batch({col: values[:chunk_rows] for col, values in data.items()},
+                               chunk_rows)
+            start = time.perf_counter()
+            pool.predict_batch(data, chunk_rows)
+            elapsed = time.perf_counter() - start
+        results.append({'workers': workers, 'seconds': elapsed, 'rows_per_second': n_rows / elapsed})
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="بنچمارک مقیاس‌پذیری استخر کارگرهای پیش‌بینی")
+    parser.add_argument('--rows', type=int, default=200000, help="تعداد سطرهای دسته")
+    parser.add_argument('--workers', type=int, default=None, help="بیشینه تعداد کارگرها")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help="تعداد سطرهای هر کار")
+    args = parser.parse_args()
+
+    results = benchmark_scaling(args.rows, args.workers, args.chunk_rows)
+    baseline = results[0]['rows_per_second']
+    for row in results:
+        print(f"{row['workers']:>3} کارگر: {row['rows_per_second']:>10.0f} سطر در ثانیه "
+              f"({row['seconds']:.2f} ثانیه، شتاب {row['rows_per_second'] / baseline:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
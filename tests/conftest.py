@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+
+"""تنظیمات مشترک آزمون‌ها: ماژول‌های src مانند حالت اسکریپت (python src/...) وارد می‌شوند"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+DATA_PATH = os.path.join(ROOT_DIR, 'data', 'data_falcon9.csv')
+
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+"""برابری خروجی CompiledPipeline با predict_proba پایپ‌لاین sklearn"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import DATA_PATH
+from compiled_model import CompiledPipeline, check_parity
+from features import load_features, split, FEATURES, MODEL_DTYPES
+from predictor import HISTORY_FEATURES, random_launches
+from save_model import build_pipeline
+
+
+@pytest.fixture(scope='module')
+def training_data():
+    # وزن محموله گمشده پر نمی‌شود تا مسیر ایمپیوتر هم بررسی شود
+    X, y = split(load_features(DATA_PATH, use_cache=False), payload_fill=np.nan, history=True)
+    assert X['PayloadMass'].isna().any()
+    return X, y
+
+
+def random_rows(n_rows=2000, seed=7):
+    frame = pd.DataFrame(random_launches(n_rows, seed))
+    return frame.astype({col: MODEL_DTYPES[col] for col in FEATURES})
+
+
+@pytest.mark.parametrize('preprocessing', [
+    None,
+    {'num_imputer': 'mean', 'scale': False},
+    {'history': True},
+])
+def test_parity_with_pipeline(training_data, preprocessing):
+    X, y = training_data
+    columns = FEATURES + (HISTORY_FEATURES if (preprocessing or {}).get('history') else [])
+    pipeline = build_pipeline(preprocessing, {'n_estimators': 30}).fit(X[columns], y)
+
+    assert check_parity(pipeline, X) == 0
+
+    frame = random_rows()
+    for col in HISTORY_FEATURES:
+        frame[col] = np.nan
+    compiled = CompiledPipeline.from_pipeline(pipeline)
+    expected = pipeline.predict_proba(frame[columns])
+    np.testing.assert_array_equal(compiled.predict_proba(frame), expected)
+    rows = np.vstack([compiled.predict_proba_row(tuple(row))
+                      for row in frame[columns].head(200).itertuples(index=False)])
+    np.testing.assert_array_equal(rows, expected[:200])
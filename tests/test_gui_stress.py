@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+"""آزمون فشار رابط گرافیکی: ۱۰۰۰ کلیک پیاپی روی دکمه پیش‌بینی بدون نمایشگر (offscreen)"""
+
+import os
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+QtWidgets = pytest.importorskip('PySide6.QtWidgets')
+
+
+def test_thousand_clicks_keep_timers_objects_and_memory_bounded():
+    from falcon9_app import Falcon9PredictorApp, StartupTimeline, run_stress_test
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    window = Falcon9PredictorApp(StartupTimeline())
+    window.show()
+    try:
+        report = run_stress_test(window, clicks=1000)
+    finally:
+        window.close()
+        app.processEvents()
+
+    assert 'error' not in report, report.get('error')
+    assert report['timers'] <= report['timers_before']
+    assert report['qobjects_after'] == report['qobjects_before']
+    assert report['animations'] == 1
+    assert report['memory_growth_kb'] < 1024
+    assert report['passed']
+
+
+def test_close_stops_prediction_thread():
+    from falcon9_app import Falcon9PredictorApp, StartupTimeline
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    window = Falcon9PredictorApp(StartupTimeline())
+    window.show()
+    worker = window.prediction_worker
+    worker.request('predict', lambda values: values, ())
+    window.close()
+    app.processEvents()
+
+    assert not worker._thread.is_alive()
+    worker.request('predict', lambda values: values, ())
+    assert not worker._thread.is_alive()
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""حفظ تاریخچه فهرست آموزش بین آموزش‌های افزایشی و کامل"""
+
+from conftest import DATA_PATH
+import save_model
+
+
+def _split_data(tmp_path, head_rows):
+    """فایل داده با head_rows سطر اول و تابعی برای افزودن بقیه سطرها به انتهای آن"""
+    with open(DATA_PATH, 'rb') as f:
+        lines = f.readlines()
+    data_path = tmp_path / 'data.csv'
+    data_path.write_bytes(b''.join(lines[:head_rows + 1]))
+
+    def append_rest():
+        with open(data_path, 'ab') as f:
+            f.writelines(lines[head_rows + 1:])
+    return str(data_path), append_rest
+
+
+def _modes(model_dir):
+    return [entry['mode'] for entry in save_model.load_manifest(model_dir)['history']]
+
+
+def test_full_retrain_keeps_incremental_history(tmp_path):
+    data_path, append_rest = _split_data(tmp_path, 84)
+    model_dir = str(tmp_path / 'models')
+    save_model.main(['--data', data_path, '--model-dir', model_dir])
+    append_rest()
+    save_model.main(['--data', data_path, '--model-dir', model_dir, '--incremental'])
+    save_model.main(['--data', data_path, '--model-dir', model_dir])
+
+    history = save_model.load_manifest(model_dir)['history']
+    assert [entry['mode'] for entry in history] == ['full', 'incremental', 'full']
+    assert history[1]['data_sha256'] == history[2]['data_sha256'] != history[0]['data_sha256']
+
+
+def test_incremental_fallback_keeps_history(tmp_path):
+    # سطرهای بعدی مدار تازه (GEO) دارند و به‌روزرسانی افزایشی به آموزش کامل برمی‌گردد
+    data_path, append_rest = _split_data(tmp_path, 69)
+    model_dir = str(tmp_path / 'models')
+    save_model.main(['--data', data_path, '--model-dir', model_dir])
+    append_rest()
+    save_model.main(['--data', data_path, '--model-dir', model_dir, '--incremental'])
+
+    assert _modes(model_dir) == ['full', 'full']
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+"""برابری پیش‌بینی‌های بسته سبک (فقط NumPy، بدون sklearn و pandas) با مدل pickle شده"""
+
+import os
+
+import pytest
+
+from conftest import DATA_PATH
+import save_model
+import slim_bundle
+
+
+@pytest.fixture(scope='module')
+def model_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('bundle') / 'models'
+    directory.mkdir()
+    save_model.main(['--data', DATA_PATH, '--model-dir', str(directory)])
+    return str(directory)
+
+
+def test_slim_bundle_predictions_match_pickle(model_dir):
+    difference, n_rows = slim_bundle.check_parity(model_dir, DATA_PATH, n_random=500)
+    assert n_rows == 590
+    assert difference == 0
+
+
+def test_cold_start_uses_exported_directory(model_dir, tmp_path):
+    slim_bundle.export(model_dir, str(tmp_path / 'models'))
+    columns = {col: values[:3] for col, values in slim_bundle.parity_rows(DATA_PATH, 0).items()}
+    result = slim_bundle.cold_start(columns, slim=True, root=str(tmp_path), repeats=1)
+    assert os.path.dirname(result['model_path']) == str(tmp_path / 'models')
+    assert not set(result['packages']) & set(slim_bundle.EXCLUDED_PACKAGES)